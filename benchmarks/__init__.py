@@ -0,0 +1,13 @@
+"""
+Performance benchmarks for the catalogue.
+
+- :mod:`benchmarks.catalogue` fills an empty database with a seeded,
+  synthetic catalogue at 1×, 10× or 100× scale;
+- :mod:`benchmarks.scenarios` defines the timed scenarios (detail
+  views, A–Z lists, search, API pages, RDF export, importer, audits);
+- :mod:`benchmarks.report` runs them and writes / compares the JSON
+  reports.
+
+``manage.py run_benchmarks`` ties the three together on a throwaway
+test database; see docs/developers/performance.md.
+"""
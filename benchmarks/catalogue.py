@@ -0,0 +1,522 @@
+"""
+Seeded synthetic catalogue.
+
+:func:`generate` fills an empty database with books, persons and places
+and everything hanging off them: geolocations, authorships, editions,
+translations, mentions, prefaces, productions, the lookup vocabularies
+and the many-to-many links. Book rows get the whole legacy field set,
+sparsely filled the way the Drupal import left them, so list views,
+the API and the RDF export read realistically wide rows.
+
+The same ``scale`` and ``seed`` give the same rows — primary keys,
+names, slugs and field values — so two benchmark runs measure the same
+data. Everything is written with ``bulk_create``; ``save()`` hooks and
+signals do not run, which is why slugs, trig columns and legacy ids are
+filled in here and the place / person page entries rebuilt at the end.
+"""
+from __future__ import annotations
+
+import csv
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from anyascii import anyascii
+from django.db import models as dj_models
+from django.utils.text import slugify
+
+from home.entity_relations import rebuild as rebuild_entity_relations
+from home.models import (
+    Alignment,
+    Book,
+    BookAuthor,
+    City,
+    DateFormat,
+    Edition,
+    Font,
+    FootnoteLocation,
+    Gender,
+    Geolocation,
+    Language,
+    LanguageCount,
+    Mention,
+    MentionDescription,
+    Occupation,
+    OriginalType,
+    Person,
+    Preface,
+    Production,
+    ProductionRole,
+    Publisher,
+    Series,
+    TargetAudience,
+    TextualModel,
+    Topic,
+    Translation,
+    TranslationType,
+    Typography,
+)
+from home.nearby import trig_columns
+from wagtail.models import DraftStateMixin, RevisionMixin
+
+SCALES = (1, 10, 100)
+
+# Row counts at scale 1, in the order of the live catalogue.
+BASE_COUNTS = {
+    "books": 1_000,
+    "persons": 1_400,
+    "cities": 320,
+}
+
+BATCH_SIZE = 1_000
+
+# Share of the optional legacy text fields that hold a value.
+FILL_RATE = 0.3
+
+CITY_NAMES = [
+    "Berlin", "Königsberg", "Vilna", "Warsaw", "Lemberg", "Brody", "Prague",
+    "Vienna", "Amsterdam", "Altona", "Breslau", "Dessau", "Fürth",
+    "Frankfurt am Main", "Shklov", "Zhitomir", "Odessa", "Livorno", "Trieste",
+    "Dubno", "Grodno", "Minsk", "Pressburg", "Offenbach", "Hamburg", "Metz",
+    "Mantua", "Venice", "Sulzbach", "Dyhernfurth", "Zolkiew", "Novy Dvor",
+    "Slavuta", "Kopys", "Ostrog", "Lublin", "Cracow", "Mogilev", "Riga",
+]
+FIRST_NAMES = [
+    "Moses", "Naphtali", "Isaac", "Judah", "David", "Aaron", "Mendel", "Joseph",
+    "Salomon", "Wolf", "Herz", "Baruch", "Abraham", "Samuel", "Elijah", "Menahem",
+    "Tuviah", "Shalom", "Meir", "Lazarus", "Joel", "Hartwig", "Isaiah", "Judith",
+]
+SURNAMES = [
+    "Mendelssohn", "Wessely", "Euchel", "Satanow", "Friedländer", "Lefin",
+    "Ben-Zeev", "Homberg", "Bensew", "Wolfsohn", "Löwe", "Bril", "Gumpertz",
+    "Levin", "Perl", "Krochmal", "Rapoport", "Lebensohn", "Guenzburg", "Cohen",
+    "Halevi", "Schick", "Margaliot", "Jeitteles", "Fürstenthal", "Hurwitz",
+]
+HEBREW_NAMES = [
+    "משה", "נפתלי", "יצחק", "יהודה", "דוד", "אהרן", "מנחם", "יוסף", "שלמה",
+    "אברהם", "שמואל", "אליהו", "ברוך", "מאיר", "יואל", "ישעיה",
+]
+HEBREW_SURNAMES = [
+    "מנדלסון", "ווייזל", "אייכל", "סטנוב", "פרידלנדר", "לעפין", "בן זאב",
+    "הומברג", "וואלפסון", "ברי״ל", "לוין", "פרל",
+]
+TITLE_HEADS = [
+    "Sefer", "Megillat", "Shirei", "Divrei", "Kinat", "Tokhahat", "Ma'amar",
+    "Igeret", "Luah", "Bikurei", "Kohelet", "Mesilat", "Melitsat", "Zemirot",
+]
+TITLE_TAILS = [
+    "ha-Emet", "Tiferet", "Hokhmah", "Musar", "ha-Shalom", "Yisrael",
+    "ha-Ittim", "Leshon Limudim", "Emunah", "ha-Nefesh", "Yesharim", "Musar",
+    "ha-Teva", "Eden", "Shir ha-Shirim", "Torat ha-Adam", "Ohel Yosef",
+]
+WORDS = (
+    "the author edition printed preface approbation rabbi subscribers Hebrew "
+    "German Yiddish translation copy library notes volume pages Measef "
+    "enlightenment commentary Bible Talmud poem letter society Friends of "
+    "language see also in and with by from published Berlin press printer "
+    "reprint title page censor Bar-Ilan catalogue reference dedication "
+    "introduction epilogue footnotes glossary grammar history natural science"
+).split()
+VOCABULARIES = {
+    Alignment: ["Maskilic", "Traditional", "Moderate", "Radical", "Unknown", "Mixed"],
+    Font: ["Square", "Rashi", "Vaybertaytsh", "Fraktur", "Antiqua", "Mixed", "Other"],
+    TargetAudience: ["Youth", "Scholars", "Women", "General public", "Merchants",
+                     "Teachers", "Rabbis", "Students"],
+    Typography: ["Vocalised", "Unvocalised", "Partly vocalised", "Cantillated"],
+    DateFormat: ["Hebrew calendar", "Gregorian", "Both", "Chronogram"],
+    TextualModel: [f"{head} {tail}" for head in TITLE_HEADS[:8] for tail in TITLE_TAILS[:5]],
+    LanguageCount: ["One", "Two", "Three", "Four", "More"],
+    FootnoteLocation: ["Page bottom", "Margins", "End of chapter", "End of book", "Inline"],
+    OriginalType: ["Book", "Article", "Manuscript", "Play", "Poem", "Letter"],
+    Gender: ["Male", "Female", "Unknown"],
+    MentionDescription: ["Author", "Teacher", "Patron", "Opponent", "Source", "Printer",
+                         "Translator", "Subscriber", "Approbator", "Friend"],
+    ProductionRole: ["Printer", "Typesetter", "Proofreader", "Editor", "Publisher",
+                     "Financier", "Seller", "Corrector"],
+    TranslationType: ["Full", "Partial", "Adaptation", "Paraphrase"],
+}
+LANGUAGES = [
+    ("Hebrew", "he"), ("German", "de"), ("Yiddish", "yi"), ("Aramaic", "arc"),
+    ("French", "fr"), ("Latin", "la"), ("Italian", "it"), ("English", "en"),
+    ("Dutch", "nl"), ("Polish", "pl"), ("Russian", "ru"), ("Ladino", "lad"),
+    ("Judeo-German", "yih"), ("Greek", "el"), ("Arabic", "ar"), ("Czech", "cs"),
+]
+TOPICS = [
+    "Bible exegesis", "Grammar", "Poetry", "Ethics", "Natural science", "History",
+    "Pedagogy", "Philosophy", "Medicine", "Mathematics", "Drama", "Letters",
+    "Geography", "Liturgy", "Satire", "Translation studies",
+]
+OCCUPATIONS = [
+    "Rabbi", "Teacher", "Physician", "Merchant", "Printer", "Poet", "Translator",
+    "Philosopher", "Grammarian", "Tutor", "Cantor", "Banker", "Editor", "Scribe",
+]
+FORMAT_VALUES = ["text", "text", "text", "filtered_html", "full_html", ""]
+
+# Book fields generate() sets explicitly; the rest are filled by type.
+_BOOK_EXPLICIT = {
+    "uuid", "name", "slug", "created_at", "updated_at", "bundle", "gregorian_year",
+    "full_title", "title_in_latin_characters", "hebrew_year_of_publication",
+    "digital_book_url", "not_available", "legacy_nid", "legacy_vid", "legacy_language",
+    "legacy_status", "legacy_created", "legacy_changed",
+}
+# Publishing state and revisions stay at their defaults (live, no drafts).
+_MIXIN_FIELDS = {field.name for mixin in (DraftStateMixin, RevisionMixin) for field in mixin._meta.fields}
+_EPOCH = datetime(2012, 1, 1, tzinfo=timezone.utc)
+
+
+def _names(pool, count):
+    """*count* distinct names: the pool first, then numbered repeats."""
+    names = list(pool[:count])
+    round_ = 2
+    while len(names) < count:
+        names += [f"{name} {round_}" for name in pool[:count - len(names)]]
+        round_ += 1
+    return names
+
+
+class CatalogueGenerator:
+    def __init__(self, scale=1, seed=1, batch_size=BATCH_SIZE):
+        self.rng = random.Random(seed)
+        self.scale = scale
+        self.batch_size = batch_size
+        self.counts = {name: max(1, round(count * scale)) for name, count in BASE_COUNTS.items()}
+        self.created = Counter()
+        self._slugs = Counter()
+        self._nid = 0
+
+    # ---------- helpers ----------
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _next_nid(self):
+        self._nid += 1
+        return self._nid
+
+    def _slug(self, model, text):
+        base = slugify(anyascii(text)) or model.__name__.lower()
+        self._slugs[(model, base)] += 1
+        seen = self._slugs[(model, base)]
+        return base if seen == 1 else f"{base}-{seen}"
+
+    def _words(self, low, high):
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high)))
+
+    def _text(self):
+        # Mostly notes of a sentence or two, now and then a long blob.
+        if self.rng.random() < 0.05:
+            return self._words(150, 400)
+        return self._words(3, 60).capitalize() + "."
+
+    def _timestamps(self):
+        created = _EPOCH + timedelta(seconds=self.rng.randint(0, 8 * 365 * 86400))
+        return created, created + timedelta(seconds=self.rng.randint(0, 365 * 86400))
+
+    def _legacy(self):
+        created, changed = self._timestamps()
+        nid = self._next_nid()
+        return {"legacy_nid": nid, "legacy_vid": nid, "legacy_created": created, "legacy_changed": changed}
+
+    def _some(self, items, low, high):
+        return self.rng.sample(items, min(len(items), self.rng.randint(low, high)))
+
+    def _maybe(self, rate, items):
+        return self.rng.choice(items) if items and self.rng.random() < rate else None
+
+    def _bulk(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.created[model.__name__] += len(objects)
+        return objects
+
+    def _link(self, m2m_field, pairs):
+        """Bulk-insert ``(source pk, target pk)`` rows into an auto-created through table."""
+        through = m2m_field.remote_field.through
+        source, target = m2m_field.m2m_field_name(), m2m_field.m2m_reverse_field_name()
+        self._bulk(through, [through(**{f"{source}_id": a, f"{target}_id": b}) for a, b in pairs])
+
+    # ---------- vocabularies and places ----------
+
+    def _vocabulary(self, model, names):
+        fields = {f.name for f in model._meta.concrete_fields}
+        objects = []
+        for i, name in enumerate(names, start=1):
+            obj = model(name=name)
+            if "uuid" in fields:
+                obj.uuid = self._uuid()
+            if "legacy_tid" in fields:
+                obj.legacy_tid = i
+            if "slug" in fields:
+                obj.slug = self._slug(model, name)
+            objects.append(obj)
+        return [obj.pk for obj in self._bulk(model, objects)]
+
+    def vocabularies(self):
+        self.terms = {model: self._vocabulary(model, names) for model, names in VOCABULARIES.items()}
+        books = self.counts["books"]
+        self.terms[Publisher] = self._vocabulary(
+            Publisher, _names([f"{name} Press" for name in SURNAMES], max(5, books // 6)))
+        self.terms[Series] = self._vocabulary(
+            Series, _names([f"Kitvei {tail}" for tail in TITLE_TAILS], max(3, books // 50)))
+        self.terms[Topic] = self._vocabulary(Topic, TOPICS)
+        self.terms[Occupation] = self._vocabulary(Occupation, OCCUPATIONS)
+
+        languages = [
+            Language(uuid=self._uuid(), name=name, language_code=code, legacy_tid=i)
+            for i, (name, code) in enumerate(LANGUAGES, start=1)
+        ]
+        self.terms[Language] = [obj.pk for obj in self._bulk(Language, languages)]
+
+    def places(self):
+        cities, geolocations = [], []
+        for i, name in enumerate(_names(CITY_NAMES, self.counts["cities"]), start=1):
+            city = City(uuid=self._uuid(), name=name, slug=self._slug(City, name), legacy_tid=i)
+            cities.append(city)
+            if self.rng.random() < 0.9:
+                lat, lng = round(self.rng.uniform(40, 60), 5), round(self.rng.uniform(0, 40), 5)
+                lat_sin, lat_cos, lng_rad = trig_columns(lat, lng)
+                geolocations.append(Geolocation(
+                    uuid=self._uuid(), city=city, lat=lat, lng=lng,
+                    lat_sin=lat_sin, lat_cos=lat_cos, lng_rad=lng_rad,
+                ))
+        self._bulk(City, cities)
+        self._bulk(Geolocation, geolocations)
+        self.cities = [city.pk for city in cities]
+
+    # ---------- persons ----------
+
+    def persons(self):
+        persons, occupations = [], []
+        for _ in range(self.counts["persons"]):
+            label = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(SURNAMES)}"
+            born = self.rng.randint(1700, 1840)
+            person = Person(
+                uuid=self._uuid(),
+                pref_label=label,
+                slug=self._slug(Person, label),
+                german_name=label if self.rng.random() < 0.4 else "",
+                hebrew_name=f"{self.rng.choice(HEBREW_NAMES)} {self.rng.choice(HEBREW_SURNAMES)}",
+                gender_id=self._maybe(0.9, self.terms[Gender]),
+                date_of_birth=str(born) if self.rng.random() < 0.7 else f"ca. {born}",
+                date_of_death=str(born + self.rng.randint(25, 85)) if self.rng.random() < 0.6 else "",
+                place_of_birth_id=self._maybe(0.7, self.cities),
+                place_of_death_id=self._maybe(0.6, self.cities),
+                viaf_id=str(self.rng.randint(10 ** 7, 10 ** 9)) if self.rng.random() < 0.3 else "",
+                gnd_id=str(self.rng.randint(10 ** 8, 10 ** 9)) if self.rng.random() < 0.4 else "",
+                pseudonym=self._words(1, 2).title() if self.rng.random() < 0.05 else "",
+                **self._legacy(),
+            )
+            persons.append(person)
+            occupations += [(person.pk, pk) for pk in self._some(self.terms[Occupation], 0, 2)]
+        self._bulk(Person, persons)
+        self._link(Person._meta.get_field("occupations"), occupations)
+        self.persons_pks = [person.pk for person in persons]
+
+    # ---------- books ----------
+
+    def _legacy_field_value(self, field):
+        """A value for one of the wide legacy Book columns, by field type."""
+        if field.choices:
+            return self.rng.choice(FORMAT_VALUES) if field.name.endswith("_format") else field.get_default()
+        if isinstance(field, dj_models.BooleanField):
+            return self.rng.random() < 0.05
+        if isinstance(field, dj_models.IntegerField):
+            return 1 if self.rng.random() < 0.2 else 0
+        if field.name.endswith("_format"):
+            return self.rng.choice(FORMAT_VALUES)
+        if self.rng.random() >= FILL_RATE:
+            return ""
+        if isinstance(field, dj_models.TextField):
+            return self._text()
+        name = field.name
+        if "year" in name:
+            return str(self.rng.randint(1750, 1880))
+        if "library_id" in name:
+            return f"{self.rng.randint(10 ** 5, 10 ** 8)}"
+        if name in ("height", "width"):
+            return f"{self.rng.randint(10, 40)} cm"
+        if name == "pages_number":
+            return str(self.rng.randint(16, 600))
+        return self._words(1, 4)[:field.max_length or 255]
+
+    def _book(self, legacy_fields):
+        title = f"{self.rng.choice(TITLE_HEADS)} {self.rng.choice(TITLE_TAILS)}"
+        year = self.rng.randint(1750, 1880)
+        book = Book(
+            uuid=self._uuid(),
+            name=title,
+            slug=self._slug(Book, title),
+            bundle="book" if self.rng.random() < 0.8 else self.rng.choice(["translation", "edition"]),
+            gregorian_year=year,
+            hebrew_year_of_publication=f"{year + 3760}",
+            full_title=f"{title}, {self._words(4, 16)}",
+            title_in_latin_characters=title,
+            digital_book_url=f"https://digital.example.org/{self.rng.getrandbits(32):x}"
+            if self.rng.random() < 0.4 else "",
+            not_available=self.rng.random() < 0.03,
+            legacy_status=True,
+            legacy_language="und",
+            alignment_id=self._maybe(0.8, self.terms[Alignment]),
+            publisher_id=self._maybe(0.85, self.terms[Publisher]),
+            original_publisher_id=self._maybe(0.1, self.terms[Publisher]),
+            series_id=self._maybe(0.1, self.terms[Series]),
+            publication_place_id=self._maybe(0.9, self.cities),
+            publication_place_other_id=self._maybe(0.05, self.cities),
+            original_publication_place_id=self._maybe(0.1, self.cities),
+            original_language_id=self._maybe(0.2, self.terms[Language]),
+            original_type_id=self._maybe(0.2, self.terms[OriginalType]),
+            translation_type_id=self._maybe(0.2, self.terms[TranslationType]),
+            location_of_footnotes_id=self._maybe(0.3, self.terms[FootnoteLocation]),
+            format_of_publication_date_id=self._maybe(0.6, self.terms[DateFormat]),
+            languages_number_id=self._maybe(0.6, self.terms[LanguageCount]),
+            topic_id=self._maybe(0.7, self.terms[Topic]),
+            **self._legacy(),
+        )
+        for field in legacy_fields:
+            setattr(book, field.attname, self._legacy_field_value(field))
+        return book
+
+    def _book_links(self, books):
+        """Authors, dependent rows and many-to-many links of one batch of books."""
+        rng, persons, cities = self.rng, self.persons_pks, self.cities
+        authors, editions, translations, mentions, prefaces, productions = [], [], [], [], [], []
+        links = {name: [] for name in (
+            "languages", "footnote_languages", "occasional_words_languages", "fonts",
+            "target_audience", "typography", "main_textual_models", "secondary_textual_models",
+        )}
+        for book in books:
+            for person in rng.sample(persons, 2 if rng.random() < 0.3 else 1):
+                authors.append(BookAuthor(book_id=book.pk, person_id=person, role="old_text_author"))
+            if rng.random() < 0.15:
+                authors.append(BookAuthor(book_id=book.pk, person_id=rng.choice(persons), role="original_text_author"))
+            for _ in range(rng.choice((0, 0, 1, 1, 2, 3))):
+                editions.append(Edition(
+                    uuid=self._uuid(), book_id=book.pk, name=f"{book.name} ({rng.randint(1760, 1900)})",
+                    city_id=self._maybe(0.8, cities), year=str(rng.randint(1760, 1900)),
+                    changes=self._text() if rng.random() < 0.3 else "", **self._legacy(),
+                ))
+            for _ in range(rng.choice((0, 0, 0, 1, 2))):
+                translations.append(Translation(
+                    uuid=self._uuid(), book_id=book.pk, title=book.name,
+                    translator_id=rng.choice(persons), language_id=rng.choice(self.terms[Language]),
+                    city_id=self._maybe(0.7, cities), year=str(rng.randint(1760, 1900)), **self._legacy(),
+                ))
+            for _ in range(rng.choice((0, 0, 1, 1, 2, 3, 5))):
+                mentions.append(Mention(
+                    uuid=self._uuid(), book_id=book.pk, mentionee_id=rng.choice(persons),
+                    mentionee_city_id=self._maybe(0.3, cities),
+                    mentionee_description_id=self._maybe(0.8, self.terms[MentionDescription]),
+                    **self._legacy(),
+                ))
+            for number in range(1, rng.choice((0, 1, 1, 2)) + 1):
+                prefaces.append(Preface(
+                    uuid=self._uuid(), book_id=book.pk, number=number, writer_id=self._maybe(0.8, persons),
+                    title=self._words(2, 6).capitalize(), notes=self._text() if rng.random() < 0.4 else "",
+                    **self._legacy(),
+                ))
+            for _ in range(rng.choice((0, 1, 2, 3))):
+                productions.append(Production(
+                    uuid=self._uuid(), book_id=book.pk, producer_id=rng.choice(persons),
+                    role_id=self._maybe(0.9, self.terms[ProductionRole]),
+                    name_in_book=self._words(2, 3).title(), **self._legacy(),
+                ))
+            languages = self.terms[Language]
+            links["languages"] += [(book.pk, pk) for pk in self._some(languages[:4], 1, 2)]
+            links["footnote_languages"] += [(book.pk, pk) for pk in self._some(languages, 0, 1)]
+            links["occasional_words_languages"] += [(book.pk, pk) for pk in self._some(languages, 0, 1)]
+            links["fonts"] += [(book.pk, pk) for pk in self._some(self.terms[Font], 0, 2)]
+            links["target_audience"] += [(book.pk, pk) for pk in self._some(self.terms[TargetAudience], 0, 2)]
+            links["typography"] += [(book.pk, pk) for pk in self._some(self.terms[Typography], 0, 1)]
+            links["main_textual_models"] += [(book.pk, pk) for pk in self._some(self.terms[TextualModel], 0, 2)]
+            links["secondary_textual_models"] += [(book.pk, pk) for pk in self._some(self.terms[TextualModel], 0, 1)]
+
+        self._bulk(BookAuthor, authors)
+        self._bulk(Edition, editions)
+        self._bulk(Translation, translations)
+        self._bulk(Mention, mentions)
+        self._bulk(Preface, prefaces)
+        self._bulk(Production, productions)
+        for name, pairs in links.items():
+            self._link(Book._meta.get_field(name), pairs)
+
+    def books(self):
+        legacy_fields = [
+            field for field in Book._meta.concrete_fields
+            if field.name not in _BOOK_EXPLICIT | _MIXIN_FIELDS
+            and not field.is_relation
+            and isinstance(field, (dj_models.CharField, dj_models.TextField,
+                                   dj_models.IntegerField, dj_models.BooleanField))
+        ]
+        remaining = self.counts["books"]
+        while remaining:
+            size = min(self.batch_size, remaining)
+            books = self._bulk(Book, [self._book(legacy_fields) for _ in range(size)])
+            self._book_links(books)
+            remaining -= size
+
+    def generate(self):
+        self.vocabularies()
+        self.places()
+        self.persons()
+        self.books()
+        self.created["EntityRelation"] = rebuild_entity_relations(batch_size=self.batch_size)
+        return dict(self.created)
+
+
+def generate(scale=1, seed=1, batch_size=BATCH_SIZE):
+    """
+    Fill the (empty) current database with the catalogue for *scale*
+    and *seed*. Returns the number of rows created per model.
+    """
+    return CatalogueGenerator(scale, seed, batch_size).generate()
+
+
+def write_books_csv(path):
+    """
+    Write the stored books as a ``books_for_django.csv`` the way the
+    Drupal export lays it out, for the importer scenario. Ids of linked
+    rows are written as their ``legacy_tid``.
+    """
+    from home.management.commands.import_haskala_books import (
+        EXCLUDE_AUTO,
+        FK_TID_FIELDS,
+        M2M_TID_FIELDS,
+        RENAME_MAP,
+    )
+
+    renamed = {name: column for column, name in RENAME_MAP.items()}
+    simple = [
+        field for field in Book._meta.concrete_fields
+        if not field.is_relation
+        and field.name not in EXCLUDE_AUTO | _MIXIN_FIELDS | {"name", "slug"}
+    ]
+    tids = {
+        model: dict(model.objects.values_list("pk", "legacy_tid"))
+        for model, _ in {*FK_TID_FIELDS.values(), *M2M_TID_FIELDS.values()}
+    }
+    m2m = {name: {} for _, name in M2M_TID_FIELDS.values()}
+    for model, name in M2M_TID_FIELDS.values():
+        through = Book._meta.get_field(name).remote_field.through
+        target = Book._meta.get_field(name).m2m_reverse_field_name()
+        for book_id, target_id in through.objects.values_list("book_id", f"{target}_id"):
+            m2m[name].setdefault(book_id, []).append(tids[model][target_id])
+
+    header = ["nid", "vid", "status", "created", "changed", "type", "title"]
+    header += [renamed.get(field.name, field.name) for field in simple]
+    header += list(FK_TID_FIELDS) + list(M2M_TID_FIELDS)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for book in Book.objects.order_by("legacy_nid").iterator(chunk_size=BATCH_SIZE):
+            row = [
+                book.legacy_nid, book.legacy_vid, int(book.legacy_status),
+                int(book.legacy_created.timestamp()), int(book.legacy_changed.timestamp()),
+                book.bundle, book.name,
+            ]
+            row += ["" if getattr(book, field.attname) is None else getattr(book, field.attname) for field in simple]
+            row += [
+                tids[model].get(getattr(book, f"{name}_id"), "") or ""
+                for model, name in FK_TID_FIELDS.values()
+            ]
+            row += ["|".join(map(str, m2m[name].get(book.pk, []))) for _, name in M2M_TID_FIELDS.values()]
+            writer.writerow(row)
@@ -0,0 +1,167 @@
+"""
+Run benchmark scenarios and write / compare JSON reports.
+
+A report looks like::
+
+    {
+      "meta": {"scale": 10, "seed": 1, "counts": {...}, "database": "postgresql", ...},
+      "scenarios": {
+        "book-detail": {"group": "views", "runs": 50, "min_ms": ..., "median_ms": ...,
+                        "p95_ms": ..., "max_ms": ..., "queries": 14},
+        ...
+      }
+    }
+
+``queries`` is the largest per-operation query count seen, which is
+deterministic for a given scale and seed; timings are not, so
+:func:`compare` allows them a relative tolerance.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+
+from .scenarios import SCENARIOS, Context
+
+# Timings below this many milliseconds are too noisy to call a regression.
+MIN_REGRESSION_MS = 5.0
+
+
+@contextmanager
+def count_queries():
+    counter = {"queries": 0}
+
+    def wrapper(execute, sql, params, many, context):
+        counter["queries"] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield counter
+
+
+def measure(operation):
+    """``(milliseconds, queries)`` for one call of *operation*."""
+    with count_queries() as counter:
+        start = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000, counter["queries"]
+
+
+def summarize(samples, queries):
+    ordered = sorted(samples)
+    p95 = statistics.quantiles(ordered, n=20, method="inclusive")[18] if len(ordered) > 1 else ordered[0]
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 2),
+        "median_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(p95, 2),
+        "max_ms": round(ordered[-1], 2),
+        "queries": max(queries),
+    }
+
+
+def run_scenarios(names, workdir, seed=1, rounds=None, log=None):
+    """
+    Time every operation of the named scenarios and return
+    ``{name: stats}``. The cache is cleared before each call and one
+    untimed warm-up call per operation loads templates and modules.
+    """
+    results = {}
+    for name in names:
+        spec = SCENARIOS[name]
+        context = Context(rng=random.Random(f"{seed}:{name}"), client=Client(), workdir=Path(workdir))
+        operations = spec.setup(context)
+        if spec.rounds > 1:
+            for operation in operations:
+                cache.clear()
+                operation()
+        samples, queries = [], []
+        for _ in range(rounds or spec.rounds):
+            for operation in operations:
+                cache.clear()
+                ms, count = measure(operation)
+                samples.append(ms)
+                queries.append(count)
+        results[name] = {"group": spec.group, **summarize(samples, queries)}
+        if log:
+            log(name, results[name])
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def build_report(results, scale, seed, counts):
+    return {
+        "meta": {
+            "scale": scale,
+            "seed": seed,
+            "counts": counts,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "scenarios": results,
+    }
+
+
+def write_report(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_report(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(report, baseline, tolerance=0.25):
+    """
+    Regressions of *report* against *baseline*, one line each: a median
+    more than *tolerance* (and :data:`MIN_REGRESSION_MS`) slower, or
+    any increase in queries. Scenarios missing from either side are
+    ignored. Raises ``ValueError`` if the two were run at a different
+    scale or seed, since their numbers are not comparable.
+    """
+    for key in ("scale", "seed"):
+        if report["meta"][key] != baseline["meta"][key]:
+            raise ValueError(
+                f"Baseline was run with {key}={baseline['meta'][key]}, "
+                f"this run with {key}={report['meta'][key]}."
+            )
+    regressions = []
+    for name, current in report["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        limit = max(previous["median_ms"] * (1 + tolerance), previous["median_ms"] + MIN_REGRESSION_MS)
+        if current["median_ms"] > limit:
+            regressions.append(
+                f"{name}: median {current['median_ms']:.1f} ms, baseline {previous['median_ms']:.1f} ms"
+            )
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: {current['queries']} queries, baseline {previous['queries']}"
+            )
+    return regressions
@@ -0,0 +1,171 @@
+"""
+Timed benchmark scenarios.
+
+A scenario's setup function receives the :class:`Context` and returns
+the operations to time, e.g. one GET per sampled detail page. The
+runner in :mod:`benchmarks.report` calls every operation ``rounds``
+times with the cache cleared first, so page-cached views are measured
+cold, and records wall-clock time and query count per call.
+
+Register new scenarios with :func:`scenario`; the name is what
+``run_benchmarks --scenario`` and the JSON report use.
+"""
+from __future__ import annotations
+
+import io
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from django.core.management import call_command
+from django.test import Client, override_settings
+
+from home.models import Book, City, Person
+
+from .catalogue import write_books_csv
+
+# Detail pages sampled per detail scenario.
+DETAIL_SAMPLES = 10
+
+SEARCH_TERMS = ("Sefer", "Mendelssohn", "Berlin", "ha-Emet", "Hebrew")
+
+
+class BenchmarkError(Exception):
+    """An operation did not do what the scenario expects (e.g. a 404)."""
+
+
+@dataclass
+class Context:
+    rng: random.Random
+    client: Client
+    workdir: Path
+
+
+@dataclass
+class Scenario:
+    name: str
+    group: str
+    setup: Callable[[Context], list]
+    rounds: int
+
+
+SCENARIOS: dict[str, Scenario] = {}
+
+
+def scenario(name, group, rounds=5):
+    def register(setup):
+        SCENARIOS[name] = Scenario(name, group, setup, rounds)
+        return setup
+    return register
+
+
+def _get(ctx, url, params=None):
+    def request():
+        response = ctx.client.get(url, params or {})
+        if response.status_code != 200:
+            raise BenchmarkError(f"GET {url} answered {response.status_code}")
+    return request
+
+
+def _command(name, *args, **options):
+    def run():
+        call_command(name, *args, stdout=io.StringIO(), **options)
+    return run
+
+
+def _sample_slugs(ctx, model):
+    slugs = list(model.objects.filter(live=True).order_by("slug").values_list("slug", flat=True))
+    return ctx.rng.sample(slugs, min(DETAIL_SAMPLES, len(slugs)))
+
+
+# ---------- detail views ----------
+
+@scenario("book-detail", "views")
+def book_detail(ctx):
+    return [_get(ctx, f"/books/{slug}/") for slug in _sample_slugs(ctx, Book)]
+
+
+@scenario("person-detail", "views")
+def person_detail(ctx):
+    return [_get(ctx, f"/persons/{slug}/") for slug in _sample_slugs(ctx, Person)]
+
+
+@scenario("place-detail", "views")
+def place_detail(ctx):
+    return [_get(ctx, f"/places/{slug}/") for slug in _sample_slugs(ctx, City)]
+
+
+# ---------- A–Z lists and search ----------
+
+@scenario("books-list", "views", rounds=3)
+def books_list(ctx):
+    return [_get(ctx, "/books/")]
+
+
+@scenario("persons-list", "views", rounds=3)
+def persons_list(ctx):
+    return [_get(ctx, "/persons/")]
+
+
+@scenario("places-list", "views", rounds=3)
+def places_list(ctx):
+    return [_get(ctx, "/places/")]
+
+
+@scenario("search", "views", rounds=3)
+def search(ctx):
+    return [_get(ctx, "/search/", {"q": term}) for term in SEARCH_TERMS]
+
+
+# ---------- API ----------
+
+@scenario("api-books", "api")
+def api_books(ctx):
+    return [_get(ctx, "/api/books/"), _get(ctx, "/api/books/", {"view": "summary"})]
+
+
+@scenario("api-persons", "api")
+def api_persons(ctx):
+    return [_get(ctx, "/api/persons/")]
+
+
+@scenario("api-cities", "api")
+def api_cities(ctx):
+    return [_get(ctx, "/api/cities/")]
+
+
+@scenario("api-search", "api", rounds=3)
+def api_search(ctx):
+    return [_get(ctx, "/api/search/", {"q": term}) for term in SEARCH_TERMS]
+
+
+# ---------- commands ----------
+
+@scenario("export-rdf", "commands", rounds=1)
+def export_rdf(ctx):
+    dumps = ctx.workdir / "dumps"
+
+    def run():
+        with override_settings(HASKALA_DUMPS_ROOT=str(dumps), HASKALA_SPARQL_PUSH_URL=""):
+            _command("export_rdf", no_push=True)()
+    return [run]
+
+
+@scenario("import-books", "commands", rounds=1)
+def import_books(ctx):
+    # The stored books written back out as a Drupal CSV and re-imported
+    # as a dry run: every row is diffed and updated, then rolled back.
+    path = ctx.workdir / "books_for_django.csv"
+    write_books_csv(path)
+    return [_command("import_haskala_books", file=str(path), dry_run=True)]
+
+
+@scenario("audit-data-quality", "commands", rounds=1)
+def audit_data_quality(ctx):
+    return [_command("audit_data_quality", out_dir=str(ctx.workdir / "audit"))]
+
+
+@scenario("audit-near-duplicates", "commands", rounds=1)
+def audit_near_duplicates(ctx):
+    return [_command("audit_near_duplicates", out_dir=str(ctx.workdir / "audit"))]
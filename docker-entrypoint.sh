@@ -4,10 +4,17 @@ SETTINGS=${DJANGO_SETTINGS_MODULE:-haskala.settings.dev}
 cd "$APP_ROOT"
 ./manage.py collectstatic --clear --noinput --settings="$SETTINGS"
 ./manage.py migrate --settings="$SETTINGS"
+# collectstatic --clear just removed them; nginx serves these as files.
+./manage.py write_sitemaps --settings="$SETTINGS"
+# ASGI under uvicorn workers: a request waiting on a slow outbound call
+# or a long streaming export holds its own thread, not a worker.
+# haskala.wsgi:application with the default sync worker still works.
 gunicorn --workers 8 \
+         --worker-class uvicorn_worker.UvicornWorker \
+         --preload \
          --log-level DEBUG \
          --env DJANGO_SETTINGS_MODULE="$SETTINGS" \
          -u django -g django \
          -b 0.0.0.0:8000 \
-         haskala.wsgi:application
+         haskala.asgi:application
 cd - 2>&1
@@ -0,0 +1,23 @@
+"""
+ASGI config for haskala project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The container serves it with gunicorn's uvicorn worker, see the
+Dockerfile CMD (and the legacy docker-entrypoint.sh).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+"""
+
+import os
+from importlib import import_module
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "haskala.settings.dev")
+
+application = get_asgi_application()
+
+# As in haskala/wsgi.py: load the URLconf in the gunicorn master.
+import_module(settings.ROOT_URLCONF)
@@ -0,0 +1,40 @@
+"""
+URL-conf entries for views whose modules are expensive to import.
+
+Django imports every view referenced in ``haskala/urls.py`` when the
+URLconf loads, i.e. in every gunicorn worker on its first request.
+:func:`lazy_view` stands in for such a view and imports it on the
+first request that actually resolves to it, so machinery only a few
+requests need (the OpenAPI schema generator and its YAML renderer,
+for instance) stays out of workers that never serve those URLs.
+
+RDF (``rdflib`` / ``haskala_rdf``) and PDF (``weasyprint``) code is
+deferred the same way, with function-level imports at the call sites
+in ``home.views``. ``home/tests/test_startup_imports.py`` checks that
+loading the URLconf imports none of these.
+"""
+from __future__ import annotations
+
+from functools import cache
+
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    A view that imports *dotted_path* on first use. A class-based view
+    is turned into a function with ``as_view(**initkwargs)``.
+    """
+    @cache
+    def resolve():
+        view = import_string(dotted_path)
+        return view.as_view(**initkwargs) if isinstance(view, type) else view
+
+    def view(request, *args, **kwargs):
+        return resolve()(request, *args, **kwargs)
+
+    view.__name__ = dotted_path.rsplit(".", 1)[-1]
+    view.__qualname__ = view.__name__
+    view.__module__ = dotted_path.rsplit(".", 1)[0]
+    view.lazy_path = dotted_path
+    return view
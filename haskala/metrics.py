@@ -0,0 +1,468 @@
+"""
+Per-view performance instrumentation that is safe to leave on in
+production.
+
+``PerformanceMiddleware`` wraps every request and records, keyed by
+the resolved view:
+
+- request count and wall-clock latency (plus a latency histogram),
+- number and total duration of SQL queries, via
+  ``connection.execute_wrapper`` — unlike ``connection.queries`` this
+  works with ``DEBUG = False`` and keeps no SQL text around,
+- time spent rendering templates, via the ``InstrumentedDjangoTemplates``
+  backend configured in ``TEMPLATES``,
+- whether the response came out of the page cache.
+
+The numbers are aggregated in-process (one registry per gunicorn
+worker) and exposed in the Prometheus text format by
+:func:`metrics_view`. Requests that exceed the budget configured for
+their view in ``HASKALA_PERF_BUDGETS`` are logged to the
+``haskala.perf`` logger, so N+1 regressions on the detail views and
+the API show up without the debug toolbar.
+"""
+from __future__ import annotations
+
+import hmac
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.template.backends.django import DjangoTemplates
+from django.urls import Resolver404, resolve
+from django.views.decorators.cache import never_cache
+
+logger = logging.getLogger("haskala.perf")
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    """Counters for the request currently being handled."""
+    queries: int = 0
+    query_seconds: float = 0.0
+    template_seconds: float = 0.0
+    template_depth: int = 0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("haskala_request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    """Stats of the request being handled on this thread/task, if any."""
+    return _current.get()
+
+
+@dataclass
+class ViewMetrics:
+    requests: int = 0
+    seconds: float = 0.0
+    queries: int = 0
+    query_seconds: float = 0.0
+    template_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    over_budget: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    statuses: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class MetricsRegistry:
+    """Thread-safe in-process aggregate of :class:`ViewMetrics` per view."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: dict[str, ViewMetrics] = {}
+
+    def record(self, view, *, status, seconds, stats, cache_result, over_budget):
+        with self._lock:
+            m = self._views.get(view)
+            if m is None:
+                m = self._views[view] = ViewMetrics()
+            m.requests += 1
+            m.seconds += seconds
+            m.queries += stats.queries
+            m.query_seconds += stats.query_seconds
+            m.template_seconds += stats.template_seconds
+            if cache_result == "hit":
+                m.cache_hits += 1
+            elif cache_result == "miss":
+                m.cache_misses += 1
+            if over_budget:
+                m.over_budget += 1
+            m.statuses[str(status)] += 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    m.buckets[i] += 1
+
+    def snapshot(self) -> dict[str, ViewMetrics]:
+        with self._lock:
+            return {
+                view: ViewMetrics(
+                    requests=m.requests, seconds=m.seconds, queries=m.queries,
+                    query_seconds=m.query_seconds, template_seconds=m.template_seconds,
+                    cache_hits=m.cache_hits, cache_misses=m.cache_misses,
+                    over_budget=m.over_budget, buckets=list(m.buckets),
+                    statuses=dict(m.statuses),
+                )
+                for view, m in self._views.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+@dataclass
+class OutboundMetrics:
+    requests: int = 0
+    seconds: float = 0.0
+    retries: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    outcomes: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class OutboundRegistry:
+    """
+    Thread-safe aggregate of :class:`OutboundMetrics` per remote host,
+    fed by the shared HTTP client in :mod:`haskala.outbound`. *outcome* is
+    the status code, or the exception class name when no response came.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: dict[str, OutboundMetrics] = {}
+
+    def record(self, host, *, outcome, seconds, retries=0):
+        with self._lock:
+            m = self._hosts.get(host)
+            if m is None:
+                m = self._hosts[host] = OutboundMetrics()
+            m.requests += 1
+            m.seconds += seconds
+            m.retries += retries
+            m.outcomes[str(outcome)] += 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    m.buckets[i] += 1
+
+    def snapshot(self) -> dict[str, OutboundMetrics]:
+        with self._lock:
+            return {
+                host: OutboundMetrics(
+                    requests=m.requests, seconds=m.seconds, retries=m.retries,
+                    buckets=list(m.buckets), outcomes=dict(m.outcomes),
+                )
+                for host, m in self._hosts.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+outbound = OutboundRegistry()
+
+
+# ---------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------
+
+def _count_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - start
+
+
+def _view_label(request) -> tuple[str, str]:
+    """Return ``(label, url_name)`` for the view that served *request*."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        # Page-cache hits short-circuit before URL resolution.
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return "<unresolved>", ""
+    func = match.func
+    cls = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    target = cls or func
+    label = f"{target.__module__}.{getattr(target, '__qualname__', target.__class__.__name__)}"
+    return label, match.url_name or ""
+
+
+def _cache_result(request) -> str:
+    # Django's cache middleware (global and @cache_page alike) flags a
+    # cacheable GET/HEAD with _cache_update_cache = True on a miss and
+    # False when it served the stored response.
+    if request.method not in ("GET", "HEAD"):
+        return ""
+    flag = getattr(request, "_cache_update_cache", None)
+    if flag is None:
+        return ""
+    return "miss" if flag else "hit"
+
+
+def _budget_for(label, url_name) -> dict:
+    budgets = getattr(settings, "HASKALA_PERF_BUDGETS", {}) or {}
+    # The dotted path wins: DRF's "book-detail" route shares its URL
+    # name with the HTML book page.
+    budget = budgets.get(label) or budgets.get(url_name)
+    if budget is None:
+        budget = getattr(settings, "HASKALA_PERF_BUDGET_DEFAULT", {}) or {}
+    return budget
+
+
+class PerformanceMiddleware:
+    """
+    Record per-request SQL, template and latency numbers per view.
+
+    Works in both handler modes, so under ASGI it does not force the
+    rest of the middleware stack (and async views) into a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with _wrap_all_connections():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        # Connections are per thread: install the counter in the
+        # request's thread-sensitive thread, where the ORM runs.
+        wrappers = _wrap_all_connections()
+        await sync_to_async(wrappers.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.__exit__)(None, None, None)
+            _current.reset(token)
+        self._record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def _record(self, request, response, stats, seconds):
+        label, url_name = _view_label(request)
+        budget = _budget_for(label, url_name)
+        max_queries = budget.get("queries")
+        max_ms = budget.get("ms")
+        over_budget = (
+            (max_queries is not None and stats.queries > max_queries)
+            or (max_ms is not None and seconds * 1000 > max_ms)
+        )
+        if over_budget:
+            logger.warning(
+                "%s %s over budget: %d queries (%.1f ms SQL), %.1f ms total, %.1f ms templates "
+                "[budget: %s queries, %s ms]",
+                request.method, request.path, stats.queries, stats.query_seconds * 1000,
+                seconds * 1000, stats.template_seconds * 1000, max_queries, max_ms,
+                extra={"view": label},
+            )
+        registry.record(
+            label,
+            status=response.status_code,
+            seconds=seconds,
+            stats=stats,
+            cache_result=_cache_result(request),
+            over_budget=over_budget,
+        )
+
+
+class _wrap_all_connections:
+    """Install the query counter on every configured database alias."""
+
+    def __enter__(self):
+        self._managers = [connections[alias].execute_wrapper(_count_query) for alias in connections]
+        for manager in self._managers:
+            manager.__enter__()
+
+    def __exit__(self, *exc_info):
+        for manager in reversed(self._managers):
+            manager.__exit__(*exc_info)
+
+
+# ---------------------------------------------------------------------
+# Template timing
+# ---------------------------------------------------------------------
+
+class _TimedTemplate:
+    """Proxy around a backend template that times its outermost render."""
+
+    def __init__(self, template):
+        self._template = template
+
+    def __getattr__(self, name):
+        return getattr(self._template, name)
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return self._template.render(context, request)
+        stats.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return self._template.render(context, request)
+        finally:
+            stats.template_depth -= 1
+            if stats.template_depth == 0:
+                stats.template_seconds += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The stock Django template backend, plus render timing."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+# ---------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(snapshot: dict[str, ViewMetrics]) -> str:
+    """Format *snapshot* in the Prometheus text exposition format."""
+    families = [
+        ("haskala_http_requests_total", "counter", "Requests handled, by view and status."),
+        ("haskala_http_request_duration_seconds", "histogram", "Request latency, by view."),
+        ("haskala_db_queries_total", "counter", "SQL queries executed, by view."),
+        ("haskala_db_query_duration_seconds_total", "counter", "Time spent in SQL, by view."),
+        ("haskala_template_render_seconds_total", "counter", "Time spent rendering templates, by view."),
+        ("haskala_page_cache_requests_total", "counter", "Page-cache lookups, by view and result."),
+        ("haskala_perf_budget_exceeded_total", "counter", "Requests over their per-view budget."),
+    ]
+    lines: dict[str, list[str]] = {name: [] for name, _, _ in families}
+    for view in sorted(snapshot):
+        m = snapshot[view]
+        v = _escape_label(view)
+        for status, count in sorted(m.statuses.items()):
+            lines["haskala_http_requests_total"].append(
+                f'haskala_http_requests_total{{view="{v}",status="{status}"}} {count}'
+            )
+        hist = lines["haskala_http_request_duration_seconds"]
+        for bound, count in zip(LATENCY_BUCKETS, m.buckets):
+            hist.append(f'haskala_http_request_duration_seconds_bucket{{view="{v}",le="{bound}"}} {count}')
+        hist.append(f'haskala_http_request_duration_seconds_bucket{{view="{v}",le="+Inf"}} {m.requests}')
+        hist.append(f'haskala_http_request_duration_seconds_sum{{view="{v}"}} {m.seconds:.6f}')
+        hist.append(f'haskala_http_request_duration_seconds_count{{view="{v}"}} {m.requests}')
+        lines["haskala_db_queries_total"].append(f'haskala_db_queries_total{{view="{v}"}} {m.queries}')
+        lines["haskala_db_query_duration_seconds_total"].append(
+            f'haskala_db_query_duration_seconds_total{{view="{v}"}} {m.query_seconds:.6f}'
+        )
+        lines["haskala_template_render_seconds_total"].append(
+            f'haskala_template_render_seconds_total{{view="{v}"}} {m.template_seconds:.6f}'
+        )
+        lines["haskala_page_cache_requests_total"].append(
+            f'haskala_page_cache_requests_total{{view="{v}",result="hit"}} {m.cache_hits}'
+        )
+        lines["haskala_page_cache_requests_total"].append(
+            f'haskala_page_cache_requests_total{{view="{v}",result="miss"}} {m.cache_misses}'
+        )
+        lines["haskala_perf_budget_exceeded_total"].append(
+            f'haskala_perf_budget_exceeded_total{{view="{v}"}} {m.over_budget}'
+        )
+
+    out = []
+    for name, kind, help_text in families:
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines[name])
+    return "\n".join(out) + "\n"
+
+
+def render_outbound_prometheus(snapshot: dict[str, OutboundMetrics]) -> str:
+    """Format an :class:`OutboundRegistry` snapshot like :func:`render_prometheus`."""
+    families = [
+        ("haskala_outbound_requests_total", "counter", "Outbound HTTP requests, by host and outcome."),
+        ("haskala_outbound_request_duration_seconds", "histogram", "Outbound HTTP latency, by host."),
+        ("haskala_outbound_retries_total", "counter", "Outbound HTTP retries, by host."),
+    ]
+    lines: dict[str, list[str]] = {name: [] for name, _, _ in families}
+    for host in sorted(snapshot):
+        m = snapshot[host]
+        h = _escape_label(host)
+        for outcome, count in sorted(m.outcomes.items()):
+            lines["haskala_outbound_requests_total"].append(
+                f'haskala_outbound_requests_total{{host="{h}",outcome="{_escape_label(outcome)}"}} {count}'
+            )
+        hist = lines["haskala_outbound_request_duration_seconds"]
+        for bound, count in zip(LATENCY_BUCKETS, m.buckets):
+            hist.append(f'haskala_outbound_request_duration_seconds_bucket{{host="{h}",le="{bound}"}} {count}')
+        hist.append(f'haskala_outbound_request_duration_seconds_bucket{{host="{h}",le="+Inf"}} {m.requests}')
+        hist.append(f'haskala_outbound_request_duration_seconds_sum{{host="{h}"}} {m.seconds:.6f}')
+        hist.append(f'haskala_outbound_request_duration_seconds_count{{host="{h}"}} {m.requests}')
+        lines["haskala_outbound_retries_total"].append(f'haskala_outbound_retries_total{{host="{h}"}} {m.retries}')
+
+    out = []
+    for name, kind, help_text in families:
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines[name])
+    return "\n".join(out) + "\n"
+
+
+def _authorized(request) -> bool:
+    token = getattr(settings, "HASKALA_METRICS_TOKEN", "") or ""
+    if token:
+        header = request.headers.get("Authorization", "")
+        scheme, _, supplied = header.partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(supplied.strip(), token):
+            return True
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+@never_cache
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Readable with
+    ``Authorization: Bearer $HASKALA_METRICS_TOKEN`` or by a logged-in
+    staff user; everyone else gets a plain 404.
+    """
+    if not _authorized(request):
+        raise Http404()
+    return HttpResponse(
+        render_prometheus(registry.snapshot()) + render_outbound_prometheus(outbound.snapshot()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
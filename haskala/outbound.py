@@ -0,0 +1,113 @@
+"""
+Shared client for outbound HTTP calls (SPARQL push, hCaptcha, …).
+
+``requests.put()`` and friends open a new connection, with a new TLS
+handshake, for every call. :func:`session` instead returns a
+``requests.Session`` whose adapters are shared by the whole process:
+
+- connections are pooled per host and kept alive, up to
+  ``HASKALA_HTTP_POOL_MAXSIZE`` per host;
+- idempotent requests (GET, HEAD, PUT, DELETE, OPTIONS) are retried
+  ``HASKALA_HTTP_RETRIES`` times on connection errors and 502/503/504,
+  with exponential backoff (``HASKALA_HTTP_BACKOFF`` seconds, doubled
+  per attempt, honouring ``Retry-After``). POST is only retried when
+  the connection could not be opened, i.e. nothing was sent;
+- calls without an explicit ``timeout=`` get
+  ``(HASKALA_HTTP_CONNECT_TIMEOUT, HASKALA_HTTP_READ_TIMEOUT)``;
+- every call is counted per host in :data:`haskala.metrics.outbound`
+  and exposed at ``/metrics``.
+
+Sessions are per thread, since ``requests.Session`` is not
+thread-safe, but the connection pools behind them are shared.
+Credentials belong on the request (``auth=``) or on a private
+:func:`build_session`, never on the shared one.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from functools import cache
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import outbound
+
+RETRY_STATUSES = (502, 503, 504)
+
+
+class OutboundSession(requests.Session):
+    """A session with a default timeout that records every call."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.default_timeout
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException as exc:
+            outbound.record(host, outcome=type(exc).__name__, seconds=time.perf_counter() - start)
+            raise
+        retries = getattr(response.raw, "retries", None)
+        outbound.record(
+            host,
+            outcome=response.status_code,
+            seconds=time.perf_counter() - start,
+            retries=len(retries.history) if retries else 0,
+        )
+        return response
+
+
+@cache
+def _adapter() -> HTTPAdapter:
+    retry = Retry(
+        total=settings.HASKALA_HTTP_RETRIES,
+        backoff_factor=settings.HASKALA_HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS - {"TRACE"},
+        # Hand the last response back instead of raising MaxRetryError;
+        # callers check it with raise_for_status() as before.
+        raise_on_status=False,
+    )
+    return HTTPAdapter(
+        pool_connections=settings.HASKALA_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HASKALA_HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+
+
+def build_session() -> OutboundSession:
+    """A new session on the shared, pooled adapters."""
+    session = OutboundSession(
+        timeout=(settings.HASKALA_HTTP_CONNECT_TIMEOUT, settings.HASKALA_HTTP_READ_TIMEOUT),
+    )
+    session.mount("https://", _adapter())
+    session.mount("http://", _adapter())
+    return session
+
+
+_local = threading.local()
+
+
+def session() -> OutboundSession:
+    """This thread's shared outbound session."""
+    current = getattr(_local, "session", None)
+    if current is None:
+        current = _local.session = build_session()
+    return current
+
+
+def reset():
+    """Close the pools and forget the sessions, e.g. after a settings change."""
+    if _adapter.cache_info().currsize:
+        _adapter().close()
+    _adapter.cache_clear()
+    _local.__dict__.clear()
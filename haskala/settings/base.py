@@ -69,7 +69,9 @@ INSTALLED_APPS = [
     "rest_framework",
     "django_filters",
     "drf_spectacular",
-    "djangordf",
+    # djangordf is used as a library only (haskala_rdf.push imports its
+    # FusekiBackend on demand). Registering it as an app imported
+    # rdflib in every worker at startup.
     "crispy_forms",
     "crispy_bootstrap5",
 ]
@@ -80,6 +82,8 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 MIDDLEWARE = [
+    # Outermost, so latency and page-cache hits are measured end to end.
+    "haskala.metrics.PerformanceMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -97,7 +101,9 @@ ROOT_URLCONF = "haskala.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # The stock DjangoTemplates backend plus render timing for
+        # haskala.metrics.
+        "BACKEND": "haskala.metrics.InstrumentedDjangoTemplates",
         "DIRS": [
             os.path.join(PROJECT_DIR, "templates"),
         ],
@@ -114,6 +120,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "haskala.wsgi.application"
+ASGI_APPLICATION = "haskala.asgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
@@ -217,6 +224,12 @@ WAGTAILSEARCH_BACKENDS = {
 # e.g. in notification emails. Don't include '/admin' or a trailing slash
 WAGTAILADMIN_BASE_URL = "https://www.haskala-library.net"
 
+# Precomputed sitemaps (home/sitemaps.py): `manage.py write_sitemaps`
+# renders /sitemap.xml and its pages into HASKALA_SITEMAP_ROOT for nginx
+# to serve; absolute URLs in them start with HASKALA_SITEMAP_BASE_URL.
+HASKALA_SITEMAP_ROOT = env("HASKALA_SITEMAP_ROOT", default=os.path.join(STATIC_ROOT, "sitemaps"))
+HASKALA_SITEMAP_BASE_URL = env("HASKALA_SITEMAP_BASE_URL", default=WAGTAILADMIN_BASE_URL)
+
 WAGTAILADMIN_RICH_TEXT_EDITORS = {
     'default': {
         'WIDGET': 'wagtail.admin.rich_text.DraftailRichTextArea',
@@ -255,7 +268,11 @@ LOGGING = {
             'level': 'ERROR',
             'filters': ['require_debug_false'],
             'class': 'django.utils.log.AdminEmailHandler'
-        }
+        },
+        'console': {
+            'level': 'INFO',
+            'class': 'logging.StreamHandler',
+        },
     },
     'loggers': {
         'django.request': {
@@ -263,9 +280,32 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': True,
         },
+        'haskala.perf': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     }
 }
 
+# Per-view performance budgets (haskala.metrics). Keys are URL names
+# ("book-detail") or dotted view paths ("home.api.BookViewSet"); a
+# request that runs more SQL queries or takes longer than its budget
+# is logged to the "haskala.perf" logger. Views without an entry fall
+# back to HASKALA_PERF_BUDGET_DEFAULT.
+HASKALA_PERF_BUDGET_DEFAULT = {"queries": 100, "ms": 2000}
+HASKALA_PERF_BUDGETS = {
+    "book-detail": {"queries": 40, "ms": 1000},
+    "person-detail": {"queries": 25, "ms": 800},
+    "place-detail": {"queries": 25, "ms": 800},
+    "home.api.BookViewSet": {"queries": 30, "ms": 1500},
+    "home.api.PersonViewSet": {"queries": 20, "ms": 1000},
+}
+
+# Bearer token for the Prometheus scrape endpoint at /metrics. Empty
+# leaves the endpoint readable by logged-in staff users only.
+HASKALA_METRICS_TOKEN = env("HASKALA_METRICS_TOKEN", default="")
+
 CACHES = {
     'default': {
         'BACKEND': 'django_redis.cache.RedisCache',
@@ -405,6 +445,18 @@ HASKALA_SPARQL_PUSH_TIMEOUT = env("HASKALA_SPARQL_PUSH_TIMEOUT", default=60, cas
 HCAPTCHA_SITE_KEY = env("HCAPTCHA_SITE_KEY", default="")
 HCAPTCHA_SECRET_KEY = env("HCAPTCHA_SECRET_KEY", default="")
 
+# Outbound HTTP (haskala/outbound.py): the SPARQL push and the
+# hCaptcha check share keep-alive connection pools. POOL_MAXSIZE is
+# per host; RETRIES applies to idempotent methods on connection errors
+# and 502/503/504, waiting BACKOFF seconds, doubled per attempt.
+# The timeouts apply where a caller does not pass its own.
+HASKALA_HTTP_POOL_CONNECTIONS = env("HASKALA_HTTP_POOL_CONNECTIONS", default=10, cast=int)
+HASKALA_HTTP_POOL_MAXSIZE = env("HASKALA_HTTP_POOL_MAXSIZE", default=10, cast=int)
+HASKALA_HTTP_RETRIES = env("HASKALA_HTTP_RETRIES", default=3, cast=int)
+HASKALA_HTTP_BACKOFF = env("HASKALA_HTTP_BACKOFF", default=0.5, cast=float)
+HASKALA_HTTP_CONNECT_TIMEOUT = env("HASKALA_HTTP_CONNECT_TIMEOUT", default=5, cast=float)
+HASKALA_HTTP_READ_TIMEOUT = env("HASKALA_HTTP_READ_TIMEOUT", default=30, cast=float)
+
 # djangordf is the JudaicaLink-internal Django/RDF bridge. We use it
 # from haskala_rdf.push() to talk SPARQL Update to Fuseki; the
 # build_data_graph() pipeline keeps producing the raw rdflib graph
@@ -27,40 +27,75 @@ function initMap() {
 }
 
 // ------------------
-// Multi-marker map for the places index
+// Clustered map for the places index. Markers are fetched per
+// viewport from /api/places/clusters/ (GeoJSON); the server has
+// already bucketed them for the current zoom level.
 // ------------------
 function initPlacesMap() {
     var el = document.getElementById('places-map');
     if (!el) return;
 
-    var raw = el.dataset.markers;
-    if (!raw) return;
-
-    var markers;
-    try {
-        markers = JSON.parse(raw);
-    } catch (e) {
-        return;
-    }
-    if (!Array.isArray(markers) || markers.length === 0) return;
+    var url = el.dataset.clustersUrl;
+    if (!url) return;
 
     var map = L.map('places-map');
     L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
         attribution: '&copy; OpenStreetMap contributors'
     }).addTo(map);
 
-    var group = L.featureGroup();
-    markers.forEach(function (m) {
-        if (m.lat == null || m.lng == null) return;
-        var popup = m.url
-            ? '<a href="' + m.url + '">' + m.name + '</a>'
-            : m.name;
-        L.marker([m.lat, m.lng]).bindPopup(popup).addTo(group);
-    });
-    group.addTo(map);
+    var layer = L.layerGroup().addTo(map);
+    var pending = null;
 
-    var bounds = group.getBounds();
-    if (bounds.isValid()) {
+    function clusterIcon(count) {
+        var size = count < 10 ? 30 : count < 100 ? 36 : 44;
+        return L.divIcon({
+            html: '<span>' + count + '</span>',
+            className: 'places-map__cluster',
+            iconSize: [size, size]
+        });
+    }
+
+    function render(collection) {
+        layer.clearLayers();
+        (collection.features || []).forEach(function (f) {
+            var lng = f.geometry.coordinates[0];
+            var lat = f.geometry.coordinates[1];
+            var p = f.properties || {};
+            if (p.count > 1) {
+                L.marker([lat, lng], {icon: clusterIcon(p.count)})
+                    .on('click', function () {
+                        map.setView([lat, lng], map.getZoom() + 2);
+                    })
+                    .addTo(layer);
+                return;
+            }
+            var popup = p.url
+                ? '<a href="' + p.url + '">' + p.name + '</a>'
+                : p.name;
+            L.marker([lat, lng]).bindPopup(popup).addTo(layer);
+        });
+    }
+
+    function refresh() {
+        if (pending) pending.abort();
+        pending = new AbortController();
+        var query = '?zoom=' + map.getZoom()
+            + '&bbox=' + encodeURIComponent(map.getBounds().toBBoxString());
+        fetch(url + query, {signal: pending.signal})
+            .then(function (resp) { return resp.json(); })
+            .then(render)
+            .catch(function () { /* aborted or offline: keep the old layer */ });
+    }
+
+    map.on('moveend', refresh);
+
+    var bounds = null;
+    try {
+        bounds = JSON.parse(el.dataset.bounds || 'null');
+    } catch (e) {
+        bounds = null;
+    }
+    if (bounds) {
         map.fitBounds(bounds, {padding: [20, 20], maxZoom: 8});
     } else {
         map.setView([50, 10], 4);
@@ -8,28 +8,18 @@ from wagtail.admin import urls as wagtailadmin_urls
 from django.views.generic import RedirectView
 from wagtail.documents import urls as wagtaildocs_urls
 
-from django.contrib.sitemaps.views import sitemap
-from home.sitemaps import (
-    StaticViewSitemap,
-    BookSitemap,
-    PersonSitemap,
-    PlaceSitemap,
-    WagtailPageSitemap,
-)
-
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView,
-)
-
 from .api import api_router
+from home.api import api_router as rest_api_router
+from .lazy import lazy_view
+from .metrics import metrics_view
 from home.views import book_detail_view, books_list_view, book_cite_bibtex, book_cite_ris, \
     book_export, person_export, place_export, \
     digital_books_list_view, persons_list_view, \
-    person_detail_view, place_detail_view, places_list_view, search_view, topics_list_view, topic_detail_view, \
+    person_detail_view, place_detail_view, places_list_view, places_map_clusters_view, places_nearby_view, \
+    search_view, topics_list_view, topic_detail_view, \
     publishers_list_view, publisher_detail_view, occupation_detail_view, occupations_list_view, robots_txt, \
-    security_txt, series_list_view, series_detail_view, search_api_view
+    security_txt, sitemap_index_view, sitemap_page_view, series_list_view, series_detail_view, search_api_view, \
+    stats_view, stats_api_view
 
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 
@@ -44,15 +34,6 @@ if settings.DEBUG:
 else:
     urlpatterns = []
 
-sitemaps = {
-    "static": StaticViewSitemap,
-    "books": BookSitemap,
-    "persons": PersonSitemap,
-    "places": PlaceSitemap,
-    "pages": WagtailPageSitemap,
-}
-
-
 urlpatterns += [
     path('admin/', admin.site.urls),
 
@@ -100,30 +81,46 @@ urlpatterns += [
     # Search
     path("search/", search_view, name="search"),
 
+    # Statistics
+    path("stats/", stats_view, name="stats"),
+
     # Sitemaps and robots.txt
-    path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="django_sitemap"),
+    path("sitemap.xml", sitemap_index_view, name="django_sitemap"),
+    path("sitemaps/<slug:section>-<int:page>.xml", sitemap_page_view, name="sitemap-page"),
 
     # Custom search endpoint
     path("api/search/", search_api_view, name="api-search"),
 
-    # OpenAPI schema
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    # Catalogue statistics
+    path("api/stats/", stats_api_view, name="api-stats"),
+
+    # Marker clusters for the places overview map
+    path("api/places/clusters/", places_map_clusters_view, name="places-map-clusters"),
+
+    # Radius / k-nearest place lookups
+    path("api/places/nearby/", places_nearby_view, name="places-nearby"),
+
+    # OpenAPI schema (the generator is imported on first request)
+    path("api/schema/", lazy_view("drf_spectacular.views.SpectacularAPIView"), name="schema"),
 
     # Swagger UI
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
 
     # ReDoc
     path(
         "api/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
         name="redoc",
     ),
 
     # REST API (DRF router)
+    path("api/", include(rest_api_router.urls)),
+
+    # Wagtail API v2 (pages, images, documents)
     path("api/", api_router.urls),
 
     # Wagtail
@@ -133,6 +130,7 @@ urlpatterns += [
 
 urlpatterns += [
     path("robots.txt", robots_txt, name="robots_txt"),
+    path("metrics", metrics_view, name="metrics"),
     path(".well-known/security.txt", security_txt),
     path("favicon.ico", RedirectView.as_view(url="/static/img/favicon.ico")),
 ]
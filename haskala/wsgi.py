@@ -8,9 +8,17 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/wsgi/
 """
 
 import os
+from importlib import import_module
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "haskala.settings.dev")
 
 application = get_wsgi_application()
+
+# Load the URLconf, and with it the views, now instead of on each
+# worker's first request. Under `gunicorn --preload` the master does
+# this once and forked workers share the imported modules. Modules only
+# rare requests need are deferred, see haskala/lazy.py.
+import_module(settings.ROOT_URLCONF)
@@ -10,12 +10,16 @@ See: https://gbv.github.io/beaconspec/beacon.html
 """
 from __future__ import annotations
 
-from typing import Iterable
+from pathlib import Path
+from typing import Iterator
 
 from home.models import Person
 
 DEFAULT_TARGET = "http://data.judaicalink.org/data/haskala/person/{ID}"
 
+# GND identifiers fetched per round trip.
+CHUNK_SIZE = 2000
+
 
 def _header_lines(*, target: str, name: str, description: str) -> list[str]:
     return [
@@ -34,23 +38,44 @@ def build_beacon_lines(
         "Persons covered by the Haskala bibliography, mapped to their "
         "GND identifiers."
     ),
-) -> Iterable[str]:
+) -> Iterator[str]:
     """
     Yield BEACON file lines. Each yielded string is one line (no
     trailing newline). Persons without a known GND identifier are
     skipped.
+
+    Only the ``gnd_id`` column is read, through a server-side cursor,
+    so the persons are never loaded as a whole.
     """
     yield from _header_lines(target=target, name=name, description=description)
 
-    persons = Person.objects.exclude(gnd_id__isnull=True).exclude(gnd_id="") \
-        if _has_gnd_field() else []
+    if not _has_gnd_field():
+        return
 
-    for person in persons:
-        gnd_id = (getattr(person, "gnd_id", "") or "").strip()
+    gnd_ids = (
+        Person.objects.exclude(gnd_id__isnull=True).exclude(gnd_id="")
+        .values_list("gnd_id", flat=True)
+    )
+    for gnd_id in gnd_ids.iterator(chunk_size=CHUNK_SIZE):
+        gnd_id = gnd_id.strip()
         if gnd_id:
             yield gnd_id
 
 
+def write_beacon(path: Path, **kwargs) -> int:
+    """
+    Write the BEACON file to *path* line by line, as the lines are
+    produced. Returns the number of GND identifiers written.
+    """
+    written = 0
+    with open(path, "w", encoding="utf-8") as out:
+        for line in build_beacon_lines(**kwargs):
+            out.write(line + "\n")
+            if not line.startswith("#"):
+                written += 1
+    return written
+
+
 def _has_gnd_field() -> bool:
     """Return True if Person has a gnd_id field at this point in time."""
     return any(f.name == "gnd_id" for f in Person._meta.get_fields())
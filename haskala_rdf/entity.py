@@ -13,6 +13,7 @@ from typing import Any
 from rdflib import Graph, URIRef
 from rdflib.namespace import OWL, FOAF, DCTERMS
 
+from .formats import ACCEPT_TO_FORMAT, SERIALIZATION
 from .export import (
     HS, HSK, JL, GND, GND_ID_BASE,
     BookAuthor,
@@ -22,27 +23,6 @@ from .export import (
 )
 
 
-# RDFLIB serialization format key → outbound mime type.
-SERIALIZATION = {
-    "ttl":     ("turtle",   "text/turtle"),
-    "turtle":  ("turtle",   "text/turtle"),
-    "jsonld":  ("json-ld",  "application/ld+json"),
-    "json-ld": ("json-ld",  "application/ld+json"),
-    "rdf":     ("xml",      "application/rdf+xml"),
-    "xml":     ("xml",      "application/rdf+xml"),
-    "nt":      ("nt",       "application/n-triples"),
-}
-
-# Accept-header → format key. The keys here intentionally cover the
-# common Linked-Data mime types so content negotiation just works.
-ACCEPT_TO_FORMAT = {
-    "text/turtle":            "ttl",
-    "application/ld+json":    "jsonld",
-    "application/rdf+xml":    "rdf",
-    "application/n-triples":  "nt",
-}
-
-
 def _bind_extra(g: Graph) -> None:
     """Bind the shorter prefixes our exports rely on."""
     g.bind("foaf", FOAF)
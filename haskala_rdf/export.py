@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import csv
 import logging
+from collections import Counter
 from datetime import date
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -11,7 +12,7 @@ from typing import Any, Dict, Optional
 from django.conf import settings
 from django.db import models as dj_models
 
-from rdflib import Graph, Namespace, URIRef, Literal
+from rdflib import BNode, Graph, Namespace, URIRef, Literal
 from rdflib.namespace import RDF, RDFS, SKOS, FOAF, DCTERMS, XSD, OWL
 
 from home.models import (  # noqa: F401
@@ -151,12 +152,63 @@ def load_gnd_mapping() -> Dict[str, str]:
     return mapping
 
 
+# ---------------------------------------------------------
+# VoID-Statistik
+# ---------------------------------------------------------
+
+class VoidStatistics:
+    """
+    VoID-Kennzahlen eines Graphen, Tripel für Tripel gesammelt:
+    Tripel, Entitäten (typisierte Subjekte), Klassen mit Instanzzahl
+    und Property-Partitionen mit Tripelzahl.
+    """
+
+    def __init__(self):
+        self.triples = 0
+        self.entities: set = set()
+        self.classes: Counter = Counter()
+        self.properties: Counter = Counter()
+
+    def observe(self, triple) -> None:
+        s, p, o = triple
+        self.triples += 1
+        self.properties[p] += 1
+        if p == RDF.type:
+            self.entities.add(s)
+            self.classes[o] += 1
+
+    @classmethod
+    def of(cls, graph: Graph) -> "VoidStatistics":
+        """Statistik eines fertigen Graphen, in einem Durchlauf über die Tripel."""
+        stats = cls()
+        for triple in graph:
+            stats.observe(triple)
+        return stats
+
+
+class StatisticsGraph(Graph):
+    """
+    Graph, der seine :class:`VoidStatistics` beim Hinzufügen mitführt,
+    sodass der Metagraph sie nicht erneut über den Datengraphen
+    berechnen muss. Doppelte Tripel werden nur einmal gezählt.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statistics = VoidStatistics()
+
+    def add(self, triple):
+        if triple not in self:
+            self.statistics.observe(triple)
+        return super().add(triple)
+
+
 # ---------------------------------------------------------
 # RDF-Graph initialisieren
 # ---------------------------------------------------------
 
-def init_graph() -> Graph:
-    g = Graph()
+def init_graph(graph_class: type[Graph] = Graph) -> Graph:
+    g = graph_class()
     g.bind("rdf", RDF)
     g.bind("rdfs", RDFS)
     g.bind("skos", SKOS)
@@ -510,8 +562,11 @@ def build_data_graph() -> Graph:
     - Edition, TranslationType, Translation, Mention, Preface, Production
     - Topic, MentionDescription, ProductionRole, FootnoteLocation, OriginalType
     - Book (+ Autorenrollen, Sprachen, Digital-Infos)
+
+    Der Graph zählt beim Aufbau seine VoID-Statistik mit
+    (``g.statistics``, siehe :class:`StatisticsGraph`).
     """
-    g = init_graph()
+    g = init_graph(StatisticsGraph)
     gnd_map = load_gnd_mapping()
 
     export_simple_vocab_models(g)
@@ -558,7 +613,9 @@ def build_meta_graph(
     Erzeugt den Metagraphen (VoID/DCAT) für das Haskala-Dataset.
 
     - identifier: interner Name des Datasets (z.B. 'haskala')
-    - data_graph: optionaler Datengraph; wenn gesetzt, wird void:triples daraus berechnet
+    - data_graph: optionaler Datengraph; wenn gesetzt, werden void:triples,
+      void:entities, void:classes, void:properties und die Klassen- und
+      Property-Partitionen daraus übernommen
     - base_dump_uri: Basis-URL, unter der die Dump-Dateien erreichbar sind
     - dump_filename: Name der Dump-Datei (z.B. 'haskala.ttl.gz')
 
@@ -599,10 +656,11 @@ def build_meta_graph(
     g.add((dataset_uri, DCTERMS.issued, Literal(today, datatype=XSD.date)))
     g.add((dataset_uri, DCTERMS.modified, Literal(today, datatype=XSD.date)))
 
-    # Anzahl Tripel, falls Datengraph übergeben
+    # VoID-Statistik, falls Datengraph übergeben: aus dem beim Aufbau
+    # mitgezählten StatisticsGraph, sonst in einem Durchlauf berechnet
     if data_graph is not None:
-        triple_count = len(data_graph)
-        g.add((dataset_uri, VOID.triples, Literal(triple_count, datatype=XSD.integer)))
+        stats = getattr(data_graph, "statistics", None) or VoidStatistics.of(data_graph)
+        add_void_statistics(g, dataset_uri, stats)
 
     # Dump-Distribution
     dump_uri = URIRef(base_dump_uri.rstrip("/") + "/" + dump_filename)
@@ -626,6 +684,29 @@ def build_meta_graph(
     return g
 
 
+def add_void_statistics(g: Graph, dataset_uri: URIRef, stats: VoidStatistics) -> None:
+    """Schreibt die VoID-Kennzahlen und -Partitionen des Datasets nach *g*."""
+    def integer(n: int) -> Literal:
+        return Literal(n, datatype=XSD.integer)
+
+    g.add((dataset_uri, VOID.triples, integer(stats.triples)))
+    g.add((dataset_uri, VOID.entities, integer(len(stats.entities))))
+    g.add((dataset_uri, VOID.classes, integer(len(stats.classes))))
+    g.add((dataset_uri, VOID.properties, integer(len(stats.properties))))
+
+    for cls, count in sorted(stats.classes.items()):
+        partition = BNode()
+        g.add((dataset_uri, VOID.classPartition, partition))
+        g.add((partition, VOID["class"], cls))
+        g.add((partition, VOID.entities, integer(count)))
+
+    for prop, count in sorted(stats.properties.items()):
+        partition = BNode()
+        g.add((dataset_uri, VOID.propertyPartition, partition))
+        g.add((partition, VOID.property, prop))
+        g.add((partition, VOID.triples, integer(count)))
+
+
 def build_frontmatter_md(
     *,
     identifier: str = "haskala",
@@ -0,0 +1,27 @@
+"""
+RDF export formats and their Accept-header mime types.
+
+Kept apart from ``entity.py`` so the detail views can negotiate the
+format without importing rdflib; the graph is only built (and rdflib
+loaded) once a request actually asks for RDF.
+"""
+
+# RDFLIB serialization format key → outbound mime type.
+SERIALIZATION = {
+    "ttl":     ("turtle",   "text/turtle"),
+    "turtle":  ("turtle",   "text/turtle"),
+    "jsonld":  ("json-ld",  "application/ld+json"),
+    "json-ld": ("json-ld",  "application/ld+json"),
+    "rdf":     ("xml",      "application/rdf+xml"),
+    "xml":     ("xml",      "application/rdf+xml"),
+    "nt":      ("nt",       "application/n-triples"),
+}
+
+# Accept-header → format key. The keys here intentionally cover the
+# common Linked-Data mime types so content negotiation just works.
+ACCEPT_TO_FORMAT = {
+    "text/turtle":            "ttl",
+    "application/ld+json":    "jsonld",
+    "application/rdf+xml":    "rdf",
+    "application/n-triples":  "nt",
+}
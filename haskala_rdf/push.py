@@ -6,11 +6,13 @@ Two protocols are supported:
 - **Graph Store Protocol (GSP)** — the default. Uploads the serialized
   Turtle as the entire content of one named graph via HTTP PUT. Fuseki
   exposes this at ``/<dataset>/data``. djangordf's FusekiBackend does
-  not cover GSP itself, so this path stays on plain ``requests.put``.
+  not cover GSP itself, so this path PUTs through the shared session
+  from :mod:`haskala.outbound`.
 - **SPARQL 1.1 Update** — routes through
   :class:`djangordf.backends.fuseki.FusekiBackend`. We send one
   ``DROP SILENT GRAPH …; INSERT DATA { GRAPH … { … } }`` transaction
-  that the backend posts to ``/<dataset>/update``.
+  that the backend posts to ``/<dataset>/update``, over a session on
+  the same shared connection pools.
 
 Both paths replace the named graph wholesale; calling the push twice
 produces the same end state.
@@ -19,9 +21,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-import requests
 from rdflib import Graph
 
+from haskala import outbound
+
 
 @dataclass(frozen=True)
 class PushTarget:
@@ -45,7 +48,7 @@ def push_graph(graph: Graph, target: PushTarget):
         body = graph.serialize(format="turtle")
         if isinstance(body, str):
             body = body.encode("utf-8")
-        response = requests.put(
+        response = outbound.session().put(
             target.url,
             params={"graph": target.graph_iri},
             data=body,
@@ -72,6 +75,13 @@ def push_graph(graph: Graph, target: PushTarget):
         if target.auth is not None:
             backend_kwargs["user"], backend_kwargs["password"] = target.auth
         backend = FusekiBackend(**backend_kwargs)
+        # Swap the backend's private session for a pooled one, keeping
+        # the credentials it was given. The backend sets no timeout of
+        # its own, so the push timeout goes on the session.
+        pooled = outbound.build_session()
+        pooled.auth = backend.session.auth
+        pooled.default_timeout = target.timeout_seconds
+        backend.session = pooled
 
         # Serialize the graph to N-Triples and wrap in a single SPARQL
         # transaction. djangordf's backend.update() POSTs the body to
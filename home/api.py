@@ -1,6 +1,9 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, routers, viewsets
+from rest_framework.exceptions import ParseError
+from rest_framework.settings import api_settings
 
+from .eager_loading import apply_eager_loading
 from .models import (
     Alignment,
     Book,
@@ -59,20 +62,88 @@ from .serializers import (
     TranslationTypeSerializer,
     TypographySerializer,
 )
+from .pagination import KeysetPagination
+from .renderers import NDJSONRenderer, ndjson_line
+from .streaming import streaming_response
+
+# Rows fetched per round trip (and per prefetch batch) by ?all=1 dumps.
+BULK_CHUNK_SIZE = 2000
 
 
 class ReadOnlyBaseViewSet(viewsets.ReadOnlyModelViewSet):
-    """Read-only base view set with filtering, search and ordering enabled."""
+    """
+    Read-only base view set with filtering, search and ordering enabled.
+
+    ``?fields=a,b,c`` limits each item to the named fields and
+    ``?view=summary`` to the serializer's ``Meta.summary_fields`` with
+    relations flattened to primary keys. Either one also narrows the
+    SQL column list with ``.only()``.
+
+    Lists are paginated by keyset cursor (follow ``next``).
+    ``?format=ndjson&all=1`` streams the complete, filtered result set
+    as newline-delimited JSON in a single response.
+    """
 
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
+    pagination_class = KeysetPagination
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
     filterset_fields: list[str] = []
     search_fields: list[str] = []
     ordering_fields: list[str] = []
 
+    def field_selection(self) -> dict:
+        """Serializer kwargs for the ``fields`` / ``view`` query parameters."""
+        request = getattr(self, "request", None)
+        if request is None:
+            return {}
+        params = request.query_params
+        selection = {}
+        view = params.get("view", "full")
+        if view == "summary":
+            selection["summary"] = True
+        elif view != "full":
+            raise ParseError(f"Unknown view {view!r}; expected 'full' or 'summary'.")
+        names = [name.strip() for name in params.get("fields", "").split(",") if name.strip()]
+        if names:
+            selection["fields"] = names
+        return selection
+
+    def get_serializer(self, *args, **kwargs):
+        for key, value in self.field_selection().items():
+            kwargs.setdefault(key, value)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        # Joins and prefetches follow whatever the serializer renders,
+        # so nested relations never fall back to one query per row.
+        return apply_eager_loading(
+            super().get_queryset(),
+            self.get_serializer(),
+            restrict_columns=bool(self.field_selection()),
+        )
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == "ndjson" and request.query_params.get("all") in ("1", "true"):
+            return self.stream_all()
+        return super().list(request, *args, **kwargs)
+
+    def stream_all(self):
+        """Stream every matching record, without pagination or a count."""
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+
+        def lines():
+            for instance in queryset.iterator(chunk_size=BULK_CHUNK_SIZE):
+                yield ndjson_line(serializer.to_representation(instance))
+
+        response = streaming_response(self.request, lines(), content_type=NDJSONRenderer.media_type)
+        response["Content-Disposition"] = f'inline; filename="{self.basename}.ndjson"'
+        return response
+
 
 class BookViewSet(ReadOnlyBaseViewSet):
     queryset = Book.objects.all()
@@ -85,12 +156,11 @@ class BookViewSet(ReadOnlyBaseViewSet):
         "publisher",
         "series",
         "alignment",
-        "topics",
+        "topic",
     ]
     search_fields = [
         "name",
         "full_title",
-        "subtitle",
         "authors__pref_label",
         "authors__german_name",
         "authors__hebrew_name",
@@ -127,7 +197,7 @@ class CityViewSet(ReadOnlyBaseViewSet):
 
 
 class GeolocationViewSet(ReadOnlyBaseViewSet):
-    queryset = Geolocation.objects.select_related("city")
+    queryset = Geolocation.objects.all()
     serializer_class = GeolocationSerializer
     filterset_fields = ["city"]
     search_fields = ["city__name"]
@@ -135,7 +205,7 @@ class GeolocationViewSet(ReadOnlyBaseViewSet):
 
 
 class EditionViewSet(ReadOnlyBaseViewSet):
-    queryset = Edition.objects.select_related("book", "city")
+    queryset = Edition.objects.all()
     serializer_class = EditionSerializer
     filterset_fields = ["book", "city", "year"]
     search_fields = ["name", "book__name", "city__name"]
@@ -143,7 +213,7 @@ class EditionViewSet(ReadOnlyBaseViewSet):
 
 
 class TranslationViewSet(ReadOnlyBaseViewSet):
-    queryset = Translation.objects.select_related("book", "translator", "language", "city")
+    queryset = Translation.objects.all()
     serializer_class = TranslationSerializer
     filterset_fields = ["book", "translator", "language", "city"]
     search_fields = ["title", "book__name", "translator__pref_label"]
@@ -151,9 +221,7 @@ class TranslationViewSet(ReadOnlyBaseViewSet):
 
 
 class MentionViewSet(ReadOnlyBaseViewSet):
-    queryset = Mention.objects.select_related(
-        "mentionee", "mentionee_city", "mentionee_description"
-    )
+    queryset = Mention.objects.all()
     serializer_class = MentionSerializer
     filterset_fields = ["mentionee", "mentionee_city", "mentionee_description"]
     search_fields = ["mentionee__pref_label", "mentionee_city__name"]
@@ -306,14 +374,14 @@ class TranslationTypeViewSet(ReadOnlyBaseViewSet):
 
 
 class PrefaceViewSet(ReadOnlyBaseViewSet):
-    queryset = Preface.objects.select_related("book", "writer")
+    queryset = Preface.objects.all()
     serializer_class = PrefaceSerializer
     filterset_fields = ["book", "writer"]
     search_fields = ["title", "book__name", "writer__pref_label"]
 
 
 class ProductionViewSet(ReadOnlyBaseViewSet):
-    queryset = Production.objects.select_related("book", "producer", "role")
+    queryset = Production.objects.all()
     serializer_class = ProductionSerializer
     filterset_fields = ["book", "producer", "role"]
     search_fields = ["book__name", "producer__pref_label", "role__name"]
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class HomeConfig(AppConfig):
+    name = "home"
+
+    def ready(self):
+        # Connect the cache-invalidation receivers in home/signals.py.
+        from . import signals  # noqa: F401
@@ -0,0 +1,86 @@
+"""
+Set-based data-quality checks shared by ``audit_data_quality`` and the
+fix commands that act on its report.
+
+Every check is a fixed number of queries however large the catalogue
+is: orphans are one anti-join per model, duplicates one ``GROUP BY …
+HAVING COUNT(*) > 1`` per field. The results are lazy querysets or
+generators so callers can stream them straight into a CSV writer.
+"""
+from __future__ import annotations
+
+import re
+from itertools import groupby
+
+from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models.functions import Lower, Trim
+
+from home.models import Book, City, Edition, Mention, Person, Translation
+
+# Every foreign key pointing at City; a city none of them uses is an
+# orphan.
+CITY_REFERENCES = (
+    (Book, ("publication_place", "publication_place_other", "original_publication_place")),
+    (Person, ("place_of_birth", "place_of_death")),
+    (Edition, ("city",)),
+    (Translation, ("city",)),
+    (Mention, ("mentionee_city",)),
+)
+
+PERSON_NAME_FIELDS = ("pref_label", "german_name", "hebrew_name")
+
+DUPLICATE_FIELDS = (
+    (Person, PERSON_NAME_FIELDS),
+    (Book, ("name",)),
+    (City, ("name",)),
+)
+
+LEADING_PUNCT_RE = re.compile(r'^[(")\'\s,.;:]')
+# The same test in SQL, on the unstripped value.
+_LEADING_PUNCT_SQL = r'^\s*[(")\',.;:]'
+
+
+def orphan_places(queryset=None):
+    """*queryset* (default: every City) narrowed to unreferenced cities."""
+    if queryset is None:
+        queryset = City.objects.all()
+    for model, fields in CITY_REFERENCES:
+        refs = Q()
+        for field in fields:
+            refs |= Q(**{field: OuterRef("pk")})
+        queryset = queryset.filter(~Exists(model.objects.filter(refs)))
+    return queryset
+
+
+def name_punctuation_rows():
+    """
+    Yield ``(person pk, field, stripped value)`` for every person name
+    field starting with punctuation, in one query.
+    """
+    match = Q()
+    for field in PERSON_NAME_FIELDS:
+        match |= Q(**{f"{field}__regex": _LEADING_PUNCT_SQL})
+    rows = Person.objects.filter(match).order_by("pk").values_list("pk", *PERSON_NAME_FIELDS)
+    for pk, *values in rows.iterator():
+        for field, value in zip(PERSON_NAME_FIELDS, values):
+            value = (value or "").strip()
+            if value and LEADING_PUNCT_RE.match(value):
+                yield pk, field, value
+
+
+def duplicate_groups():
+    """
+    Yield ``(model name, field, key, [pks…])`` for every normalized
+    (trimmed, lower-cased) value shared by more than one row, one query
+    per model field.
+    """
+    for model, fields in DUPLICATE_FIELDS:
+        for field in sorted(fields):
+            keyed = model.objects.annotate(key=Lower(Trim(field))).exclude(key="")
+            shared = (
+                keyed.order_by().values("key")
+                .annotate(n=Count("pk")).filter(n__gt=1).values("key")
+            )
+            rows = keyed.filter(key__in=shared).order_by("key", "pk").values_list("key", "pk")
+            for key, group in groupby(rows.iterator(), key=lambda row: row[0]):
+                yield model.__name__, field, key, [pk for _, pk in group]
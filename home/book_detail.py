@@ -10,7 +10,6 @@ from dataclasses import dataclass
 from typing import Callable
 
 from .models import Book
-from .templatetags.value_filters import clean_value
 
 
 @dataclass(frozen=True)
@@ -20,56 +19,63 @@ class Section:
     has_data: Callable[[Book], bool]
 
 
-def _any(*values) -> bool:
-    """True when at least one value has meaningful content.
+def _any(b: Book, *fields) -> bool:
+    """True when at least one of the named fields has meaningful content.
 
-    Wraps clean_value() so legacy Drupal flags like ``"0.0"`` or
-    ``"0"`` count as "no data" — without this, every Book would
+    Reads through ``b.cleaned`` so legacy Drupal flags like ``"0.0"``
+    or ``"0"`` count as "no data" — without this, every Book would
     advertise its Subscription / Dedications / Printers section
-    regardless of whether real text lives behind those flags.
+    regardless of whether real text lives behind those flags. The
+    cleaned values are memoised, so the templates reuse them.
     """
-    return any(bool(clean_value(v)) for v in values)
+    cleaned = b.cleaned
+    return any(cleaned[name] for name in fields)
 
 
 def _identity_has_data(b: Book) -> bool:
     return _any(
-        b.full_title, b.title_in_latin_characters, b.motto, b.old_name_in_book,
-        b.other_books_names, b.original_text_name, b.original_title,
-        b.original_title_else_refer, b.original_title_elsewhere,
-        b.presented_as_original, b.presented_as_translation,
-        b.presented_new_edition,
+        b,
+        "full_title", "title_in_latin_characters", "motto", "old_name_in_book",
+        "other_books_names", "original_text_name", "original_title",
+        "original_title_else_refer", "original_title_elsewhere",
+        "presented_as_original", "presented_as_translation",
+        "presented_new_edition",
     )
 
 
 def _authors_has_data(b: Book) -> bool:
     return (
         b.bookauthor_set.exists()
-        or _any(b.original_author, b.original_author_else_refer,
-                b.original_author_elsewhere, b.original_author_other_name,
-                b.founders, b.proofreaders)
+        or _any(b, "original_author", "original_author_else_refer",
+                "original_author_elsewhere", "original_author_other_name",
+                "founders", "proofreaders")
     )
 
 
 def _publication_has_data(b: Book) -> bool:
     return _any(
-        b.publisher_id, b.original_publisher_id,
-        b.publication_place_id, b.publication_place_other_id,
-        b.gregorian_year, b.year_in_book, b.year_in_other,
-        b.hebrew_year_of_publication, b.hebrew_year_pub_other,
-        b.gregorian_year_pub_other, b.format_of_publication_date_id,
-        b.partial_publication, b.printed_originally,
-        b.original_publication_place_id, b.original_publication_year,
-        b.printers, b.printing_press_notes, b.printing_press_references,
-        b.production_evidence, b.series_id, b.series_part,
+        b,
+        "publisher_id", "original_publisher_id",
+        "publication_place_id", "publication_place_other_id",
+        "gregorian_year", "year_in_book", "year_in_other",
+        "hebrew_year_of_publication", "hebrew_year_pub_other",
+        "gregorian_year_pub_other", "format_of_publication_date_id",
+        "partial_publication", "printed_originally",
+        "original_publication_place_id", "original_publication_year",
+        "printers", "printing_press_notes", "printing_press_references",
+        "production_evidence", "series_id", "series_part",
     )
 
 
 def _physical_has_data(b: Book) -> bool:
-    return _any(
-        b.pages_number, b.height, b.width,
-        b.fonts.exists(), b.typography.exists(),
-        b.illustrations_diagrams, b.diagrams_notes, b.diagrams_book_pages,
-        b.alignment_id,
+    return (
+        _any(
+            b,
+            "pages_number", "height", "width",
+            "illustrations_diagrams", "diagrams_notes", "diagrams_book_pages",
+            "alignment_id",
+        )
+        or b.fonts.exists() or b.typography.exists()
     )
 
 
@@ -77,7 +83,7 @@ def _languages_has_data(b: Book) -> bool:
     return (
         b.languages.exists() or b.footnote_languages.exists()
         or b.occasional_words_languages.exists()
-        or _any(b.languages_number_id, b.location_of_footnotes_id, b.original_language_id)
+        or _any(b, "languages_number_id", "location_of_footnotes_id", "original_language_id")
     )
 
 
@@ -87,12 +93,13 @@ def _content_structure_has_data(b: Book) -> bool:
         or b.main_textual_models.exists()
         or b.secondary_textual_models.exists()
         or _any(
-            b.topic_id, b.target_audience_notes,
-            b.textual_model_notes, b.original_type_id,
-            b.structure_notes, b.structure_preface_notes,
-            b.table_of_content, b.contents_table_notes,
-            b.preface, b.epilogue, b.epilogue_notes,
-            b.dedications, b.dedications_notes,
+            b,
+            "topic_id", "target_audience_notes",
+            "textual_model_notes", "original_type_id",
+            "structure_notes", "structure_preface_notes",
+            "table_of_content", "contents_table_notes",
+            "preface", "epilogue", "epilogue_notes",
+            "dedications", "dedications_notes",
         )
     )
 
@@ -101,14 +108,15 @@ def _editions_has_data(b: Book) -> bool:
     return (
         b.editions.exists()
         or _any(
-            b.total_number_of_editions, b.last_known_edition, b.editions_notes,
-            b.references_for_editions, b.new_edition_general_notes,
-            b.new_edition_type_in_text, b.new_edition_type_elsewhere,
-            b.new_edition_type_reference, b.new_edition_type_else_ref,
-            b.new_edition_type_notes, b.new_edition_type_else_note,
-            b.copy_of_book_used,
-            b.other_volumes, b.volumes_notes,
-            b.volumes_published_number, b.planned_volumes,
+            b,
+            "total_number_of_editions", "last_known_edition", "editions_notes",
+            "references_for_editions", "new_edition_general_notes",
+            "new_edition_type_in_text", "new_edition_type_elsewhere",
+            "new_edition_type_reference", "new_edition_type_else_ref",
+            "new_edition_type_notes", "new_edition_type_else_note",
+            "copy_of_book_used",
+            "other_volumes", "volumes_notes",
+            "volumes_published_number", "planned_volumes",
         )
     )
 
@@ -117,9 +125,10 @@ def _translations_has_data(b: Book) -> bool:
     return (
         b.translations.exists()
         or _any(
-            b.translation_notes, b.translation_type_id,
-            b.presented_as_translation, b.presented_as_translation_refe,
-            b.presented_as_translatio_notes,
+            b,
+            "translation_notes", "translation_type_id",
+            "presented_as_translation", "presented_as_translation_refe",
+            "presented_as_translatio_notes",
         )
     )
 
@@ -136,53 +145,58 @@ def _mentions_has_data(b: Book) -> bool:
     return (
         b.mentions.exists()
         or _any(
-            b.mention_general_notes, b.mentions_in_reviews,
-            b.contemporary_disputes, b.contemporary_references,
-            b.later_references,
+            b,
+            "mention_general_notes", "mentions_in_reviews",
+            "contemporary_disputes", "contemporary_references",
+            "later_references",
         )
     )
 
 
 def _sources_has_data(b: Book) -> bool:
     return _any(
-        b.bibliographical_citations, b.studies,
-        b.sources_exist, b.sources_list,
-        b.sources_not_mentioned, b.sources_not_mentioned_list,
-        b.sources_not_mentioned_ref, b.sources_references,
-        b.jewish_sources_quotes, b.non_jewish_sources_quotes,
-        b.original_sources_mention, b.references_notes,
-        b.secondary_sources,
+        b,
+        "bibliographical_citations", "studies",
+        "sources_exist", "sources_list",
+        "sources_not_mentioned", "sources_not_mentioned_list",
+        "sources_not_mentioned_ref", "sources_references",
+        "jewish_sources_quotes", "non_jewish_sources_quotes",
+        "original_sources_mention", "references_notes",
+        "secondary_sources",
     )
 
 
 def _censorship_has_data(b: Book) -> bool:
     return _any(
-        b.censorship, b.bans, b.rabbinical_approbations,
-        b.rabbinical_approbation_notes,
+        b,
+        "censorship", "bans", "rabbinical_approbations",
+        "rabbinical_approbation_notes",
     )
 
 
 def _subscription_has_data(b: Book) -> bool:
     return _any(
-        b.subscribers, b.subscribers_notes,
-        b.subscription_appeal, b.subscription_appeal_notes,
-        b.recommendations, b.recommendations_notes,
-        b.price, b.sellers, b.sellers_notes,
-        b.thanks, b.thanks_notes,
-        b.contacts_official_agents, b.contacts_other_people,
-        b.personal_address, b.personal_address_notes,
+        b,
+        "subscribers", "subscribers_notes",
+        "subscription_appeal", "subscription_appeal_notes",
+        "recommendations", "recommendations_notes",
+        "price", "sellers", "sellers_notes",
+        "thanks", "thanks_notes",
+        "contacts_official_agents", "contacts_other_people",
+        "personal_address", "personal_address_notes",
     )
 
 
 def _availability_has_data(b: Book) -> bool:
-    return _any(
-        b.not_available is True, b.availability_notes,
-        b.other_libraries,
-        b.bar_ilan_library_id, b.berlin_library_id, b.british_library_id,
-        b.frankfurt_library_id, b.huji_library_id,
-        b.new_york_library_id, b.tel_aviv_library_id,
-        b.digital_book_url, b.digital_book_title, b.digital_book_attributes,
-        b.preservation_references, b.catalog_numbers_notes,
+    return b.not_available is True or _any(
+        b,
+        "availability_notes",
+        "other_libraries",
+        "bar_ilan_library_id", "berlin_library_id", "british_library_id",
+        "frankfurt_library_id", "huji_library_id",
+        "new_york_library_id", "tel_aviv_library_id",
+        "digital_book_url", "digital_book_title", "digital_book_attributes",
+        "preservation_references", "catalog_numbers_notes",
     )
 
 
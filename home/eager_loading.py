@@ -0,0 +1,125 @@
+"""
+Derive ``select_related`` / ``prefetch_related`` for a DRF serializer.
+
+The API serializers use ``fields = "__all__"`` with ``depth = 1``, so
+which relations end up in a response depends on the model rather than
+on anything spelled out in ``home.api``. Hand-maintained
+``select_related`` calls drifted out of date (and ``Book`` / ``Person``
+never had any), and every nested object or many-to-many list cost one
+query per row.
+
+:func:`eager_loading_plan` walks the serializer's bound fields instead
+and returns the relation paths it will touch:
+
+- a nested serializer or an object-valued related field on a forward
+  foreign key / one-to-one becomes a ``select_related`` path,
+- a many-to-many or reverse relation (``many=True``) becomes a
+  ``prefetch_related`` path, and so does anything nested below one,
+- plain primary-key related fields on a foreign key are skipped: DRF
+  reads them straight off ``<field>_id``.
+
+Nested serializers are walked recursively, so the depth-0 many-to-many
+lists inside a depth-1 nested object are prefetched too.
+
+The plan also records the columns the serializer reads on the base
+model and on every joined model, so a narrowed serializer (see
+``?fields=`` in ``home.api``) can ask the database for just those
+with ``.only()``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+
+
+@dataclass(frozen=True)
+class EagerLoadingPlan:
+    select_related: tuple[str, ...] = ()
+    prefetch_related: tuple[str, ...] = ()
+    only: tuple[str, ...] = ()
+
+    def apply(self, queryset, restrict_columns=False):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if restrict_columns and self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+# (serializer class, field names and types) -> plan. Serializers are
+# rebuilt on every request but their shape only changes with the field
+# selection.
+# Clients pick the selection, so the cache is bounded.
+_plans: dict[tuple, EagerLoadingPlan] = {}
+_MAX_PLANS = 512
+
+
+def eager_loading_plan(serializer) -> EagerLoadingPlan:
+    """Return the :class:`EagerLoadingPlan` for a bound *serializer*."""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    key = (type(serializer), tuple((name, type(f)) for name, f in serializer.fields.items()))
+    plan = _plans.get(key)
+    if plan is None:
+        select: list[str] = []
+        prefetch: list[str] = []
+        columns: list[str] = []
+        _walk(serializer, "", False, select, prefetch, columns)
+        if len(_plans) >= _MAX_PLANS:
+            _plans.clear()
+        plan = _plans[key] = EagerLoadingPlan(tuple(select), tuple(prefetch), tuple(columns))
+    return plan
+
+
+def apply_eager_loading(queryset, serializer, restrict_columns=False):
+    """Shortcut for ``eager_loading_plan(serializer).apply(queryset, …)``."""
+    return eager_loading_plan(serializer).apply(queryset, restrict_columns)
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _walk(serializer, prefix, in_prefetch, select, prefetch, columns):
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if model is None:
+        return
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        # Only direct relations on this model are planned; dotted
+        # sources are rare here and a wrong guess would cost a join.
+        if len(field.source_attrs) != 1:
+            continue
+        model_field = _model_field(model, field.source_attrs[0])
+        if model_field is None:
+            continue
+        path = prefix + field.source_attrs[0]
+        # Prefetched rows are loaded whole; only joined models are
+        # narrowed together with the base model.
+        if model_field.concrete and not model_field.many_to_many and not in_prefetch:
+            columns.append(path)
+        if not model_field.is_relation:
+            continue
+        to_many = model_field.many_to_many or model_field.one_to_many
+
+        if isinstance(field, serializers.ListSerializer):
+            prefetch.append(path)
+            _walk(field.child, path + "__", True, select, prefetch, columns)
+        elif isinstance(field, relations.ManyRelatedField):
+            prefetch.append(path)
+        elif isinstance(field, serializers.BaseSerializer):
+            (prefetch if in_prefetch or to_many else select).append(path)
+            _walk(field, path + "__", in_prefetch or to_many, select, prefetch, columns)
+        elif isinstance(field, relations.RelatedField):
+            if to_many:
+                prefetch.append(path)
+            elif not field.use_pk_only_optimization():
+                (prefetch if in_prefetch else select).append(path)
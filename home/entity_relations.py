@@ -0,0 +1,281 @@
+"""
+The precomputed entries of the place and person pages.
+
+A place page used to run six queries over Book, Edition, Translation,
+Mention and Person (three of them ORs over the three publication
+place columns, with ``DISTINCT``), a person page four plus four
+``.exists()`` checks for its table of contents, and the PDF exports
+repeated all of it. :class:`~home.models.EntityRelation` keeps one row
+per entry instead, indexed on ``(city, role)`` / ``(person, role)``,
+so :func:`place_relations` and :func:`person_relations` read a whole
+page with one query.
+
+The rows are derived state, kept in step by :mod:`home.signals`:
+
+- saving a Book, Person, Edition, Translation, Mention, Preface,
+  Production or BookAuthor replaces the rows built from it
+  (:func:`refresh`);
+- deleting one removes them through the ``CASCADE`` foreign keys, or,
+  for Book and Person, whose rows only point at them with
+  ``SET_NULL``, through :func:`forget`.
+
+Bulk imports bypass ``save()``; ``import_haskala_all`` ends with
+:func:`rebuild`, and ``manage.py rebuild_entity_relations`` runs it by
+hand after single-stage imports or raw SQL.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable
+
+from django.apps import apps as global_apps
+from django.db import transaction
+
+from .models import EntityRelation
+
+Role = EntityRelation.Role
+
+BATCH_SIZE = 1000
+
+
+def _book_rows(row):
+    cities = (row["publication_place_id"], row["publication_place_other_id"],
+              row["original_publication_place_id"])
+    return [
+        {"city_id": city, "role": Role.PUBLISHED, "book_id": row["pk"]}
+        for city in dict.fromkeys(cities) if city
+    ]
+
+
+def _person_rows(row):
+    places = ((Role.BORN, row["place_of_birth_id"]), (Role.DIED, row["place_of_death_id"]))
+    return [
+        {"city_id": city, "role": role, "related_person_id": row["pk"]}
+        for role, city in places if city
+    ]
+
+
+def _edition_rows(row):
+    if not row["city_id"]:
+        return []
+    return [{"city_id": row["city_id"], "role": Role.EDITION, "book_id": row["book_id"],
+             "edition_id": row["pk"]}]
+
+
+def _translation_rows(row):
+    if not row["city_id"]:
+        return []
+    return [{"city_id": row["city_id"], "role": Role.TRANSLATION, "book_id": row["book_id"],
+             "translation_id": row["pk"]}]
+
+
+def _mention_rows(row):
+    shown = {"role": Role.MENTION, "book_id": row["book_id"], "mention_id": row["pk"]}
+    rows = []
+    if row["mentionee_city_id"]:
+        rows.append({"city_id": row["mentionee_city_id"], "related_person_id": row["mentionee_id"], **shown})
+    if row["mentionee_id"]:
+        rows.append({"person_id": row["mentionee_id"], **shown})
+    return rows
+
+
+def _person_role_rows(person_field, role, source_field):
+    def build(row):
+        if not row[person_field]:
+            return []
+        return [{"person_id": row[person_field], "role": role, "book_id": row["book_id"],
+                 source_field: row["pk"]}]
+    return build
+
+
+@dataclass(frozen=True)
+class Source:
+    # Columns (attnames) the rows are built from.
+    columns: tuple[str, ...]
+    # callable(column values incl. "pk") -> EntityRelation field dicts
+    build: Callable[[dict], list[dict]]
+    # callable(pk) -> filter selecting the rows built from that object
+    owned: Callable[[object], dict]
+
+
+# model name -> how its EntityRelation rows are built
+SOURCES = {
+    "Book": Source(
+        ("publication_place_id", "publication_place_other_id", "original_publication_place_id"),
+        _book_rows,
+        lambda pk: {"role": Role.PUBLISHED, "book_id": pk},
+    ),
+    "Person": Source(
+        ("place_of_birth_id", "place_of_death_id"),
+        _person_rows,
+        lambda pk: {"role__in": (Role.BORN, Role.DIED), "related_person_id": pk},
+    ),
+    "Edition": Source(("city_id", "book_id"), _edition_rows, lambda pk: {"edition_id": pk}),
+    "Translation": Source(("city_id", "book_id"), _translation_rows, lambda pk: {"translation_id": pk}),
+    "Mention": Source(
+        ("mentionee_city_id", "mentionee_id", "book_id"), _mention_rows, lambda pk: {"mention_id": pk},
+    ),
+    "Preface": Source(
+        ("writer_id", "book_id"),
+        _person_role_rows("writer_id", Role.PREFACE, "preface_id"),
+        lambda pk: {"preface_id": pk},
+    ),
+    "Production": Source(
+        ("producer_id", "book_id"),
+        _person_role_rows("producer_id", Role.PRODUCTION, "production_id"),
+        lambda pk: {"production_id": pk},
+    ),
+    "BookAuthor": Source(
+        ("person_id", "book_id"),
+        _person_role_rows("person_id", Role.WORK, "book_author_id"),
+        lambda pk: {"book_author_id": pk},
+    ),
+}
+
+
+def _source(instance) -> Source:
+    return SOURCES[instance._meta.concrete_model.__name__]
+
+
+def refresh(instance, update_fields=None):
+    """Replace the rows built from *instance* with ones from its current columns."""
+    source = _source(instance)
+    if update_fields is not None:
+        # e.g. Wagtail's draft bookkeeping: no place column changed.
+        changed = {
+            field.attname for field in instance._meta.concrete_fields
+            if field.name in update_fields or field.attname in update_fields
+        }
+        if not changed & set(source.columns):
+            return
+    values = {column: getattr(instance, column) for column in source.columns}
+    rows = source.build({"pk": instance.pk, **values})
+    with transaction.atomic():
+        EntityRelation.objects.filter(**source.owned(instance.pk)).delete()
+        EntityRelation.objects.bulk_create([EntityRelation(**row) for row in rows])
+
+
+def forget(instance):
+    """Drop the rows built from *instance*, which is being deleted."""
+    EntityRelation.objects.filter(**_source(instance).owned(instance.pk)).delete()
+
+
+def rebuild(apps=global_apps, batch_size=BATCH_SIZE) -> int:
+    """
+    Rebuild the whole table from the source models; returns the row
+    count. *apps* is the migration state when run from a migration.
+    """
+    Relation = apps.get_model("home", "EntityRelation")
+    total = 0
+    with transaction.atomic():
+        Relation.objects.all().delete()
+        for model_name, source in SOURCES.items():
+            Model = apps.get_model("home", model_name)
+            rows = (
+                Relation(**fields)
+                for values in Model.objects.values("pk", *source.columns).iterator(chunk_size=batch_size)
+                for fields in source.build(values)
+            )
+            while batch := list(islice(rows, batch_size)):
+                Relation.objects.bulk_create(batch)
+                total += len(batch)
+    return total
+
+
+def _null_last(value):
+    # Postgres sorts NULLs after everything else in ascending order.
+    return (value is None, value or "")
+
+
+def _by_role(rows):
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row.role].append(row)
+    return grouped
+
+
+def place_relations(city) -> dict:
+    """The place page's entry lists for *city*, from one query."""
+    rows = _by_role(
+        EntityRelation.objects.filter(city=city).select_related(
+            "book", "related_person", "edition", "translation__language",
+            "mention__mentionee_description",
+        )
+    )
+
+    books = [row.book for row in rows[Role.PUBLISHED] if row.book and row.book.live]
+    books.sort(key=lambda book: (book.gregorian_year is None, book.gregorian_year or 0, book.name or ""))
+
+    editions = []
+    for row in rows[Role.EDITION]:
+        row.edition.book = row.book
+        editions.append(row.edition)
+    editions.sort(key=lambda edition: _null_last(edition.year))
+
+    translations = []
+    for row in rows[Role.TRANSLATION]:
+        row.translation.book = row.book
+        translations.append(row.translation)
+    translations.sort(key=lambda translation: _null_last(translation.year))
+
+    mentions = []
+    for row in rows[Role.MENTION]:
+        row.mention.book = row.book
+        row.mention.mentionee = row.related_person
+        mentions.append(row.mention)
+    mentions.sort(key=lambda mention: _null_last(mention.mentionee and mention.mentionee.pref_label))
+
+    def people(role):
+        found = [row.related_person for row in rows[role] if row.related_person and row.related_person.live]
+        return sorted(found, key=lambda person: _null_last(person.pref_label))
+
+    return {
+        "books_published_here": books,
+        "editions_here": editions,
+        "translations_here": translations,
+        "mentions_here": mentions,
+        "born_here": people(Role.BORN),
+        "died_here": people(Role.DIED),
+    }
+
+
+def person_relations(person) -> dict:
+    """The person page's entry lists for *person*, from one query."""
+    rows = _by_role(
+        EntityRelation.objects.filter(person=person).select_related(
+            "book", "book_author", "preface", "production__role",
+            "mention__mentionee_city", "mention__mentionee_description",
+        )
+    )
+
+    works = sorted(
+        (row for row in rows[Role.WORK] if row.book),
+        key=lambda row: (row.book_author.role, row.book.name or ""),
+    )
+    books_by_role = defaultdict(list)
+    for row in works:
+        books_by_role[row.book_author.get_role_display()].append(row.book)
+
+    def entries(role, attr):
+        found = []
+        for row in rows[role]:
+            entry = getattr(row, attr)
+            entry.book = row.book
+            found.append(entry)
+        return sorted(found, key=lambda entry: _null_last(entry.book and entry.book.name))
+
+    mentions = []
+    for row in rows[Role.MENTION]:
+        row.mention.book = row.book
+        row.mention.mentionee = person
+        mentions.append(row.mention)
+    mentions.sort(key=lambda mention: _null_last(mention.mentionee_city and mention.mentionee_city.name))
+
+    return {
+        "person_books_by_role": dict(books_by_role),
+        "prefaces_by_person": entries(Role.PREFACE, "preface"),
+        "productions_by_person": entries(Role.PRODUCTION, "production"),
+        "mentions_of_person": mentions,
+    }
@@ -0,0 +1,742 @@
+"""
+Shared engine for the Drupal CSV importers (``import_haskala_*``,
+``import_cities``).
+
+The importers used to resolve every ``*_tid`` column with its own
+``Model.objects.get(legacy_tid=…)``, write every row with
+``update_or_create`` and every many-to-many with ``.set()`` — a handful
+of round trips per CSV row — and each carried its own copy of
+``parse_int`` / ``parse_timestamp``. Now a command describes its CSV
+declaratively and :class:`ImportEngine` does the rest in a fixed number
+of queries per batch:
+
+- an :class:`ImportSpec` maps CSV columns to model fields
+  (:class:`Column`, :class:`Const`, :class:`ForeignKey`,
+  :class:`ManyToMany`) and names the natural key (``legacy_nid`` /
+  ``legacy_tid``),
+- :class:`LegacyLookup` loads ``legacy id → pk`` for a model once and
+  answers every later lookup from memory,
+- :func:`bulk_upsert` diffs the parsed rows against the stored ones by
+  the natural key and writes only new and changed rows with
+  ``bulk_create`` / ``bulk_update``,
+- :func:`sync_m2m` brings a through table in line with the wanted
+  ``{owner pk: {target pks}}`` mapping in bulk.
+
+Commands subclass :class:`ImportCommand`, which adds ``--dry-run``
+(run everything, report the diff, roll back) and ``--batch-size`` and
+prints created / updated / unchanged counts and rows/sec per model.
+
+Every run records a fingerprint of the values written per row
+(:class:`~home.models.ImportedRow`). With ``--incremental`` a row whose
+``legacy_changed`` timestamp or fingerprint matches the stored one is
+counted as unchanged without being diffed or written.
+
+Bulk writes bypass ``Model.save()`` and model signals. What ``save()``
+would derive has to be declared on the spec: ``slug_source`` for
+slugged models (allocated in bulk by :class:`~home.slugs.SlugAllocator`),
+``prepare`` for anything else (the trig columns of ``Geolocation``,
+say).
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from .slugs import SlugAllocator
+
+BATCH_SIZE = 500
+
+# How many changed rows a --dry-run lists per model.
+DIFF_PREVIEW = 20
+
+NULL_STRINGS = {"", "nan", "none", "null"}
+
+# Drupal's "no value" markers: PHP-serialised empty arrays ("a:0:{}")
+# in any text column, and zero flags ("0", "0.0") in the yes/no columns
+# that were imported as text. Migration 0036 emptied the stored ones;
+# parse_text / parse_flag_text keep re-imports from bringing them back.
+LEGACY_EMPTY_RE = re.compile(r'^\s*a:0:\{\}\s*;?\s*$')
+ZERO_FLAG_RE = re.compile(r'^\s*0(\.0+)?\s*$')
+
+
+# ---------------------------------------------------------------------
+# Value parsers
+# ---------------------------------------------------------------------
+
+def clean(value) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def clean_or_none(value):
+    return clean(value) or None
+
+
+def parse_text(value) -> str:
+    """A text cell as-is, except that ``a:0:{}`` becomes ``""``."""
+    text = str(value)
+    return "" if LEGACY_EMPTY_RE.match(text) else text
+
+
+def parse_flag_text(value) -> str:
+    """:func:`parse_text` for a yes/no column stored as text: ``"0.0"`` is ``""`` too."""
+    text = parse_text(value)
+    return "" if ZERO_FLAG_RE.match(text) else text
+
+
+def clean_text(value) -> str:
+    """:func:`clean`, then :func:`parse_text`: for plain text columns."""
+    return parse_text(clean(value))
+
+
+def clean_text_or_none(value):
+    return clean_text(value) or None
+
+
+def format_or_null(value) -> str:
+    """Drupal text-format columns: empty means the ``'NULL'`` choice."""
+    return clean(value) or "NULL"
+
+
+def parse_int(value):
+    """``'402'``, ``'402.0'``, ``' 402 '`` → 402; blanks and junk → None."""
+    val = clean(value)
+    if val.lower() in NULL_STRINGS:
+        return None
+    try:
+        return int(float(val))
+    except ValueError:
+        return None
+
+
+def parse_float(value):
+    val = clean(value)
+    if val.lower() in NULL_STRINGS:
+        return None
+    try:
+        return float(val)
+    except ValueError:
+        return None
+
+
+def parse_bool(value) -> bool:
+    return clean(value).lower() in ("1", "true", "yes", "y", "t")
+
+
+def parse_timestamp(value):
+    """Drupal stores created/changed as UNIX timestamps."""
+    val = clean(value)
+    if not val:
+        return None
+    try:
+        ts = float(val)
+    except ValueError:
+        return None
+    # Django's current timezone (Europe/Berlin in this project).
+    return datetime.fromtimestamp(ts, tz=timezone.get_current_timezone())
+
+
+def parse_tid_list(value) -> list[int]:
+    """Multi-valued id columns: ``'12|34'``, ``'12;34'`` or ``'12, 34'``."""
+    val = clean(value)
+    for separator in ";,":
+        val = val.replace(separator, "|")
+    return [tid for tid in (parse_int(part) for part in val.split("|")) if tid is not None]
+
+
+def row_hash(values: dict, m2m: dict) -> str:
+    """Fingerprint of the parsed values (and link sets) of one row."""
+    parts = [f"{name}={values[name]!r}" for name in sorted(values)]
+    parts += [f"{name}={sorted(map(str, m2m[name]))}" for name in sorted(m2m)]
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+
+def read_csv(path) -> list[dict]:
+    with Path(path).open(newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def chunked(items, size=BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ---------------------------------------------------------------------
+# Column mapping
+# ---------------------------------------------------------------------
+
+_ABSENT = object()
+
+
+def _raw(source, row):
+    """
+    Read *source* from *row*: a column name, a tuple of alternative
+    column names (first non-blank wins) or a ``callable(row)``.
+    Returns ``_ABSENT`` when no named column exists in the row.
+    """
+    if callable(source):
+        return source(row)
+    if isinstance(source, tuple):
+        present = [row[name] for name in source if name in row]
+        if not present:
+            return _ABSENT
+        return next((value for value in present if clean(value)), present[0])
+    return row.get(source, _ABSENT)
+
+
+@dataclass(frozen=True)
+class Column:
+    """CSV value → model field. *source* defaults to the field name."""
+    field: str
+    source: Any = None
+    parse: Callable = clean
+    # Leave the field untouched when the CSV lacks the column ...
+    optional: bool = False
+    # ... or when the cell is blank.
+    omit_blank: bool = False
+
+    def value(self, row):
+        raw = _raw(self.source or self.field, row)
+        if raw is _ABSENT:
+            if self.optional:
+                return _ABSENT
+            raw = None
+        if self.omit_blank and not clean(raw):
+            return _ABSENT
+        return self.parse(raw)
+
+
+@dataclass(frozen=True)
+class Const:
+    field: str
+    value_: Any
+
+    def value(self, row):
+        return self.value_
+
+
+@dataclass(frozen=True)
+class ForeignKey:
+    """A legacy id column resolved to the pk of *model* by *key*."""
+    field: str
+    source: Any
+    model: type
+    key: str = "legacy_tid"
+    parse: Callable = parse_int
+    # Skip the whole row when the reference does not resolve.
+    required: bool = False
+
+
+@dataclass(frozen=True)
+class ManyToMany:
+    """A multi-valued legacy id column; the stored set is replaced."""
+    field: str
+    source: Any
+    model: type
+    key: str = "legacy_tid"
+    split: Callable = parse_tid_list
+
+
+@dataclass
+class ImportSpec:
+    model: type
+    columns: list
+    # Natural key: model field and where to read it.
+    key: str = "legacy_nid"
+    key_source: Any = "nid"
+    key_parse: Callable = parse_int
+    # Model field matched instead when a row has no key (e.g. "name").
+    fallback_key: str | None = None
+    m2m: list = field(default_factory=list)
+    label: str = ""
+    # False: create missing rows, never touch existing ones.
+    update_existing: bool = True
+    # callable(row) -> reason string to skip the row, or None.
+    skip: Callable | None = None
+    # callable(values) to derive fields save() would fill.
+    prepare: Callable | None = None
+    # callable(instance) -> slug source text (None: no slug), for new
+    # rows without a slug.
+    slug_source: Callable | None = None
+
+    def __post_init__(self):
+        self.label = self.label or self.model.__name__
+
+
+# ---------------------------------------------------------------------
+# Lookups and set-based writes
+# ---------------------------------------------------------------------
+
+class LegacyLookup:
+    """Preloaded ``legacy id → pk`` maps per (model, key field), built on first use."""
+
+    def __init__(self, key_field="legacy_tid"):
+        self.key_field = key_field
+        self._maps: dict[tuple[type, str], dict] = {}
+
+    def map_for(self, model, key=None) -> dict:
+        key = key or self.key_field
+        mapping = self._maps.get((model, key))
+        if mapping is None:
+            rows = model.objects.filter(**{f"{key}__isnull": False}).order_by("-pk").values_list(key, "pk")
+            # Reverse pk order so the oldest row wins on duplicates.
+            mapping = self._maps[(model, key)] = dict(rows)
+        return mapping
+
+    def get(self, model, value, key=None):
+        """Primary key of the *model* row whose *key* is *value*, or None."""
+        if value is None:
+            return None
+        return self.map_for(model, key).get(value)
+
+    def add(self, model, value, pk, key=None):
+        """Record a row created after the map was loaded."""
+        if value is not None:
+            self.map_for(model, key)[value] = pk
+
+    def forget(self, model):
+        """Drop the maps of *model*, e.g. after it was re-imported."""
+        for cache_key in [k for k in self._maps if k[0] is model]:
+            del self._maps[cache_key]
+
+
+@dataclass
+class UpsertResult:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    # natural key -> primary key, for every row seen.
+    pks: dict = field(default_factory=dict)
+    # natural key -> changed field names, for updated rows.
+    changes: dict = field(default_factory=dict)
+    created_keys: list = field(default_factory=list)
+
+
+def bulk_upsert(
+    model, rows: dict, key="legacy_nid", batch_size=BATCH_SIZE, prepare_new=None,
+    touch=("updated_at",), update_existing=True,
+):
+    """
+    Insert or update *model* rows in bulk.
+
+    *rows* maps each natural-key value to a ``{attname: value}`` dict
+    (use ``publisher_id``, not ``publisher``). Existing rows are
+    matched on *key*; only those whose values differ are written, and
+    only the columns that appear in *rows* are touched. *prepare_new*
+    is called once with the list of new, unsaved instances before they
+    are inserted.
+    Fields named in *touch* that exist on the model are set to now on
+    updated rows, as ``auto_now`` would on ``save()``.
+    """
+    result = UpsertResult()
+    if not rows:
+        return result
+
+    existing = {}
+    for keys in chunked(rows, batch_size):
+        for obj in model.objects.filter(**{f"{key}__in": keys}).order_by("pk"):
+            # Keep the oldest row when the key is not unique in the DB.
+            existing.setdefault(getattr(obj, key), obj)
+
+    columns = sorted({name for values in rows.values() for name in values})
+    touched = [name for name in touch if _has_field(model, name) and name not in columns]
+    now = timezone.now()
+
+    to_create, to_update = [], []
+    for natural_key, values in rows.items():
+        obj = existing.get(natural_key)
+        if obj is None:
+            to_create.append(model(**{key: natural_key, **values}))
+            continue
+        result.pks[natural_key] = obj.pk
+        if not update_existing:
+            result.unchanged += 1
+            continue
+        changed = [name for name, value in values.items() if getattr(obj, name) != value]
+        if changed:
+            for name in changed:
+                setattr(obj, name, values[name])
+            for name in touched:
+                setattr(obj, name, now)
+            to_update.append(obj)
+            result.changes[natural_key] = changed
+        else:
+            result.unchanged += 1
+
+    if to_create and prepare_new is not None:
+        prepare_new(to_create)
+    for batch in chunked(to_create, batch_size):
+        model.objects.bulk_create(batch)
+    for obj in to_create:
+        result.pks[getattr(obj, key)] = obj.pk
+        result.created_keys.append(getattr(obj, key))
+    if to_update:
+        model.objects.bulk_update(to_update, [*columns, *touched], batch_size=batch_size)
+
+    result.created = len(to_create)
+    result.updated = len(to_update)
+    return result
+
+
+def _has_field(model, name):
+    return any(f.name == name for f in model._meta.concrete_fields)
+
+
+def sync_m2m(model, field_name, wanted: dict, batch_size=BATCH_SIZE) -> tuple[int, int]:
+    """
+    Make ``<owner>.<field_name>`` equal ``wanted[owner_pk]`` for every
+    owner in *wanted* (an empty set clears it). Returns ``(added,
+    removed)`` through-table row counts.
+    """
+    m2m = model._meta.get_field(field_name)
+    through = m2m.remote_field.through
+    source = m2m.m2m_field_name() + "_id"
+    target = m2m.m2m_reverse_field_name() + "_id"
+
+    current = defaultdict(dict)
+    for owners in chunked(wanted, batch_size):
+        rows = through.objects.filter(**{f"{source}__in": owners}).values_list("pk", source, target)
+        for row_pk, owner, other in rows:
+            current[owner][other] = row_pk
+
+    to_add, to_remove = [], []
+    for owner, targets in wanted.items():
+        have = current.get(owner, {})
+        to_add.extend(through(**{source: owner, target: other}) for other in targets - have.keys())
+        to_remove.extend(row_pk for other, row_pk in have.items() if other not in targets)
+
+    for batch in chunked(to_add, batch_size):
+        through.objects.bulk_create(batch, ignore_conflicts=True)
+    for batch in chunked(to_remove, batch_size):
+        through.objects.filter(pk__in=batch).delete()
+    return len(to_add), len(to_remove)
+
+
+# ---------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------
+
+@dataclass
+class ImportReport:
+    """Counts and diff of one :meth:`ImportEngine.run`."""
+    label: str
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: Counter = field(default_factory=Counter)
+    # field -> legacy ids that did not resolve
+    unresolved: dict = field(default_factory=lambda: defaultdict(set))
+    m2m_added: int = 0
+    m2m_removed: int = 0
+    # Unchanged rows --incremental skipped without diffing them.
+    fresh: int = 0
+    seconds: float = 0.0
+    changes: dict = field(default_factory=dict)
+    new_keys: list = field(default_factory=list)
+    # natural key -> pk of every imported row
+    pks: dict = field(default_factory=dict)
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        text = f"{self.label}: {self.created} created, {self.updated} updated, {self.unchanged} unchanged"
+        if self.fresh:
+            text += f" ({self.fresh} not re-read)"
+        if self.skipped:
+            text += ", " + ", ".join(f"{n} skipped ({reason})" for reason, n in sorted(self.skipped.items()))
+        if self.m2m_added or self.m2m_removed:
+            text += f"; M2M links +{self.m2m_added} / -{self.m2m_removed}"
+        return text + f". {self.rows} rows in {self.seconds:.2f}s ({self.rate:.0f} rows/s)."
+
+    def warnings(self) -> list[str]:
+        lines = []
+        for field_name, ids in sorted(self.unresolved.items()):
+            shown = ", ".join(str(i) for i in sorted(ids)[:20])
+            more = f" (+{len(ids) - 20} more)" if len(ids) > 20 else ""
+            lines.append(f"{self.label}.{field_name}: {len(ids)} unknown legacy id(s): {shown}{more}")
+        return lines
+
+    def diff_lines(self, limit=DIFF_PREVIEW) -> list[str]:
+        lines = [f"  + {key}" for key in self.new_keys[:limit]]
+        lines += [f"  ~ {key}: {', '.join(fields)}" for key, fields in list(self.changes.items())[:limit]]
+        hidden = max(0, len(self.new_keys) - limit) + max(0, len(self.changes) - limit)
+        if hidden:
+            lines.append(f"  … {hidden} more")
+        return lines
+
+
+class ImportEngine:
+    """
+    Runs :class:`ImportSpec` objects against parsed CSV rows. One engine (and
+    its :class:`LegacyLookup`) serves a whole command, so a vocabulary
+    map loaded for one spec is reused by the next.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE, lookup: LegacyLookup | None = None, incremental=False):
+        self.batch_size = batch_size
+        self.lookup = lookup or LegacyLookup()
+        self.incremental = incremental
+
+    def run(self, spec: ImportSpec, rows) -> ImportReport:
+        started = time.monotonic()
+        report = ImportReport(spec.label)
+        by_key: dict = {}
+        by_fallback: dict = {}
+        wanted = {m.field: {} for m in spec.m2m}
+        hashes: dict = {}
+
+        for row in rows:
+            report.rows += 1
+            reason = spec.skip(row) if spec.skip else None
+            if reason:
+                report.skipped[reason] += 1
+                continue
+            values = self._values(spec, row, report)
+            if values is None:
+                continue
+            raw_key = _raw(spec.key_source, row)
+            natural_key = None if raw_key is _ABSENT else spec.key_parse(raw_key)
+            if natural_key is None:
+                fallback = values.get(spec.fallback_key) if spec.fallback_key else None
+                if fallback in (None, ""):
+                    report.skipped[f"no {spec.key}"] += 1
+                    continue
+                by_fallback[fallback] = values
+                target = ("fallback", fallback)
+            else:
+                # A later row for the same key wins, as update_or_create did.
+                by_key[natural_key] = values
+                target = ("key", natural_key)
+            for m2m in spec.m2m:
+                wanted[m2m.field][target] = self._m2m_targets(m2m, row, report)
+            if target[0] == "key":
+                hashes[natural_key] = row_hash(values, {m.field: wanted[m.field][target] for m in spec.m2m})
+
+        stored_hashes = self._stored_hashes(spec, hashes)
+        pks = {}
+        if self.incremental:
+            for natural_key, pk in self._fresh(spec, by_key, hashes, stored_hashes).items():
+                del by_key[natural_key]
+                for targets in wanted.values():
+                    targets.pop(("key", natural_key), None)
+                pks[("key", natural_key)] = report.pks[natural_key] = pk
+                report.fresh += 1
+                report.unchanged += 1
+
+        prepare_new = None
+        if spec.slug_source:
+            # What save() does for slugged models, for all new rows at once.
+            allocator = SlugAllocator(spec.model)
+            prepare_new = partial(allocator.assign, source=spec.slug_source)
+        for kind, key, rows_by in (("key", spec.key, by_key), ("fallback", spec.fallback_key, by_fallback)):
+            if not rows_by:
+                continue
+            result = bulk_upsert(
+                spec.model, rows_by, key=key, batch_size=self.batch_size,
+                prepare_new=prepare_new, update_existing=spec.update_existing,
+            )
+            report.created += result.created
+            report.updated += result.updated
+            report.unchanged += result.unchanged
+            report.changes.update(result.changes)
+            report.new_keys += result.created_keys
+            for natural_key, pk in result.pks.items():
+                pks[(kind, natural_key)] = pk
+                if kind == "key":
+                    report.pks[natural_key] = pk
+
+        for m2m in spec.m2m:
+            owners = {pks[target]: targets for target, targets in wanted[m2m.field].items() if target in pks}
+            added, removed = sync_m2m(spec.model, m2m.field, owners, batch_size=self.batch_size)
+            report.m2m_added += added
+            report.m2m_removed += removed
+
+        self._store_hashes(spec, {k: hashes[k] for k in by_key}, stored_hashes)
+
+        # New rows are not in any preloaded map of this model.
+        self.lookup.forget(spec.model)
+        report.seconds = time.monotonic() - started
+        return report
+
+    def _fresh(self, spec, by_key, hashes, stored_hashes) -> dict:
+        """
+        ``{natural key: pk}`` of the stored rows that need no diff: their
+        ``legacy_changed`` equals the incoming one, or, for rows without
+        a timestamp, the fingerprint of the incoming values matches the
+        one recorded by the last import.
+        """
+        model = spec.model
+        timestamped = _has_field(model, "legacy_changed")
+        fields = [spec.key, "pk", "legacy_changed"] if timestamped else [spec.key, "pk"]
+        fresh = {}
+        for keys in chunked(by_key, self.batch_size):
+            for natural_key, pk, *changed in model.objects.filter(**{f"{spec.key}__in": keys}).values_list(*fields):
+                incoming = by_key[natural_key].get("legacy_changed") if timestamped else None
+                if incoming is not None:
+                    unchanged = [incoming] == changed
+                else:
+                    unchanged = stored_hashes.get(str(natural_key)) == hashes[natural_key]
+                if unchanged:
+                    fresh.setdefault(natural_key, pk)
+        return fresh
+
+    def _stored_hashes(self, spec, hashes) -> dict:
+        from .models import ImportedRow
+
+        stored = {}
+        label = spec.model._meta.label_lower
+        for keys in chunked(map(str, hashes), self.batch_size):
+            stored.update(ImportedRow.objects.filter(model=label, key__in=keys).values_list("key", "row_hash"))
+        return stored
+
+    def _store_hashes(self, spec, hashes, stored):
+        from .models import ImportedRow
+
+        label = spec.model._meta.label_lower
+        changed = [
+            ImportedRow(model=label, key=str(key), row_hash=value)
+            for key, value in hashes.items()
+            if stored.get(str(key)) != value
+        ]
+        ImportedRow.objects.bulk_create(
+            changed,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["model", "key"],
+            update_fields=["row_hash", "imported_at"],
+        )
+
+    def _values(self, spec, row, report):
+        values = {}
+        for column in spec.columns:
+            if isinstance(column, ForeignKey):
+                raw = _raw(column.source, row)
+                legacy_id = None if raw is _ABSENT else column.parse(raw)
+                pk = self.lookup.get(column.model, legacy_id, column.key)
+                if legacy_id is not None and pk is None:
+                    report.unresolved[column.field].add(legacy_id)
+                if pk is None and column.required:
+                    report.skipped[f"{column.field} missing"] += 1
+                    return None
+                values[f"{column.field}_id"] = pk
+                continue
+            value = column.value(row)
+            if value is not _ABSENT:
+                values[column.field] = value
+        if spec.prepare is not None:
+            spec.prepare(values)
+        return values
+
+    def _m2m_targets(self, m2m, row, report) -> set:
+        targets = set()
+        raw = _raw(m2m.source, row)
+        for legacy_id in m2m.split(None if raw is _ABSENT else raw):
+            pk = self.lookup.get(m2m.model, legacy_id, m2m.key)
+            if pk is None:
+                report.unresolved[m2m.field].add(legacy_id)
+            else:
+                targets.add(pk)
+        return targets
+
+
+# ---------------------------------------------------------------------
+# Management command base
+# ---------------------------------------------------------------------
+
+class ImportCommand(BaseCommand):
+    """
+    Base for the CSV importers. Subclasses implement
+    :meth:`run_import` and call :meth:`import_rows` /
+    :meth:`import_csv` for each spec; everything runs in one
+    transaction, which ``--dry-run`` rolls back after reporting.
+    """
+
+    # {resolved path: rows} parsed ahead of the run, see read_rows().
+    preloaded: dict | None = None
+    # False when the caller rolls back the enclosing transaction itself
+    # (import_haskala_all), so a dry run's rows stay visible to the
+    # stages after it.
+    rollback_dry_run: bool = True
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run the import, print what would change and roll back.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Rows per bulk INSERT/UPDATE statement (default {BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Skip rows whose legacy_changed or value fingerprint matches the last import.",
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options["dry_run"]
+        self.engine = ImportEngine(batch_size=options["batch_size"], incremental=options["incremental"])
+        self.reports: list[ImportReport] = []
+        started = time.monotonic()
+        with transaction.atomic():
+            self.run_import(**options)
+            if self.dry_run and self.rollback_dry_run:
+                transaction.set_rollback(True)
+        seconds = time.monotonic() - started
+        rows = sum(report.rows for report in self.reports)
+        suffix = " Dry run: nothing was written." if self.dry_run else ""
+        self.stdout.write(f"{rows} rows in {seconds:.2f}s ({rows / seconds if seconds else 0:.0f} rows/s).{suffix}")
+
+    def run_import(self, **options):
+        raise NotImplementedError
+
+    def require_file(self, path) -> Path:
+        path = Path(path)
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        return path
+
+    def read_rows(self, path) -> list[dict]:
+        """
+        The rows of the CSV at *path*, taken from :attr:`preloaded` when
+        a caller (``import_haskala_all``) has parsed it already.
+        """
+        rows = self.preloaded.get(str(Path(path).resolve())) if self.preloaded else None
+        if rows is None:
+            rows = read_csv(path)
+        return rows
+
+    def import_csv(self, spec: ImportSpec, path) -> ImportReport:
+        self.stdout.write(f"Reading {path} ...")
+        return self.import_rows(spec, self.read_rows(path))
+
+    def import_rows(self, spec: ImportSpec, rows) -> ImportReport:
+        report = self.engine.run(spec, rows)
+        self.reports.append(report)
+        self.stdout.write(self.style.SUCCESS(report.summary()))
+        for line in report.warnings():
+            self.stdout.write(self.style.WARNING(line))
+        if self.dry_run:
+            for line in report.diff_lines():
+                self.stdout.write(line)
+        return report
@@ -6,7 +6,7 @@ from pathlib import Path
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from haskala_rdf.beacon import build_beacon_lines
+from haskala_rdf.beacon import write_beacon
 from haskala_rdf.export import build_data_graph, build_meta_graph
 from haskala_rdf.frontmatter import build_frontmatter_md
 from haskala_rdf.push import push_graph, target_from_settings
@@ -50,11 +50,10 @@ class Command(BaseCommand):
         )
 
         def write_gz(graph, filename):
-            ttl_path = current / filename
-            graph.serialize(destination=str(ttl_path), format="turtle")
-            with open(ttl_path, "rb") as f_in, gzip.open(str(ttl_path) + ".gz", "wb") as f_out:
-                shutil.copyfileobj(f_in, f_out)
-            ttl_path.unlink()
+            # Serialize straight into the gzip stream, without an
+            # uncompressed copy on disk.
+            with gzip.open(current / f"{filename}.gz", "wb") as out:
+                graph.serialize(destination=out, format="turtle")
 
         write_gz(data_graph, "haskala.ttl")
         write_gz(meta_graph, "haskala-meta.ttl")
@@ -69,10 +68,7 @@ class Command(BaseCommand):
         )
         (current / "haskala.md").write_text(md, encoding="utf-8")
 
-        beacon_lines = list(build_beacon_lines())
-        (current / "haskala-beacon.txt").write_text(
-            "\n".join(beacon_lines) + "\n", encoding="utf-8"
-        )
+        write_beacon(current / "haskala-beacon.txt")
 
         self.stdout.write(self.style.SUCCESS(
             f"Haskala RDF export completed: {current}"
@@ -89,7 +85,7 @@ class Command(BaseCommand):
             return
 
         self.stdout.write(
-            f"  Pushing {len(data_graph)} triples to {push_target.url} "
+            f"  Pushing {data_graph.statistics.triples} triples to {push_target.url} "
             f"(graph: {push_target.graph_iri}, protocol: {push_target.protocol})"
         )
         response = push_graph(data_graph, push_target)
@@ -0,0 +1,296 @@
+"""
+Run the whole Drupal migration in dependency order.
+
+Replaces the hand-run sequence documented in
+docs/developers/importers.md. Every CSV the stages need is parsed
+up front in worker processes; the stages then run as soon as the
+stages they depend on have finished, independent ones in parallel
+threads, each in its own transaction and on its own DB connection:
+
+    taxonomies ──┬── persons ───────────────┬── relations
+                 └── footnotes ── books ────┘
+
+``import_haskala_alignment``, ``_textual_vocabs`` and ``import_cities``
+are not stages: ``import_haskala_taxonomies`` loads the same CSVs.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Callable
+
+from django.core.management import call_command, load_command_class
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from home.entity_relations import rebuild as rebuild_entity_relations
+from home.importing import BATCH_SIZE, read_csv
+from home.stats import rebuild as rebuild_stats
+from home.taxonomy_counts import invalidate_taxonomy_counts
+
+from .import_haskala_taxonomies import CITIES_CSV, LANGUAGES_CSV, VOCAB_FILES
+
+RELATION_FILES = (
+    "editions_for_django.csv",
+    "translations_for_django.csv",
+    "mentions_for_django.csv",
+    "prefaces_for_django.csv",
+    "productions_for_django.csv",
+    "main_textual_models.csv",
+    "secondary_textual_models.csv",
+    "books_for_django.csv",
+)
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    command: str
+    after: tuple = ()
+    # callable(export_dir, drupal_dir) -> command options
+    options: Callable = None
+    # callable(export_dir, drupal_dir) -> CSV paths the stage reads
+    files: Callable = None
+    # callable(export_dir, drupal_dir) -> path; the stage is skipped
+    # when that file is missing.
+    requires: Callable = None
+
+
+STAGES = (
+    Stage(
+        "taxonomies",
+        "import_haskala_taxonomies",
+        options=lambda export, drupal: {"base_dir": str(export)},
+        files=lambda export, drupal: [
+            export / CITIES_CSV,
+            export / LANGUAGES_CSV,
+            *(export / filename for _, filename in VOCAB_FILES),
+        ],
+        requires=lambda export, drupal: export / CITIES_CSV,
+    ),
+    Stage(
+        # Writes FootnoteLocation, which taxonomies writes too.
+        "footnotes",
+        "import_haskala_footnote_locations",
+        after=("taxonomies",),
+        options=lambda export, drupal: {"file": str(export / "location_of_footnotes.csv")},
+        files=lambda export, drupal: [export / "location_of_footnotes.csv"],
+        requires=lambda export, drupal: export / "location_of_footnotes.csv",
+    ),
+    Stage(
+        "persons",
+        "import_haskala_persons",
+        after=("taxonomies",),
+        options=lambda export, drupal: {"file": str(export / "persons_for_django.csv")},
+        files=lambda export, drupal: [export / "persons_for_django.csv"],
+        requires=lambda export, drupal: export / "persons_for_django.csv",
+    ),
+    Stage(
+        "books",
+        "import_haskala_books",
+        after=("taxonomies", "footnotes"),
+        options=lambda export, drupal: {"file": str(export / "books_for_django.csv")},
+        files=lambda export, drupal: [export / "books_for_django.csv"],
+        requires=lambda export, drupal: export / "books_for_django.csv",
+    ),
+    Stage(
+        "relations",
+        "import_haskala_relations",
+        after=("persons", "books"),
+        options=lambda export, drupal: {"export_dir": str(export), "drupal_dir": str(drupal)},
+        files=lambda export, drupal: [
+            *(export / filename for filename in RELATION_FILES),
+            drupal / "field_data_field_book.csv",
+        ],
+        requires=lambda export, drupal: drupal / "field_data_field_book.csv",
+    ),
+)
+
+
+@dataclass
+class StageResult:
+    stage: Stage
+    seconds: float = 0.0
+    rows: int = 0
+    output: str = ""
+    skipped: str = ""
+
+
+class Command(BaseCommand):
+    help = "Run all Haskala importers in dependency order, parsing and importing in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--export-dir",
+            required=True,
+            help="Directory of the pre-processed CSV exports (typically research/export)",
+        )
+        parser.add_argument(
+            "--drupal-dir",
+            required=True,
+            help="Directory of the raw Drupal CSV exports (typically Database)",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Worker processes for CSV parsing and parallel stages (1 = run sequentially)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Rows per bulk INSERT/UPDATE statement (default {BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Pass --incremental to every stage: skip rows unchanged since the last import.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run every stage in one transaction, report and roll back (implies --jobs 1 for the stages).",
+        )
+
+    def handle(self, *args, **options):
+        export_dir = Path(options["export_dir"]).resolve()
+        drupal_dir = Path(options["drupal_dir"]).resolve()
+        for label, path in (("--export-dir", export_dir), ("--drupal-dir", drupal_dir)):
+            if not path.is_dir():
+                raise CommandError(f"{label} is not a directory: {path}")
+
+        jobs = max(1, options["jobs"])
+        started = time.monotonic()
+
+        files = sorted({
+            path for stage in STAGES for path in stage.files(export_dir, drupal_dir) if path.exists()
+        })
+        parsed = self._parse(files, jobs)
+        parse_seconds = time.monotonic() - started
+        self.stdout.write(f"Parsed {len(files)} CSV files in {parse_seconds:.2f}s ({jobs} worker(s)).")
+
+        common = {
+            "batch_size": options["batch_size"],
+            "incremental": options["incremental"],
+            "dry_run": options["dry_run"],
+            "preloaded": parsed,
+        }
+        if options["dry_run"]:
+            # Later stages need the rows of earlier ones, so the dry run
+            # shares one transaction that is rolled back at the end.
+            with transaction.atomic():
+                results = self._run_stages(export_dir, drupal_dir, common, jobs=1)
+                transaction.set_rollback(True)
+        else:
+            results = self._run_stages(export_dir, drupal_dir, common, jobs)
+            # The stages write with bulk_create / bulk_update, which
+            # skip the save() signals that keep the page entries and
+            # statistics current.
+            relations_started = time.monotonic()
+            total = rebuild_entity_relations(batch_size=options["batch_size"])
+            self.stdout.write(
+                f"Rebuilt {total} entity relations in {time.monotonic() - relations_started:.2f}s."
+            )
+            invalidate_taxonomy_counts()
+            rebuild_stats(batch_size=options["batch_size"])
+
+        self._report(results, parse_seconds, time.monotonic() - started, options["dry_run"])
+
+    def _parse(self, files, jobs):
+        """{resolved path: rows}, parsed in *jobs* worker processes."""
+        if jobs == 1 or len(files) < 2:
+            return {str(path): read_csv(path) for path in files}
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return dict(zip(map(str, files), pool.map(read_csv, files)))
+
+    def _run_stages(self, export_dir, drupal_dir, common, jobs):
+        results: dict[str, StageResult] = {}
+        pending = list(STAGES)
+
+        def ready(stage):
+            return all(name in results for name in stage.after)
+
+        if jobs == 1:
+            while pending:
+                stage = next(stage for stage in pending if ready(stage))
+                pending.remove(stage)
+                results[stage.name] = self._run_stage(stage, export_dir, drupal_dir, common)
+                self._echo(results[stage.name])
+            return results
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            running = {}
+            while pending or running:
+                for stage in [stage for stage in pending if ready(stage)]:
+                    pending.remove(stage)
+                    running[pool.submit(self._run_stage_in_thread, stage, export_dir, drupal_dir, common)] = stage
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        results[stage.name] = future.result()
+                    except Exception as exc:
+                        # Let the stages already running finish (and commit
+                        # or roll back on their own), start no new ones.
+                        wait(running)
+                        raise CommandError(f"Stage {stage.name!r} failed: {exc}") from exc
+                    self._echo(results[stage.name])
+        return results
+
+    def _run_stage_in_thread(self, stage, export_dir, drupal_dir, common):
+        try:
+            return self._run_stage(stage, export_dir, drupal_dir, common)
+        finally:
+            # Each worker thread opened its own connection.
+            connections.close_all()
+
+    def _run_stage(self, stage, export_dir, drupal_dir, common):
+        result = StageResult(stage)
+        required = stage.requires(export_dir, drupal_dir)
+        if not required.exists():
+            result.skipped = f"{required.name} not found"
+            return result
+
+        command = load_command_class("home", stage.command)
+        command.preloaded = common["preloaded"]
+        # A dry run rolls back once, around all stages (see handle()).
+        command.rollback_dry_run = False
+        out = StringIO()
+        started = time.monotonic()
+        call_command(
+            command,
+            stdout=out,
+            batch_size=common["batch_size"],
+            incremental=common["incremental"],
+            dry_run=common["dry_run"],
+            **stage.options(export_dir, drupal_dir),
+        )
+        result.seconds = time.monotonic() - started
+        result.rows = sum(report.rows for report in command.reports)
+        result.output = out.getvalue()
+        return result
+
+    def _echo(self, result):
+        if result.skipped:
+            self.stdout.write(self.style.WARNING(f"== {result.stage.name}: skipped ({result.skipped})"))
+            return
+        self.stdout.write(self.style.MIGRATE_HEADING(f"== {result.stage.name}"))
+        self.stdout.write(result.output.rstrip())
+
+    def _report(self, results, parse_seconds, total_seconds, dry_run):
+        self.stdout.write(self.style.MIGRATE_HEADING("Stage timings"))
+        self.stdout.write(f"  {'parse':<12} {parse_seconds:8.2f}s")
+        for stage in STAGES:
+            result = results.get(stage.name)
+            if result is None or result.skipped:
+                continue
+            rate = result.rows / result.seconds if result.seconds else 0
+            self.stdout.write(
+                f"  {stage.name:<12} {result.seconds:8.2f}s  {result.rows:>8} rows  {rate:>8.0f} rows/s"
+            )
+        self.stdout.write(f"  {'total':<12} {total_seconds:8.2f}s")
+        suffix = " Dry run: nothing was written." if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(f"Import finished.{suffix}"))
@@ -1,7 +1,15 @@
-from django.core.management.base import BaseCommand, CommandError
-import csv
-import os
+from pathlib import Path
 
+from django.core.management.base import CommandError
+
+from home.importing import (
+    Column,
+    ForeignKey,
+    ImportCommand,
+    ImportSpec,
+    ManyToMany,
+    parse_int,
+)
 from home.models import (
     Person,
     Book,
@@ -9,11 +17,14 @@ from home.models import (
     Language,
 )
 
+from .import_haskala_persons import person_columns, person_slug_source
 
-class Command(BaseCommand):
+
+class Command(ImportCommand):
     help = "Import persons, books and supporting models from export CSV files"
 
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--base-dir",
             type=str,
@@ -21,118 +32,40 @@ class Command(BaseCommand):
             required=True,
         )
 
-    def _open_csv(self, path):
-        if not os.path.exists(path):
+    def _path(self, base_dir, filename):
+        path = base_dir / filename
+        if not path.exists():
             raise CommandError(f"CSV file not found: {path}")
-        self.stdout.write(self.style.NOTICE(f"Reading {path} ..."))
-        return open(path, newline="", encoding="utf-8")
+        return path
 
     def import_persons(self, base_dir):
-        path = os.path.join(base_dir, "persons_for_django.csv")
-        created = 0
-        updated = 0
-
-        with self._open_csv(path) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                nid = row.get("nid") or row.get("legacy_nid")
-                vid = row.get("vid") or row.get("legacy_vid")
-                if not nid:
-                    continue
-
-                legacy_nid = int(nid)
-                legacy_vid = int(vid) if vid else None
-
-                pref_label = (row.get("pref_label") or row.get("title") or "").strip()
-                german_name = (row.get("german_name") or "").strip()
-                hebrew_name = (row.get("hebrew_name") or "").strip()
-
-                person, created_flag = Person.objects.update_or_create(
-                    legacy_nid=legacy_nid,
-                    defaults={
-                        "legacy_vid": legacy_vid,
-                        "pref_label": pref_label,
-                        "german_name": german_name,
-                        "hebrew_name": hebrew_name,
-                    },
-                )
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Person: {created} created, {updated} updated."
-            )
+        spec = ImportSpec(
+            Person,
+            person_columns(),
+            key_source=("nid", "legacy_nid"),
+            slug_source=person_slug_source,
         )
+        self.import_csv(spec, self._path(base_dir, "persons_for_django.csv"))
 
     def import_books(self, base_dir):
-        path = os.path.join(base_dir, "books_for_django.csv")
-        created = 0
-        updated = 0
-
-        with self._open_csv(path) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                nid = row.get("nid") or row.get("legacy_nid")
-                vid = row.get("vid") or row.get("legacy_vid")
-                if not nid:
-                    continue
-
-                legacy_nid = int(nid)
-                legacy_vid = int(vid) if vid else None
-
-                title = (row.get("title") or row.get("name") or "").strip()
-                subtitle = (row.get("subtitle") or "").strip()
-                full_title = (row.get("full_title") or "").strip()
-
-                pub_place_tid = row.get("publication_place_tid")
-                publication_place = None
-                if pub_place_tid:
-                    try:
-                        publication_place = City.objects.get(legacy_tid=int(pub_place_tid))
-                    except City.DoesNotExist:
-                        publication_place = None
-
-                book, created_flag = Book.objects.update_or_create(
-                    legacy_nid=legacy_nid,
-                    defaults={
-                        "legacy_vid": legacy_vid,
-                        "name": title,
-                        "subtitle": subtitle,
-                        "full_title": full_title,
-                        "publication_place": publication_place,
-                    },
-                )
-
-                language_tids = (row.get("language_tids") or "").split(";")
-                book.languages.clear()
-                for tid in language_tids:
-                    tid = tid.strip()
-                    if not tid:
-                        continue
-                    try:
-                        lang = Language.objects.get(legacy_tid=int(tid))
-                        book.languages.add(lang)
-                    except Language.DoesNotExist:
-                        continue
-
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Book: {created} created, {updated} updated."
-            )
+        spec = ImportSpec(
+            Book,
+            [
+                Column("legacy_vid", ("vid", "legacy_vid"), parse=parse_int),
+                Column("name", ("title", "name")),
+                Column("full_title"),
+                ForeignKey("publication_place", "publication_place_tid", City),
+            ],
+            key_source=("nid", "legacy_nid"),
+            m2m=[ManyToMany("languages", "language_tids", Language)],
+            slug_source=lambda book: book.name or f"book-{book.pk}",
         )
+        self.import_csv(spec, self._path(base_dir, "books_for_django.csv"))
 
-    def handle(self, *args, **options):
-        base_dir = options["base_dir"]
+    def run_import(self, **options):
+        base_dir = Path(options["base_dir"])
 
-        if not os.path.isdir(base_dir):
+        if not base_dir.is_dir():
             raise CommandError(f"{base_dir} is not a directory")
 
         # Run order: persons first, then books.
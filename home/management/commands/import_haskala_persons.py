@@ -1,7 +1,12 @@
-import csv
-import os
-from django.core.management.base import BaseCommand, CommandError
-
+from home.importing import (
+    Column,
+    ForeignKey,
+    ImportCommand,
+    ImportSpec,
+    ManyToMany,
+    clean_text,
+    parse_int,
+)
 from home.models import (
     Person,
     Gender,
@@ -10,29 +15,26 @@ from home.models import (
 )
 
 
-def parse_tid(value):
-    """
-    Converts TID values like '402', '402.0', ' 402 ', '' to int or None.
-    """
-    if value is None:
-        return None
-
-    v = str(value).strip()
+def person_slug_source(person):
+    """The fallback chain of Person.save()."""
+    return person.pref_label or person.german_name or person.hebrew_name or f"person-{person.pk}"
 
-    if v == "":
-        return None
 
-    try:
-        # Float fixes: '402.0' -> 402
-        return int(float(v))
-    except ValueError:
-        return None
+def person_columns():
+    # Name fields (vary by export)
+    return [
+        Column("legacy_vid", ("vid", "legacy_vid"), parse=parse_int),
+        Column("pref_label", ("pref_label", "title"), parse=clean_text),
+        Column("german_name", parse=clean_text),
+        Column("hebrew_name", parse=clean_text),
+    ]
 
 
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = "Import persons from a CSV (export from Drupal via Jupyter)"
 
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--file",
             type=str,
@@ -40,104 +42,17 @@ class Command(BaseCommand):
             help="Path to the persons CSV",
         )
 
-    def handle(self, *args, **options):
-
-        csv_file = options["file"]
-
-        if not os.path.exists(csv_file):
-            raise CommandError(f"CSV not found: {csv_file}")
-
-        created = 0
-        updated = 0
-
-        with open(csv_file, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-
-            for row in reader:
-                # Required fields
-                nid = row.get("nid")
-                vid = row.get("vid")
-
-                if not nid:
-                    continue
-
-                legacy_nid = int(nid)
-                legacy_vid = int(vid) if vid else None
-
-                # Name fields (vary by export)
-                title = (row.get("title") or "").strip()
-                pref_label = (row.get("pref_label") or title).strip()
-                german_name = (row.get("german_name") or "").strip()
-                hebrew_name = (row.get("hebrew_name") or "").strip()
-
-                # Gender
-                gender = None
-                gender_tid = parse_tid(row.get("gender_tid"))
-
-                if gender_tid is not None:
-                    try:
-                        gender = Gender.objects.get(legacy_tid=gender_tid)
-                    except Gender.DoesNotExist:
-                        pass
-
-                # Place of birth
-                pob = None
-                pob_tid = parse_tid(row.get("place_of_birth_tid"))
-                if pob_tid is not None:
-                    try:
-                        pob = City.objects.get(legacy_tid=pob_tid)
-                    except City.DoesNotExist:
-                        pass
-
-                # Place of death
-                pod = None
-                pod_tid = parse_tid(row.get("place_of_death_tid"))
-                if pod_tid is not None:
-                    try:
-                        pod = City.objects.get(legacy_tid=pod_tid)
-                    except City.DoesNotExist:
-                        pass
-
-                # Create/update person
-                person, flag = Person.objects.update_or_create(
-                    legacy_nid=legacy_nid,
-                    defaults={
-                        "legacy_vid": legacy_vid,
-                        "pref_label": pref_label,
-                        "german_name": german_name,
-                        "hebrew_name": hebrew_name,
-                        "gender": gender,
-                        "place_of_birth": pob,
-                        "place_of_death": pod,
-                    }
-                )
-
-                if flag:
-                    created += 1
-                else:
-                    updated += 1
-
-                # Occupations (M2M)
-                occ_raw = row.get("occupation_tid") or row.get("occupation_tids")
-                person.occupations.clear()
-
-                if occ_raw:
-                    parts = (
-                        occ_raw.replace(",", ";")
-                        .replace(" ", "")
-                        .split(";")
-                    )
-
-                    for part in parts:
-                        tid_int = parse_tid(part)
-                        if tid_int is None:
-                            continue
-                        try:
-                            occ = Occupation.objects.get(legacy_tid=tid_int)
-                            person.occupations.add(occ)
-                        except Occupation.DoesNotExist:
-                            pass
-
-        self.stdout.write(self.style.SUCCESS(
-            f"Persons imported: {created} new, {updated} updated."
-        ))
+    def run_import(self, **options):
+        csv_file = self.require_file(options["file"])
+        spec = ImportSpec(
+            Person,
+            [
+                *person_columns(),
+                ForeignKey("gender", "gender_tid", Gender),
+                ForeignKey("place_of_birth", "place_of_birth_tid", City),
+                ForeignKey("place_of_death", "place_of_death_tid", City),
+            ],
+            m2m=[ManyToMany("occupations", ("occupation_tid", "occupation_tids"), Occupation)],
+            slug_source=person_slug_source,
+        )
+        self.import_csv(spec, csv_file)
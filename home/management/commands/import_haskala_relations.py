@@ -30,14 +30,23 @@ in the Occupation vocabulary. This command seeds ProductionRole rows on the
 fly from the matching Occupation name.
 """
 
-import csv
-from datetime import datetime
 from pathlib import Path
 
-from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-from django.utils import timezone
-
+from django.core.management.base import CommandError
+
+from home.importing import (
+    Column,
+    ForeignKey,
+    ImportCommand,
+    ImportSpec,
+    clean_text,
+    clean_text_or_none,
+    format_or_null,
+    parse_bool,
+    parse_int,
+    parse_timestamp,
+    sync_m2m,
+)
 from home.models import (
     Book,
     BookAuthor,
@@ -55,53 +64,30 @@ from home.models import (
 )
 
 
-# ----------------------------- helpers --------------------------------------
-
-
-def parse_int(value):
-    if value is None:
-        return None
-    val = str(value).strip()
-    if val == "":
-        return None
-    try:
-        return int(float(val))
-    except ValueError:
-        return None
-
-
-def parse_bool(value):
-    val = str(value or "").strip().lower()
-    return val in ("1", "true", "yes", "y", "t")
+def legacy_columns():
+    return [
+        Column("legacy_vid", "vid", parse=parse_int),
+        Column("legacy_status", "status", parse=parse_bool),
+        Column("legacy_created", "created", parse=parse_timestamp),
+        Column("legacy_changed", "changed", parse=parse_timestamp),
+    ]
 
 
-def parse_timestamp(value):
-    val = str(value or "").strip()
-    if not val:
-        return None
-    try:
-        ts = float(val)
-    except ValueError:
-        return None
-    return datetime.fromtimestamp(ts, tz=timezone.get_current_timezone())
-
-
-def clean(value):
-    if value is None:
-        return ""
-    return str(value).strip()
+def person(field, source):
+    return ForeignKey(field, source, Person, key="legacy_nid")
 
 
 # ------------------------ command implementation ----------------------------
 
 
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = (
         "Import Edition, Translation, Mention, Preface and Production records "
         "and link them to existing Book / Person / City rows."
     )
 
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--export-dir",
             required=True,
@@ -121,38 +107,6 @@ class Command(BaseCommand):
             ),
         )
 
-    # -- caches built in handle() -------------------------------------------
-
-    def _book_by_nid(self):
-        return {
-            b.legacy_nid: b
-            for b in Book.objects.exclude(legacy_nid__isnull=True).only(
-                "uuid", "legacy_nid"
-            )
-        }
-
-    def _person_by_nid(self):
-        return {
-            p.legacy_nid: p
-            for p in Person.objects.exclude(legacy_nid__isnull=True).only(
-                "uuid", "legacy_nid"
-            )
-        }
-
-    def _city_by_tid(self):
-        return {
-            c.legacy_tid: c
-            for c in City.objects.exclude(legacy_tid__isnull=True).only(
-                "uuid", "legacy_tid"
-            )
-        }
-
-    def _mention_description_by_tid(self):
-        return {
-            m.legacy_tid: m
-            for m in MentionDescription.objects.exclude(legacy_tid__isnull=True)
-        }
-
     def _book_backlink(self, drupal_dir: Path):
         """
         Build {sub_node_nid -> book_nid} from field_data_field_book.csv,
@@ -163,213 +117,91 @@ class Command(BaseCommand):
         if not path.exists():
             raise CommandError(f"File not found: {path}")
         mapping: dict[int, int] = {}
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                child = parse_int(row.get("entity_id"))
-                book = parse_int(row.get("field_book_target_id"))
-                if child is None or book is None:
-                    continue
-                # delta=0 wins (first link); ignore later deltas
-                mapping.setdefault(child, book)
+        for row in self.read_rows(path):
+            child = parse_int(row.get("entity_id"))
+            book = parse_int(row.get("field_book_target_id"))
+            if child is None or book is None:
+                continue
+            # delta=0 wins (first link); ignore later deltas
+            mapping.setdefault(child, book)
         return mapping
 
-    # -- imports -------------------------------------------------------------
-
-    def import_editions(self, export_dir: Path):
-        path = export_dir / "editions_for_django.csv"
+    def _import_file(self, export_dir: Path, filename, label, spec):
+        path = export_dir / filename
         if not path.exists():
-            self.stdout.write(self.style.WARNING(f"Skipping editions: {path} not found."))
-            return
-
-        books = self._book_by_nid()
-        cities = self._city_by_tid()
-        created = updated = missing_book = 0
-
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                legacy_nid = parse_int(row.get("nid"))
-                if legacy_nid is None:
-                    continue
-
-                book_nid = parse_int(row.get("book_target_id"))
-                book = books.get(book_nid) if book_nid else None
-                if book is None:
-                    missing_book += 1
-                    continue
+            self.stdout.write(self.style.WARNING(f"Skipping {label}: {path} not found."))
+            return None
+        return self.import_csv(spec, path)
+
+    def _linked_book(self, book_backlink):
+        return ForeignKey(
+            "book",
+            lambda row: book_backlink.get(parse_int(row.get("nid"))),
+            Book,
+            key="legacy_nid",
+        )
 
-                defaults = {
-                    "legacy_vid": parse_int(row.get("vid")),
-                    "legacy_status": parse_bool(row.get("status")),
-                    "legacy_created": parse_timestamp(row.get("created")),
-                    "legacy_changed": parse_timestamp(row.get("changed")),
-                    "name": clean(row.get("title")) or None,
-                    "book": book,
-                    "city": cities.get(parse_int(row.get("edition_city_tid"))),
-                    "changes": clean(row.get("edition_changes")) or None,
-                    "changes_format": clean(row.get("edition_changes_format")) or "NULL",
-                    "references": clean(row.get("edition_references")) or None,
-                    "references_format": clean(row.get("edition_references_format")) or "NULL",
-                    "year": clean(row.get("edition_year")) or None,
-                    "year_format": clean(row.get("edition_year_format")) or "NULL",
-                }
-                _, created_flag = Edition.objects.update_or_create(
-                    legacy_nid=legacy_nid, defaults=defaults
-                )
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
+    # -- imports -------------------------------------------------------------
 
-        self.stdout.write(self.style.SUCCESS(
-            f"Edition: {created} created, {updated} updated, {missing_book} skipped (book missing)."
+    def import_editions(self, export_dir: Path):
+        self._import_file(export_dir, "editions_for_django.csv", "editions", ImportSpec(
+            Edition,
+            [
+                *legacy_columns(),
+                Column("name", "title", parse=clean_text_or_none),
+                ForeignKey("book", "book_target_id", Book, key="legacy_nid", required=True),
+                ForeignKey("city", "edition_city_tid", City),
+                Column("changes", "edition_changes", parse=clean_text_or_none),
+                Column("changes_format", "edition_changes_format", parse=format_or_null),
+                Column("references", "edition_references", parse=clean_text_or_none),
+                Column("references_format", "edition_references_format", parse=format_or_null),
+                Column("year", "edition_year", parse=clean_text_or_none),
+                Column("year_format", "edition_year_format", parse=format_or_null),
+            ],
         ))
 
     def import_translations(self, export_dir: Path):
-        path = export_dir / "translations_for_django.csv"
-        if not path.exists():
-            self.stdout.write(self.style.WARNING(f"Skipping translations: {path} not found."))
-            return
-
-        books = self._book_by_nid()
-        persons = self._person_by_nid()
-        cities = self._city_by_tid()
-        created = updated = missing_book = 0
-
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                legacy_nid = parse_int(row.get("nid"))
-                if legacy_nid is None:
-                    continue
-
-                book_nid = parse_int(row.get("book_target_id"))
-                book = books.get(book_nid) if book_nid else None
-                if book is None:
-                    missing_book += 1
-                    continue
-
-                defaults = {
-                    "legacy_vid": parse_int(row.get("vid")),
-                    "legacy_status": parse_bool(row.get("status")),
-                    "legacy_created": parse_timestamp(row.get("created")),
-                    "legacy_changed": parse_timestamp(row.get("changed")),
-                    "title": clean(row.get("title")),
-                    "book": book,
-                    "translator": persons.get(parse_int(row.get("translator_target_id"))),
-                    "city": cities.get(parse_int(row.get("translation_city_tid"))),
-                    "references": clean(row.get("translation_references")) or None,
-                    "references_format": clean(row.get("translation_references_format")) or "NULL",
-                    "year": clean(row.get("translation_year")),
-                    "year_format": clean(row.get("translation_year_format")) or "NULL",
-                }
-                _, created_flag = Translation.objects.update_or_create(
-                    legacy_nid=legacy_nid, defaults=defaults
-                )
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-        self.stdout.write(self.style.SUCCESS(
-            f"Translation: {created} created, {updated} updated, {missing_book} skipped (book missing)."
+        self._import_file(export_dir, "translations_for_django.csv", "translations", ImportSpec(
+            Translation,
+            [
+                *legacy_columns(),
+                Column("title", parse=clean_text),
+                ForeignKey("book", "book_target_id", Book, key="legacy_nid", required=True),
+                person("translator", "translator_target_id"),
+                ForeignKey("city", "translation_city_tid", City),
+                Column("references", "translation_references", parse=clean_text_or_none),
+                Column("references_format", "translation_references_format", parse=format_or_null),
+                Column("year", "translation_year", parse=clean_text),
+                Column("year_format", "translation_year_format", parse=format_or_null),
+            ],
         ))
 
     def import_mentions(self, export_dir: Path, book_backlink: dict[int, int]):
-        path = export_dir / "mentions_for_django.csv"
-        if not path.exists():
-            self.stdout.write(self.style.WARNING(f"Skipping mentions: {path} not found."))
-            return
-
-        books = self._book_by_nid()
-        persons = self._person_by_nid()
-        cities = self._city_by_tid()
-        descriptions = self._mention_description_by_tid()
-        created = updated = without_book = 0
-
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                legacy_nid = parse_int(row.get("nid"))
-                if legacy_nid is None:
-                    continue
-
-                book_nid = book_backlink.get(legacy_nid)
-                book = books.get(book_nid) if book_nid else None
-                if book is None:
-                    without_book += 1
-
-                defaults = {
-                    "legacy_vid": parse_int(row.get("vid")),
-                    "legacy_status": parse_bool(row.get("status")),
-                    "legacy_created": parse_timestamp(row.get("created")),
-                    "legacy_changed": parse_timestamp(row.get("changed")),
-                    "book": book,
-                    "mentionee": persons.get(parse_int(row.get("mentionee_target_id"))),
-                    "mentionee_city": cities.get(parse_int(row.get("mentionee_city_tid"))),
-                    "mentionee_description": descriptions.get(
-                        parse_int(row.get("mentionee_description_tid"))
-                    ),
-                }
-                _, created_flag = Mention.objects.update_or_create(
-                    legacy_nid=legacy_nid, defaults=defaults
-                )
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-        self.stdout.write(self.style.SUCCESS(
-            f"Mention: {created} created, {updated} updated, {without_book} without book link."
+        self._import_file(export_dir, "mentions_for_django.csv", "mentions", ImportSpec(
+            Mention,
+            [
+                *legacy_columns(),
+                self._linked_book(book_backlink),
+                person("mentionee", "mentionee_target_id"),
+                ForeignKey("mentionee_city", "mentionee_city_tid", City),
+                ForeignKey("mentionee_description", "mentionee_description_tid", MentionDescription),
+            ],
         ))
 
     def import_prefaces(self, export_dir: Path, book_backlink: dict[int, int]):
-        path = export_dir / "prefaces_for_django.csv"
-        if not path.exists():
-            self.stdout.write(self.style.WARNING(f"Skipping prefaces: {path} not found."))
-            return
-
-        books = self._book_by_nid()
-        persons = self._person_by_nid()
-        created = updated = without_book = 0
-
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                legacy_nid = parse_int(row.get("nid"))
-                if legacy_nid is None:
-                    continue
-
-                book_nid = book_backlink.get(legacy_nid)
-                book = books.get(book_nid) if book_nid else None
-                if book is None:
-                    without_book += 1
-
-                defaults = {
-                    "legacy_vid": parse_int(row.get("vid")),
-                    "legacy_status": parse_bool(row.get("status")),
-                    "legacy_created": parse_timestamp(row.get("created")),
-                    "legacy_changed": parse_timestamp(row.get("changed")),
-                    "book": book,
-                    "writer": persons.get(parse_int(row.get("preface_writer_target_id"))),
-                    "title": clean(row.get("preface_title")) or None,
-                    "title_format": clean(row.get("preface_title_format")) or "NULL",
-                    "notes": clean(row.get("preface_notes")) or None,
-                    "notes_format": clean(row.get("preface_notes_format")) or "NULL",
-                    "number": parse_int(row.get("preface_number")),
-                    "number_format": clean(row.get("preface_number_format")) or "NULL",
-                }
-                _, created_flag = Preface.objects.update_or_create(
-                    legacy_nid=legacy_nid, defaults=defaults
-                )
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-        self.stdout.write(self.style.SUCCESS(
-            f"Preface: {created} created, {updated} updated, {without_book} without book link."
+        self._import_file(export_dir, "prefaces_for_django.csv", "prefaces", ImportSpec(
+            Preface,
+            [
+                *legacy_columns(),
+                self._linked_book(book_backlink),
+                person("writer", "preface_writer_target_id"),
+                Column("title", "preface_title", parse=clean_text_or_none),
+                Column("title_format", "preface_title_format", parse=format_or_null),
+                Column("notes", "preface_notes", parse=clean_text_or_none),
+                Column("notes_format", "preface_notes_format", parse=format_or_null),
+                Column("number", "preface_number", parse=parse_int),
+                Column("number_format", "preface_number_format", parse=format_or_null),
+            ],
         ))
 
     def import_productions(self, export_dir: Path, book_backlink: dict[int, int]):
@@ -378,73 +210,43 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING(f"Skipping productions: {path} not found."))
             return
 
-        books = self._book_by_nid()
-        persons = self._person_by_nid()
-        created = updated = without_book = 0
-
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                legacy_nid = parse_int(row.get("nid"))
-                if legacy_nid is None:
-                    continue
-
-                book_nid = book_backlink.get(legacy_nid)
-                book = books.get(book_nid) if book_nid else None
-                if book is None:
-                    without_book += 1
-
-                role = self._resolve_production_role(parse_int(row.get("role_tid")))
-
-                defaults = {
-                    "legacy_vid": parse_int(row.get("vid")),
-                    "legacy_status": parse_bool(row.get("status")),
-                    "legacy_created": parse_timestamp(row.get("created")),
-                    "legacy_changed": parse_timestamp(row.get("changed")),
-                    "title": clean(row.get("title")) or None,
-                    "name_in_book": clean(row.get("name_in_book")),
-                    "person_name_appear": clean(row.get("person_name_appear")),
-                    "book": book,
-                    "producer": persons.get(parse_int(row.get("producer_target_id"))),
-                    "role": role,
-                }
-                _, created_flag = Production.objects.update_or_create(
-                    legacy_nid=legacy_nid, defaults=defaults
-                )
-                if created_flag:
-                    created += 1
-                else:
-                    updated += 1
-
-        self.stdout.write(self.style.SUCCESS(
-            f"Production: {created} created, {updated} updated, {without_book} without book link."
-        ))
-
-    def _resolve_production_role(self, role_tid):
+        self.stdout.write(f"Reading {path} ...")
+        rows = self.read_rows(path)
+        self._seed_production_roles(rows)
+        self.import_rows(ImportSpec(
+            Production,
+            [
+                *legacy_columns(),
+                Column("title", parse=clean_text_or_none),
+                Column("name_in_book", parse=clean_text),
+                Column("person_name_appear", parse=clean_text),
+                self._linked_book(book_backlink),
+                person("producer", "producer_target_id"),
+                ForeignKey("role", "role_tid", ProductionRole),
+            ],
+        ), rows)
+
+    def _seed_production_roles(self, rows):
         """
         Production roles reuse the Occupation vocabulary (vid=6 in Drupal).
-        Seed ProductionRole rows on demand from the matching Occupation.
+        Seed the missing ProductionRole rows in one go from the matching
+        Occupations.
         """
-        if role_tid is None:
-            return None
-        try:
-            return ProductionRole.objects.get(legacy_tid=role_tid)
-        except ProductionRole.DoesNotExist:
-            pass
-
-        try:
-            occ = Occupation.objects.get(legacy_tid=role_tid)
-        except Occupation.DoesNotExist:
+        lookup = self.engine.lookup
+        role_tids = {parse_int(row.get("role_tid")) for row in rows} - {None}
+        missing = role_tids - lookup.map_for(ProductionRole).keys()
+        if not missing:
+            return
+        names = dict(Occupation.objects.filter(legacy_tid__in=missing).values_list("legacy_tid", "name"))
+        for role_tid in sorted(missing - names.keys()):
             self.stdout.write(self.style.WARNING(
                 f"role_tid={role_tid}: no matching Occupation; ProductionRole left unset."
             ))
-            return None
-
-        role, _ = ProductionRole.objects.get_or_create(
-            legacy_tid=role_tid,
-            defaults={"name": occ.name},
+        ProductionRole.objects.bulk_create(
+            [ProductionRole(legacy_tid=tid, name=name) for tid, name in names.items()],
+            ignore_conflicts=True,
         )
-        return role
+        lookup.forget(ProductionRole)
 
     def import_textual_model_links(self, export_dir: Path):
         """
@@ -458,11 +260,9 @@ class Command(BaseCommand):
             ("secondary", "secondary_textual_models.csv", "secondary_textual_models"),
         ]
 
-        books = self._book_by_nid()
-        models_by_tid = {
-            t.legacy_tid: t
-            for t in TextualModel.objects.exclude(legacy_tid__isnull=True)
-        }
+        lookup = self.engine.lookup
+        books = lookup.map_for(Book, "legacy_nid")
+        models_by_tid = lookup.map_for(TextualModel)
 
         for label, filename, m2m_attr in sources:
             path = export_dir / filename
@@ -472,33 +272,29 @@ class Command(BaseCommand):
                 ))
                 continue
 
-            grouped: dict[int, list[TextualModel]] = {}
+            grouped: dict[int, set] = {}
             unknown_tids = set()
-            with path.open(newline="", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    nid = parse_int(row.get("nid"))
-                    tid = parse_int(row.get("tid"))
-                    if nid is None or tid is None:
-                        continue
-                    tm = models_by_tid.get(tid)
-                    if tm is None:
-                        unknown_tids.add(tid)
-                        continue
-                    grouped.setdefault(nid, []).append(tm)
-
-            updated = without_book = total_links = 0
-            for nid, tms in grouped.items():
+            without_book = set()
+            for row in self.read_rows(path):
+                nid = parse_int(row.get("nid"))
+                tid = parse_int(row.get("tid"))
+                if nid is None or tid is None:
+                    continue
+                tm = models_by_tid.get(tid)
+                if tm is None:
+                    unknown_tids.add(tid)
+                    continue
                 book = books.get(nid)
                 if book is None:
-                    without_book += 1
+                    without_book.add(nid)
                     continue
-                getattr(book, m2m_attr).set(tms)
-                updated += 1
-                total_links += len(tms)
+                grouped.setdefault(book, set()).add(tm)
+
+            added, removed = sync_m2m(Book, m2m_attr, grouped, batch_size=self.engine.batch_size)
 
             msg = (
-                f"{label.capitalize()} textual models: {updated} books linked, "
-                f"{total_links} M2M rows, {without_book} without book."
+                f"{label.capitalize()} textual models: {len(grouped)} books linked, "
+                f"M2M rows +{added} / -{removed}, {len(without_book)} without book."
             )
             if unknown_tids:
                 msg += f" Unknown TIDs skipped: {sorted(unknown_tids)}."
@@ -511,11 +307,12 @@ class Command(BaseCommand):
           original_text_author_target_id;
         - existing Production rows (book + producer) for the producer role.
 
-        BookAuthor has no DB-level uniqueness, so we wipe and rebuild to keep
-        the import idempotent.
+        The full set is rebuilt on every run (wipe, then one bulk insert)
+        to keep the import idempotent.
         """
-        books = self._book_by_nid()
-        persons = self._person_by_nid()
+        lookup = self.engine.lookup
+        books = lookup.map_for(Book, "legacy_nid")
+        persons = lookup.map_for(Person, "legacy_nid")
 
         seen: set[tuple] = set()
         rows: list[BookAuthor] = []
@@ -528,26 +325,23 @@ class Command(BaseCommand):
                 ("old_text_author_target_id", "old_text_author"),
                 ("original_text_author_target_id", "original_text_author"),
             ]
-            with path.open(newline="", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    book = books.get(parse_int(row.get("nid")))
-                    if book is None:
+            for row in self.read_rows(path):
+                book_id = books.get(parse_int(row.get("nid")))
+                if book_id is None:
+                    continue
+                for col, role in csv_role_columns:
+                    pid = parse_int(row.get(col))
+                    if pid is None:
+                        continue
+                    person_id = persons.get(pid)
+                    if person_id is None:
+                        unknown_persons += 1
+                        continue
+                    key = (book_id, person_id, role)
+                    if key in seen:
                         continue
-                    for col, role in csv_role_columns:
-                        pid = parse_int(row.get(col))
-                        if pid is None:
-                            continue
-                        person = persons.get(pid)
-                        if person is None:
-                            unknown_persons += 1
-                            continue
-                        key = (book.uuid, person.uuid, role)
-                        if key in seen:
-                            continue
-                        seen.add(key)
-                        rows.append(BookAuthor(
-                            book_id=book.uuid, person_id=person.uuid, role=role,
-                        ))
+                    seen.add(key)
+                    rows.append(BookAuthor(book_id=book_id, person_id=person_id, role=role))
         else:
             self.stdout.write(self.style.WARNING(
                 f"Skipping text-author roles: {path} not found."
@@ -567,7 +361,7 @@ class Command(BaseCommand):
             ))
 
         BookAuthor.objects.all().delete()
-        BookAuthor.objects.bulk_create(rows)
+        BookAuthor.objects.bulk_create(rows, batch_size=self.engine.batch_size)
 
         per_role = {}
         for r in rows:
@@ -579,8 +373,7 @@ class Command(BaseCommand):
 
     # -- entry point ---------------------------------------------------------
 
-    @transaction.atomic
-    def handle(self, *args, **options):
+    def run_import(self, **options):
         export_dir = Path(options["export_dir"])
         drupal_dir = Path(options["drupal_dir"])
 
@@ -1,8 +1,8 @@
-import csv
-import os
+from pathlib import Path
 
-from django.core.management.base import BaseCommand, CommandError
+from django.core.management.base import CommandError
 
+from home.importing import Column, ImportCommand, ImportSpec, parse_float, parse_int
 from home.models import (
     City,
     Geolocation,
@@ -23,12 +23,68 @@ from home.models import (
     OriginalType,
     MentionDescription,
 )
-
-
-class Command(BaseCommand):
+from home.nearby import trig_columns
+
+GEO_COLUMNS = ("field_geolocation_lat", "field_geolocation_lng")
+
+CITIES_CSV = "cities_with_geolocation.csv"
+LANGUAGES_CSV = "taxonomy_languages.csv"
+
+# Simple taxonomies.
+# Adjust the filenames to match your actual export files!
+VOCAB_FILES = [
+    (Gender, "taxonomy_gender.csv"),
+    (Occupation, "taxonomy_occupation.csv"),
+    (Topic, "taxonomy_topics.csv"),
+    (Alignment, "taxonomy_alignment.csv"),
+    (Font, "taxonomy_fonts.csv"),
+    (Publisher, "taxonomy_publishers.csv"),
+    (Series, "taxonomy_series.csv"),
+    (TargetAudience, "taxonomy_target_audience.csv"),
+    (Typography, "taxonomy_typography.csv"),
+    (DateFormat, "taxonomy_date_format.csv"),
+    (TextualModel, "taxonomy_textual_models.csv"),
+    (LanguageCount, "taxonomy_language_counts.csv"),
+    (FootnoteLocation, "taxonomy_footnote_locations.csv"),
+    (OriginalType, "taxonomy_original_type.csv"),
+    (MentionDescription, "taxonomy_description_of_mentionee.csv"),
+    # ProductionRole has no dedicated Drupal vocabulary; the
+    # role TIDs live in the Occupation vocabulary (vid=6) and are
+    # seeded on demand by the relations importer.
+]
+
+# Slug sources for the vocabularies whose save() fills in a slug;
+# None leaves the slug empty, as save() does for unnamed rows.
+SLUG_SOURCES = {
+    Occupation: lambda obj: obj.name,
+    Topic: lambda obj: obj.name,
+    Publisher: lambda obj: obj.name or None,
+    Series: lambda obj: obj.name or None,
+    City: lambda obj: obj.name or None,
+}
+
+
+def with_trig_columns(values):
+    """What Geolocation.save() derives from lat/lng."""
+    values["lat_sin"], values["lat_cos"], values["lng_rad"] = trig_columns(values["lat"], values["lng"])
+
+
+def geolocation_columns():
+    return [
+        Column("lat", "field_geolocation_lat", parse=parse_float),
+        Column("lng", "field_geolocation_lng", parse=parse_float),
+    ]
+
+
+def has_coordinates(row):
+    return None if any((row.get(name) or "").strip() for name in GEO_COLUMNS) else "no coordinates"
+
+
+class Command(ImportCommand):
     help = "Import Haskala taxonomies and cities from CSV files"
 
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--base-dir",
             type=str,
@@ -36,53 +92,16 @@ class Command(BaseCommand):
             required=True,
         )
 
-    # ---------- Helper functions ----------
-
-    def _open_csv(self, path):
-        if not os.path.exists(path):
-            raise CommandError(f"CSV file not found: {path}")
-        self.stdout.write(self.style.NOTICE(f"Reading {path} ..."))
-        return open(path, newline="", encoding="utf-8")
-
-    def _import_simple_vocab(self, Model, csv_path, name_field="name"):
-        """
-        Imports a simple vocabulary:
-        Expects columns: `tid`, `name` (or configurable).
-        """
-        created_count = 0
-        updated_count = 0
-
-        with self._open_csv(csv_path) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                tid = row.get("tid")
-                if not tid:
-                    continue
-                try:
-                    tid = int(tid)
-                except ValueError:
-                    continue
-
-                name = row.get(name_field) or row.get("name") or ""
-                name = name.strip()
-
-                obj, created = Model.objects.update_or_create(
-                    legacy_tid=tid,
-                    defaults={"name": name},
-                )
-                if created:
-                    created_count += 1
-                else:
-                    updated_count += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"{Model.__name__}: {created_count} created, {updated_count} updated."
-            )
+    def _simple_vocab_spec(self, Model, extra_columns=()):
+        """Columns `tid`, `name` (plus *extra_columns*) keyed on legacy_tid."""
+        return ImportSpec(
+            Model,
+            [Column("name"), *extra_columns],
+            key="legacy_tid",
+            key_source="tid",
+            slug_source=SLUG_SOURCES.get(Model),
         )
 
-    # ---------- Import methods ----------
-
     def import_cities(self, base_dir):
         """
         Imports cities + geolocation.
@@ -93,164 +112,55 @@ class Command(BaseCommand):
         field_geolocation_lat_sin,
         field_geolocation_lat_cos,
         field_geolocation_lng_rad
-        """
-        path = os.path.join(base_dir, "cities_with_geolocation.csv")  # adjust if necessary
-        created_city = 0
-        updated_city = 0
-        created_geo = 0
-        updated_geo = 0
-
-        with self._open_csv(path) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                tid = row.get("tid")
-                if not tid:
-                    continue
-                try:
-                    tid_int = int(tid)
-                except ValueError:
-                    continue
-
-                name = (row.get("name") or "").strip()
-
-                # Create / update city
-                city, created = City.objects.update_or_create(
-                    legacy_tid=tid_int,
-                    defaults={
-                        "name": name,
-                        # optional: taxonomy vid etc.
-                        # "legacy_vid": int(row.get("vid")) if row.get("vid") else None,
-                    },
-                )
-                if created:
-                    created_city += 1
-                else:
-                    updated_city += 1
-
-                # Read geolocation from the columns
-                lat = row.get("field_geolocation_lat")
-                lng = row.get("field_geolocation_lng")
-                lat_sin = row.get("field_geolocation_lat_sin")
-                lat_cos = row.get("field_geolocation_lat_cos")
-                lng_rad = row.get("field_geolocation_lng_rad")
-
-                # If no coordinates are present, skip the geolocation
-                if not any([lat, lng, lat_sin, lat_cos, lng_rad]):
-                    continue
-
-                def _to_float(value):
-                    if value in (None, ""):
-                        return None
-                    try:
-                        return float(value)
-                    except ValueError:
-                        return None
-
-                defaults = {
-                    "lat": _to_float(lat),
-                    "lng": _to_float(lng),
-                    "lat_sin": _to_float(lat_sin),
-                    "lat_cos": _to_float(lat_cos),
-                    "lng_rad": _to_float(lng_rad),
-                }
 
-                geo, created_geo_flag = Geolocation.objects.update_or_create(
-                    city=city,
-                    defaults=defaults,
-                )
-                if created_geo_flag:
-                    created_geo += 1
-                else:
-                    updated_geo += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"City: {created_city} created, {updated_city} updated."
-            )
-        )
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Geolocation: {created_geo} created, {updated_geo} updated."
-            )
+        The trig columns are recomputed from lat/lng, as
+        Geolocation.save() does.
+        """
+        path = base_dir / CITIES_CSV
+        if not path.exists():
+            raise CommandError(f"CSV file not found: {path}")
+        self.stdout.write(self.style.NOTICE(f"Reading {path} ..."))
+        rows = self.read_rows(path)
+        cities = self.import_rows(self._simple_vocab_spec(City), rows)
+
+        # One geolocation per city, keyed on the city just imported.
+        self.import_rows(
+            ImportSpec(
+                Geolocation,
+                geolocation_columns(),
+                key="city_id",
+                key_source=lambda row: cities.pks.get(parse_int(row.get("tid"))),
+                key_parse=lambda pk: pk,
+                skip=has_coordinates,
+                prepare=with_trig_columns,
+            ),
+            rows,
         )
 
-    def handle(self, *args, **options):
-        base_dir = options["base_dir"]
+    def run_import(self, **options):
+        base_dir = Path(options["base_dir"])
 
-        if not os.path.isdir(base_dir):
+        if not base_dir.is_dir():
             raise CommandError(f"{base_dir} is not a directory")
 
         # 1. Cities (taxonomy vid=1 + geolocation field)
         self.import_cities(base_dir)
 
         # 2. Simple taxonomies
-        # Adjust the filenames to match your actual export files!
-        vocab_files = [
-            (Gender, "taxonomy_gender.csv"),
-            (Occupation, "taxonomy_occupation.csv"),
-            (Topic, "taxonomy_topics.csv"),
-            (Alignment, "taxonomy_alignment.csv"),
-            (Font, "taxonomy_fonts.csv"),
-            (Publisher, "taxonomy_publishers.csv"),
-            (Series, "taxonomy_series.csv"),
-            (TargetAudience, "taxonomy_target_audience.csv"),
-            (Typography, "taxonomy_typography.csv"),
-            (DateFormat, "taxonomy_date_format.csv"),
-            (TextualModel, "taxonomy_textual_models.csv"),
-            (LanguageCount, "taxonomy_language_counts.csv"),
-            (FootnoteLocation, "taxonomy_footnote_locations.csv"),
-            (OriginalType, "taxonomy_original_type.csv"),
-            (MentionDescription, "taxonomy_description_of_mentionee.csv"),
-            # ProductionRole has no dedicated Drupal vocabulary; the
-            # role TIDs live in the Occupation vocabulary (vid=6) and are
-            # seeded on demand by the relations importer.
-        ]
-
-        for Model, filename in vocab_files:
-            csv_path = os.path.join(base_dir, filename)
-            if not os.path.exists(csv_path):
+        for Model, filename in VOCAB_FILES:
+            csv_path = base_dir / filename
+            if not csv_path.exists():
                 self.stdout.write(
                     self.style.WARNING(f"Skipping {Model.__name__}: {filename} not found.")
                 )
                 continue
-            self._import_simple_vocab(Model, csv_path)
+            self.import_csv(self._simple_vocab_spec(Model), csv_path)
 
         # 3. Languages - if exported as a separate CSV
         # E.g. columns: tid, name, language_code
-        languages_path = os.path.join(base_dir, "taxonomy_languages.csv")
-        if os.path.exists(languages_path):
-            created = 0
-            updated = 0
-            with self._open_csv(languages_path) as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    tid = row.get("tid")
-                    if not tid:
-                        continue
-                    try:
-                        tid_int = int(tid)
-                    except ValueError:
-                        continue
-
-                    name = (row.get("name") or "").strip()
-                    code = (row.get("language_code") or "").strip()
-
-                    obj, created_flag = Language.objects.update_or_create(
-                        legacy_tid=tid_int,
-                        defaults={
-                            "name": name,
-                            "language_code": code,
-                        },
-                    )
-                    if created_flag:
-                        created += 1
-                    else:
-                        updated += 1
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Language: {created} created, {updated} updated."
-                )
-            )
+        languages_path = base_dir / LANGUAGES_CSV
+        if languages_path.exists():
+            self.import_csv(self._simple_vocab_spec(Language, [Column("language_code")]), languages_path)
         else:
             self.stdout.write(
                 self.style.WARNING("Languages CSV (taxonomy_languages.csv) not found.")
@@ -1,35 +1,16 @@
-import csv
 from pathlib import Path
 
-from django.core.management.base import BaseCommand, CommandError
+from django.core.management.base import CommandError
 
+from home.importing import Column, ImportCommand, ImportSpec, clean
 from home.models import Alignment, OriginalType, TextualModel
 
 
-def parse_int(value, default=None):
-    """
-    Helper: robustly converts strings like '', 'nan' etc. to int or default.
-    """
-    if value is None:
-        return default
-    if isinstance(value, (int, float)):
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return default
-    s = str(value).strip()
-    if not s or s.lower() in {"nan", "none", "null"}:
-        return default
-    try:
-        return int(float(s))
-    except ValueError:
-        return default
-
-
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = "Import Alignment, OriginalType and TextualModel from the taxonomy exports."
 
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument(
             "--base-dir",
             required=True,
@@ -47,37 +28,20 @@ class Command(BaseCommand):
             self.stdout.write(f"Skipping {label}: {path.name} not found.")
             return
 
-        created = 0
-        updated = 0
-
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                tid = parse_int(row.get("tid"))
-                name = (row.get("name") or "").strip()
-
-                if tid is None or not name:
-                    # Skip empty or broken rows
-                    continue
-
-                obj, is_created = model.objects.update_or_create(
-                    legacy_tid=tid,
-                    defaults={
-                        "name": name,
-                    },
-                )
-                if is_created:
-                    created += 1
-                else:
-                    updated += 1
-
-        self.stdout.write(
-            f"{label}: {created} created, {updated} updated."
+        spec = ImportSpec(
+            model,
+            [Column("name")],
+            key="legacy_tid",
+            key_source="tid",
+            label=label,
+            # Skip empty or broken rows
+            skip=lambda row: None if clean(row.get("name")) else "no name",
         )
+        self.import_csv(spec, path)
 
-    # ---------- Handle ----------
+    # ---------- Import ----------
 
-    def handle(self, *args, **options):
+    def run_import(self, **options):
         base_dir = Path(options["base_dir"]).expanduser().resolve()
         if not base_dir.exists():
             raise CommandError(f"Base directory does not exist: {base_dir}")
@@ -9,31 +9,9 @@ matches the expected output. Dry-run by default.
 from __future__ import annotations
 
 from django.core.management.base import BaseCommand
-from django.db.models import Q
 
-from home.models import (
-    Book, City, Edition, Mention, Person, Translation,
-)
-
-
-def is_orphan(c: City) -> bool:
-    if Book.objects.filter(
-        Q(publication_place=c)
-        | Q(publication_place_other=c)
-        | Q(original_publication_place=c)
-    ).exists():
-        return False
-    if Person.objects.filter(
-        Q(place_of_birth=c) | Q(place_of_death=c)
-    ).exists():
-        return False
-    if Edition.objects.filter(city=c).exists():
-        return False
-    if Translation.objects.filter(city=c).exists():
-        return False
-    if Mention.objects.filter(mentionee_city=c).exists():
-        return False
-    return True
+from home.audit import orphan_places
+from home.models import City
 
 
 class Command(BaseCommand):
@@ -48,7 +26,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         apply = options["apply"]
-        orphans = [c for c in City.objects.filter(live=True) if is_orphan(c)]
+        orphans = list(orphan_places(City.objects.filter(live=True)))
 
         for c in orphans:
             self.stdout.write(f"{c.pk}  {c.name!r}  -> live=False")
@@ -60,6 +38,7 @@ class Command(BaseCommand):
             ))
             return
 
+        # Saved one by one so the place caches are dropped via post_save.
         for c in orphans:
             c.live = False
             c.save(update_fields=["live"])
@@ -0,0 +1,33 @@
+"""
+Rebuild the place / person page entries (``home/entity_relations.py``)
+from the Book, Person and relation tables.
+
+Saves keep the table in step by themselves; run this after imports or
+edits that bypass ``save()`` (``import_haskala_all`` already does).
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from home.entity_relations import BATCH_SIZE, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed place and person page entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Rows per bulk INSERT statement (default {BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {total} entity relations in {time.monotonic() - started:.1f}s."
+        ))
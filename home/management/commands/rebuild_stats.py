@@ -0,0 +1,34 @@
+"""
+Recount the catalogue statistics (``home/stats.py``) from the live
+books and persons.
+
+Saves keep the counters current by themselves; run this after imports
+or edits that bypass ``save()`` (``import_haskala_all`` already does)
+and after deleting a language, city or occupation.
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from home.stats import BATCH_SIZE, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the catalogue statistics counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Rows per bulk INSERT statement (default {BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {total} statistics counters in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,123 @@
+"""
+Run the performance benchmarks (``benchmarks/``) against a synthetic
+catalogue and write a JSON report, optionally failing on regressions
+against a stored baseline:
+
+    python manage.py run_benchmarks --scale 10 --out reports/bench.json
+    python manage.py run_benchmarks --scale 10 --baseline benchmarks/baselines/ci.json
+
+Everything happens on the test database (``test_<NAME>``), created and
+destroyed like ``manage.py test`` does, with a local-memory cache and
+the dumps / sitemap roots pointed at a temporary directory, so the real
+catalogue, Redis and published dumps are never touched. ``--keepdb``
+keeps the generated catalogue between runs; it is not regenerated if
+it is already there.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from benchmarks.catalogue import BASE_COUNTS, SCALES, generate
+from benchmarks.report import build_report, compare, load_report, run_scenarios, write_report
+from benchmarks.scenarios import SCENARIOS
+from home.models import Book, City, Person
+
+
+class Command(BaseCommand):
+    help = "Benchmark views, API and commands on a seeded synthetic catalogue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", type=int, choices=SCALES, default=1,
+            help=f"Catalogue size; 1 is {BASE_COUNTS['books']:,} books. Default: 1",
+        )
+        parser.add_argument("--seed", type=int, default=1, help="Generator and sampling seed. Default: 1")
+        parser.add_argument(
+            "--scenario",
+            choices=list(SCENARIOS),
+            action="append",
+            help="Only run this scenario (repeatable). Default: all.",
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=None,
+            help="Timed rounds per operation, overriding each scenario's default.",
+        )
+        parser.add_argument("--out", default=None, help="Write the JSON report to this path.")
+        parser.add_argument("--baseline", default=None, help="Compare against this JSON report.")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed relative slowdown of a median against the baseline. Default: 0.25",
+        )
+        parser.add_argument(
+            "--keepdb", action="store_true",
+            help="Keep the test database, and the catalogue in it, for the next run.",
+        )
+
+    def handle(self, *args, **options):
+        baseline = load_report(options["baseline"]) if options["baseline"] else None
+        names = options["scenario"] or list(SCENARIOS)
+
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"])
+        try:
+            with tempfile.TemporaryDirectory(prefix="haskala-bench-") as workdir, override_settings(
+                CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+                HASKALA_DUMPS_ROOT=workdir,
+                HASKALA_SITEMAP_ROOT=workdir,
+                HASKALA_SPARQL_PUSH_URL="",
+            ):
+                counts = self._catalogue(options["scale"], options["seed"])
+                results = run_scenarios(
+                    names, workdir, seed=options["seed"], rounds=options["rounds"], log=self._log,
+                )
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        report = build_report(results, options["scale"], options["seed"], counts)
+        if options["out"]:
+            write_report(report, options["out"])
+            self.stdout.write(f"Report written to {options['out']}.")
+        if baseline is None:
+            return
+        try:
+            regressions = compare(report, baseline, options["tolerance"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def _catalogue(self, scale, seed):
+        expected = round(BASE_COUNTS["books"] * scale)
+        existing = Book.objects.count()
+        if existing:
+            if existing != expected:
+                raise CommandError(
+                    f"The kept test database holds {existing} books, scale {scale} needs {expected}. "
+                    "Run once without --keepdb to rebuild it."
+                )
+            self.stdout.write("Reusing the catalogue in the kept test database.")
+            return {model.__name__: model.objects.count() for model in (Book, Person, City)}
+
+        self.stdout.write(f"Generating the scale {scale} catalogue (seed {seed}) …")
+        started = time.monotonic()
+        counts = generate(scale=scale, seed=seed)
+        self.stdout.write(f"  {sum(counts.values()):,} rows in {time.monotonic() - started:.1f}s")
+        return counts
+
+    def _log(self, name, stats):
+        self.stdout.write(
+            f"{name:<24} median {stats['median_ms']:>9.1f} ms  p95 {stats['p95_ms']:>9.1f} ms  "
+            f"{stats['queries']:>5} queries  ({stats['runs']} runs)"
+        )
@@ -0,0 +1,47 @@
+"""
+Render the sitemap index and its per-type pages (``home/sitemaps.py``)
+into ``HASKALA_SITEMAP_ROOT``, each as ``.xml`` plus a ``.gz`` sibling,
+for nginx to serve as static files.
+
+Run after every ``collectstatic --clear`` (the entrypoint does) and
+after bulk imports; single publishes refresh their section by
+themselves once the files exist.
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from home.sitemaps import SITEMAPS, write_sitemaps
+
+
+class Command(BaseCommand):
+    help = "Write /sitemap.xml and its pages as static files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--section",
+            choices=list(SITEMAPS),
+            action="append",
+            help="Only rewrite this section's pages (repeatable). The index is always rewritten.",
+        )
+        parser.add_argument(
+            "--out-dir",
+            default=None,
+            help="Directory to write into. Default: HASKALA_SITEMAP_ROOT",
+        )
+        parser.add_argument(
+            "--base-url",
+            default=None,
+            help="Scheme and host for the URLs. Default: HASKALA_SITEMAP_BASE_URL",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = write_sitemaps(
+            sections=options["section"], root=options["out_dir"], base_url=options["base_url"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} sitemap files in {time.monotonic() - started:.1f}s."
+        ))
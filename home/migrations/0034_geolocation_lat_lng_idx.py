@@ -0,0 +1,48 @@
+"""
+Index ``Geolocation(lat, lng)`` for the bounding-box pre-filter in
+``home/nearby.py`` and backfill ``lat_sin`` / ``lat_cos`` /
+``lng_rad`` on rows the Drupal import left without them.
+"""
+import math
+
+from django.db import migrations, models
+
+
+def backfill_trig_columns(apps, schema_editor):
+    Geolocation = apps.get_model("home", "Geolocation")
+    stale = (
+        Geolocation.objects
+        .filter(lat__isnull=False, lng__isnull=False)
+        .filter(
+            models.Q(lat_sin__isnull=True)
+            | models.Q(lat_cos__isnull=True)
+            | models.Q(lng_rad__isnull=True)
+        )
+    )
+    batch = []
+    for geo in stale.iterator(chunk_size=500):
+        lat_rad = math.radians(geo.lat)
+        geo.lat_sin = math.sin(lat_rad)
+        geo.lat_cos = math.cos(lat_rad)
+        geo.lng_rad = math.radians(geo.lng)
+        batch.append(geo)
+        if len(batch) >= 500:
+            Geolocation.objects.bulk_update(batch, ["lat_sin", "lat_cos", "lng_rad"])
+            batch = []
+    if batch:
+        Geolocation.objects.bulk_update(batch, ["lat_sin", "lat_cos", "lng_rad"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0033_populate_topic_occupation_slugs"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="geolocation",
+            index=models.Index(fields=["lat", "lng"], name="home_geoloc_lat_lng_idx"),
+        ),
+        migrations.RunPython(backfill_trig_columns, reverse_code=migrations.RunPython.noop),
+    ]
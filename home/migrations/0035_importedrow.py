@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0034_geolocation_lat_lng_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportedRow",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("model", models.CharField(max_length=100)),
+                ("key", models.CharField(max_length=255)),
+                ("row_hash", models.CharField(max_length=40)),
+                ("imported_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("model", "key"), name="unique_imported_row"),
+                ],
+            },
+        ),
+    ]
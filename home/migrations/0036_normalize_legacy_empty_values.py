@@ -0,0 +1,73 @@
+"""
+Empty out the legacy "no value" markers the Drupal-6 importer wrote
+into text columns: PHP-serialised empty arrays (``a:0:{}``) in any of
+them, and the zero flags (``"0"``, ``"0.0"``, ``"0.00"`` …) in the
+Book yes/no columns that were imported as text.
+
+``value_filters.clean_value`` hides both on the detail pages, but
+every render re-parsed them; with the columns empty at rest the
+cleaned-value view and the API see plain empty strings. 0031 covered
+``a:0:{}`` on Book only; this migration also covers the other
+detail-page models, with one UPDATE per column instead of a save per
+row. A zero is only a marker in the flag columns below; in a year,
+page count or volume column it can be data and is left alone.
+"""
+from __future__ import annotations
+
+from django.db import migrations
+
+
+# Whole value is an empty PHP array, with optional surrounding whitespace.
+_EMPTY_ARRAY = r'^\s*a:0:\{\}\s*;?\s*$'
+# Whole value is a zero (0, 0.0, 0.00 …).
+_ZERO_FLAG = r'^\s*0(\.0+)?\s*$'
+
+MODELS = ("Book", "Person", "Edition", "Translation", "Preface", "Production")
+
+# Book yes/no flags stored as "0.0" / "1.0" text. Frozen copy of
+# import_haskala_books.ZERO_FLAG_FIELDS as of this migration.
+ZERO_FLAG_FIELDS = {
+    "Book": (
+        "dedications",
+        "personal_address",
+        "printers",
+        "series_part",
+        "subscribers",
+        "subscription_appeal",
+        "thanks",
+    ),
+}
+
+
+def forwards(apps, schema_editor):
+    for model_name in MODELS:
+        model = apps.get_model("home", model_name)
+        fields = [
+            f.name for f in model._meta.fields
+            if f.get_internal_type() in ("TextField", "CharField")
+            and not f.choices and not f.unique
+        ]
+        cleaned = 0
+        for name in fields:
+            cleaned += model.objects.filter(**{f"{name}__regex": _EMPTY_ARRAY}).update(**{name: ""})
+        for name in ZERO_FLAG_FIELDS.get(model_name, ()):
+            cleaned += model.objects.filter(**{f"{name}__regex": _ZERO_FLAG}).update(**{name: ""})
+        if cleaned:
+            print(f"  emptied {cleaned} legacy empty-value fields on {model_name}")
+
+
+def revert(apps, schema_editor):
+    # Lossy: an emptied column can't tell whether it held "0.0" or
+    # "a:0:{}". No-op so a backwards migrate doesn't crash.
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0035_importedrow"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, reverse_code=revert),
+    ]
@@ -0,0 +1,78 @@
+"""
+Add the SlugAlias redirect table and fill it with the slugs old links
+may still use:
+
+- ``slugify(name)``: the form the taxonomy detail views matched by
+  scanning the whole table before Topic / Occupation (0032) and
+  Publisher / Series had a slug column, and the plain form of
+  pre-slug Book / Person / City links;
+- ``slugify(anyascii(source))``: the Book / Person / City slugs of
+  0027, which 0029 replaced when it started stripping non-Latin
+  scripts first.
+
+Forms equal to some row's current slug are skipped (the current slug
+wins anyway); when several rows share a form, the first by pk keeps
+it, as the old table scan would have. Suffixed ``-N`` slugs handed out
+by 0027 depended on visiting order and are not reconstructed.
+"""
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+# model name -> slug source, as in 0027 / 0029 / 0033
+SOURCES = {
+    "Book": lambda row: row.name or "",
+    "Person": lambda row: row.pref_label or row.german_name or row.hebrew_name or "",
+    "City": lambda row: row.name or "",
+    "Topic": lambda row: row.name or "",
+    "Publisher": lambda row: row.name or "",
+    "Series": lambda row: row.name or "",
+    "Occupation": lambda row: row.name or "",
+}
+
+
+def forwards(apps, schema_editor):
+    from anyascii import anyascii
+    from django.utils.text import slugify
+
+    SlugAlias = apps.get_model("home", "SlugAlias")
+    for model_name, source in SOURCES.items():
+        Model = apps.get_model("home", model_name)
+        label = f"home.{model_name.lower()}"
+        rows = list(Model.objects.order_by("pk"))
+        taken = {row.slug for row in rows if row.slug}
+        aliases = []
+        for row in rows:
+            value = source(row)
+            for slug in dict.fromkeys((slugify(value), slugify(anyascii(value)))):
+                if slug and slug not in taken:
+                    taken.add(slug)
+                    aliases.append(SlugAlias(model=label, slug=slug[:255], target_pk=str(row.pk)))
+        SlugAlias.objects.bulk_create(aliases, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0036_normalize_legacy_empty_values"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlugAlias",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("model", models.CharField(max_length=100)),
+                ("slug", models.SlugField(db_index=False, max_length=255)),
+                ("target_pk", models.CharField(max_length=64)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "Slug aliases",
+                "indexes": [models.Index(fields=["model", "target_pk"], name="slug_alias_target_idx")],
+                "constraints": [models.UniqueConstraint(fields=("model", "slug"), name="unique_slug_alias")],
+            },
+        ),
+        migrations.RunPython(forwards, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+"""
+Give Person and City the ``updated_at`` column Book already has, so the
+sitemap can emit a ``<lastmod>`` for every entity type from one
+indexed column instead of loading whole rows.
+
+Existing rows start from their last publish time, falling back to the
+Drupal ``changed`` stamp; rows with neither keep the migration time.
+"""
+from __future__ import annotations
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def forwards(apps, schema_editor):
+    for model_name in ("Person", "City"):
+        model = apps.get_model("home", model_name)
+        model.objects.update(
+            updated_at=Coalesce("last_published_at", "legacy_changed", "updated_at"),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0037_slugalias"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="person",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(forwards, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+"""
+Add the EntityRelation table behind the place and person pages and
+fill it from the existing Book, Person, Edition, Translation, Mention,
+Preface, Production and BookAuthor rows (see home/entity_relations.py).
+"""
+from __future__ import annotations
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    from home.entity_relations import rebuild
+
+    rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0038_person_city_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EntityRelation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("role", models.CharField(choices=[
+                    ("published", "Book published here"),
+                    ("edition", "Edition printed here"),
+                    ("translation", "Translation from here"),
+                    ("born", "Born here"),
+                    ("died", "Died here"),
+                    ("mention", "Mention"),
+                    ("work", "Author"),
+                    ("preface", "Preface"),
+                    ("production", "Production"),
+                ], max_length=16)),
+                ("city", models.ForeignKey(blank=True, db_index=False, null=True,
+                                           on_delete=django.db.models.deletion.CASCADE,
+                                           related_name="+", to="home.city")),
+                ("person", models.ForeignKey(blank=True, db_index=False, null=True,
+                                             on_delete=django.db.models.deletion.CASCADE,
+                                             related_name="+", to="home.person")),
+                ("book", models.ForeignKey(blank=True, null=True,
+                                           on_delete=django.db.models.deletion.SET_NULL,
+                                           related_name="+", to="home.book")),
+                ("related_person", models.ForeignKey(blank=True, null=True,
+                                                     on_delete=django.db.models.deletion.SET_NULL,
+                                                     related_name="+", to="home.person")),
+                ("edition", models.ForeignKey(blank=True, null=True,
+                                              on_delete=django.db.models.deletion.CASCADE,
+                                              related_name="+", to="home.edition")),
+                ("translation", models.ForeignKey(blank=True, null=True,
+                                                  on_delete=django.db.models.deletion.CASCADE,
+                                                  related_name="+", to="home.translation")),
+                ("mention", models.ForeignKey(blank=True, null=True,
+                                              on_delete=django.db.models.deletion.CASCADE,
+                                              related_name="+", to="home.mention")),
+                ("preface", models.ForeignKey(blank=True, null=True,
+                                              on_delete=django.db.models.deletion.CASCADE,
+                                              related_name="+", to="home.preface")),
+                ("production", models.ForeignKey(blank=True, null=True,
+                                                 on_delete=django.db.models.deletion.CASCADE,
+                                                 related_name="+", to="home.production")),
+                ("book_author", models.ForeignKey(blank=True, null=True,
+                                                  on_delete=django.db.models.deletion.CASCADE,
+                                                  related_name="+", to="home.bookauthor")),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["city", "role"], name="entity_relation_city_idx"),
+                    models.Index(fields=["person", "role"], name="entity_relation_person_idx"),
+                ],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(("city__isnull", False)) ^ models.Q(("person__isnull", False)),
+                        name="entity_relation_one_entity",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(forwards, reverse_code=migrations.RunPython.noop),
+    ]
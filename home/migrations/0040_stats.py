@@ -0,0 +1,64 @@
+"""
+Add the catalogue statistics counters and memberships and count the
+existing live books and persons into them (see home/stats.py).
+"""
+from __future__ import annotations
+
+from django.db import migrations, models
+
+DIMENSIONS = [
+    ("books", "Books"),
+    ("decade", "Books per decade"),
+    ("language", "Books per language"),
+    ("place", "Books per publication place"),
+    ("bundle", "Books per bundle"),
+    ("digitized", "Digitized books"),
+    ("persons", "Persons"),
+    ("occupation", "Persons per occupation"),
+]
+
+
+def forwards(apps, schema_editor):
+    from home.stats import rebuild
+
+    rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0039_entityrelation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatsCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("dimension", models.CharField(choices=DIMENSIONS, max_length=16)),
+                ("key", models.CharField(blank=True, max_length=64)),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("dimension", "key"), name="unique_stats_count"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="StatsMembership",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_pk", models.UUIDField()),
+                ("dimension", models.CharField(choices=DIMENSIONS, max_length=16)),
+                ("key", models.CharField(blank=True, max_length=64)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("object_pk", "dimension", "key"),
+                                            name="unique_stats_membership"),
+                ],
+            },
+        ),
+        migrations.RunPython(forwards, reverse_code=migrations.RunPython.noop),
+    ]
@@ -7,6 +7,7 @@ from django.db import models
 from django.template.defaultfilters import slugify
 from django.template.response import TemplateResponse
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.cache import cache_page, never_cache
 from modelcluster.fields import ParentalKey
@@ -19,6 +20,7 @@ from wagtail.models import Page, RevisionMixin, DraftStateMixin
 from wagtail.search import index
 
 from .book_admin import build_book_panels
+from .templatetags.value_filters import CleanedValues
 
 # Create a bundle choice field for the options of translation, edition, mention and preface
 BUNDLE_CHOICES = (
@@ -83,6 +85,50 @@ class LegacyImportedModel(models.Model):
         abstract = True
 
 
+class ImportedRow(models.Model):
+    """
+    Fingerprint of the values the CSV importers last wrote for one row,
+    so ``--incremental`` runs can skip rows that did not change
+    upstream (see ``home/importing.py``).
+    """
+    model = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    row_hash = models.CharField(max_length=40)
+    imported_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model", "key"], name="unique_imported_row"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.key}"
+
+
+class SlugAlias(models.Model):
+    """
+    A slug that used to address an object (a replaced slug, or the
+    legacy ``slugify(name)`` URL form) and the object it redirects to
+    (see ``home/slug_aliases.py``).
+    """
+    model = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=255, db_index=False)
+    target_pk = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "Slug aliases"
+        constraints = [
+            models.UniqueConstraint(fields=["model", "slug"], name="unique_slug_alias"),
+        ]
+        indexes = [
+            models.Index(fields=["model", "target_pk"], name="slug_alias_target_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.slug} → {self.target_pk}"
+
+
 # Language model
 class Language(models.Model):
     """
@@ -308,6 +354,7 @@ class City(DraftStateMixin, RevisionMixin, LegacyImportedModel):
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True, blank=True, null=True)
     legacy_tid = models.IntegerField(unique=True, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Cities"
@@ -340,9 +387,24 @@ class Geolocation(models.Model):
     lat_cos = models.FloatField(max_length=255, blank=True, null=True)
     lng_rad = models.FloatField(max_length=255, blank=True, null=True)
 
+    class Meta:
+        # Bounding-box pre-filter for the spatial queries in home/nearby.py.
+        indexes = [
+            models.Index(fields=["lat", "lng"], name="home_geoloc_lat_lng_idx"),
+        ]
+
     def __str__(self):
         return self.city.name
 
+    def save(self, *args, **kwargs):
+        # Keep Drupal's precomputed trig columns in step with lat/lng so
+        # the distance ranking in home/nearby.py stays a pure SQL
+        # expression.
+        from .nearby import trig_columns
+
+        self.lat_sin, self.lat_cos, self.lng_rad = trig_columns(self.lat, self.lng)
+        super().save(*args, **kwargs)
+
 
 class Gender(models.Model):
     name = models.CharField(max_length=255)
@@ -376,6 +438,7 @@ class Person(DraftStateMixin, RevisionMixin, LegacyImportedModel):
     german_name = models.CharField(max_length=255, blank=True)
     hebrew_name = models.CharField(max_length=255, blank=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     gender = models.ForeignKey(Gender, null=True, blank=True, on_delete=models.SET_NULL)
     occupations = models.ManyToManyField(Occupation, blank=True)
@@ -426,6 +489,11 @@ class Person(DraftStateMixin, RevisionMixin, LegacyImportedModel):
     def get_absolute_url(self):
         return f"/persons/{self.slug}/" if self.slug else f"/persons/{self.uuid}/"
 
+    @cached_property
+    def cleaned(self):
+        """Memoised ``clean_value`` of every field, for the detail page."""
+        return CleanedValues(self)
+
 
 class Edition(LegacyImportedModel):
     """
@@ -1405,6 +1473,11 @@ class Book(DraftStateMixin, RevisionMixin, LegacyImportedModel, ClusterableModel
     def get_absolute_url(self):
         return f"/books/{self.slug}/" if self.slug else f"/books/{self.uuid}/"
 
+    @cached_property
+    def cleaned(self):
+        """Memoised ``clean_value`` of every field, for the detail page."""
+        return CleanedValues(self)
+
     def author_names(self):
         """
         Comma-separated list of authors for admin list views.
@@ -1412,6 +1485,115 @@ class Book(DraftStateMixin, RevisionMixin, LegacyImportedModel, ClusterableModel
         return ", ".join(str(a) for a in self.authors.all())
 
     author_names.short_description = _("Authors")
+    # Read by home.wagtail_hooks.ListingViewSet.
+    author_names.prefetch_related = ("authors",)
+
+
+class EntityRelation(models.Model):
+    """
+    One entry of a place or person page: the City or Person whose page
+    lists it, its role there, and the book, person and relation row it
+    shows. Derived from Book, Person and the relation models by
+    ``home/entity_relations.py``, so a page reads all of its entries
+    with one indexed query.
+    """
+
+    class Role(models.TextChoices):
+        PUBLISHED = "published", _("Book published here")
+        EDITION = "edition", _("Edition printed here")
+        TRANSLATION = "translation", _("Translation from here")
+        BORN = "born", _("Born here")
+        DIED = "died", _("Died here")
+        MENTION = "mention", _("Mention")
+        WORK = "work", _("Author")
+        PREFACE = "preface", _("Preface")
+        PRODUCTION = "production", _("Production")
+
+    # The page the entry belongs to: exactly one of these is set.
+    city = models.ForeignKey(City, null=True, blank=True, on_delete=models.CASCADE,
+                             db_index=False, related_name="+")
+    person = models.ForeignKey(Person, null=True, blank=True, on_delete=models.CASCADE,
+                               db_index=False, related_name="+")
+    role = models.CharField(max_length=16, choices=Role.choices)
+
+    # What the entry shows.
+    book = models.ForeignKey(Book, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    related_person = models.ForeignKey(Person, null=True, blank=True, on_delete=models.SET_NULL,
+                                       related_name="+")
+    edition = models.ForeignKey(Edition, null=True, blank=True, on_delete=models.CASCADE, related_name="+")
+    translation = models.ForeignKey(Translation, null=True, blank=True, on_delete=models.CASCADE,
+                                    related_name="+")
+    mention = models.ForeignKey(Mention, null=True, blank=True, on_delete=models.CASCADE, related_name="+")
+    preface = models.ForeignKey(Preface, null=True, blank=True, on_delete=models.CASCADE, related_name="+")
+    production = models.ForeignKey(Production, null=True, blank=True, on_delete=models.CASCADE,
+                                   related_name="+")
+    book_author = models.ForeignKey(BookAuthor, null=True, blank=True, on_delete=models.CASCADE,
+                                    related_name="+")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["city", "role"], name="entity_relation_city_idx"),
+            models.Index(fields=["person", "role"], name="entity_relation_person_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(city__isnull=False) ^ models.Q(person__isnull=False),
+                name="entity_relation_one_entity",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.city_id or self.person_id} {self.role}"
+
+
+class StatsCount(models.Model):
+    """
+    One catalogue statistics counter: the number of live books or
+    persons with *key* in *dimension* (a decade, a language pk, …).
+    Maintained by ``home/stats.py``.
+    """
+
+    class Dimension(models.TextChoices):
+        BOOKS = "books", _("Books")
+        DECADE = "decade", _("Books per decade")
+        LANGUAGE = "language", _("Books per language")
+        PLACE = "place", _("Books per publication place")
+        BUNDLE = "bundle", _("Books per bundle")
+        DIGITIZED = "digitized", _("Digitized books")
+        PERSONS = "persons", _("Persons")
+        OCCUPATION = "occupation", _("Persons per occupation")
+
+    dimension = models.CharField(max_length=16, choices=Dimension.choices)
+    # "" when the book or person has no value in the dimension.
+    key = models.CharField(max_length=64, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "key"], name="unique_stats_count"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}[{self.key}] = {self.count}"
+
+
+class StatsMembership(models.Model):
+    """
+    The counters a live book or person is currently counted in, so a
+    change only moves that object between counters.
+    """
+
+    object_pk = models.UUIDField()
+    dimension = models.CharField(max_length=16, choices=StatsCount.Dimension.choices)
+    key = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["object_pk", "dimension", "key"], name="unique_stats_membership"),
+        ]
+
+    def __str__(self):
+        return f"{self.object_pk} in {self.dimension}[{self.key}]"
 
 
 class HomePage(Page):
@@ -1592,6 +1774,8 @@ class ContactPage(AbstractEmailForm):
         import requests
         from django.conf import settings as dj_settings
 
+        from haskala import outbound
+
         secret = getattr(dj_settings, "HCAPTCHA_SECRET_KEY", "") or ""
         site = getattr(dj_settings, "HCAPTCHA_SITE_KEY", "") or ""
         if not secret or not site:
@@ -1605,7 +1789,7 @@ class ContactPage(AbstractEmailForm):
             return "Please complete the captcha challenge."
 
         try:
-            response = requests.post(
+            response = outbound.session().post(
                 "https://api.hcaptcha.com/siteverify",
                 data={"secret": secret, "response": token,
                       "remoteip": request.META.get("REMOTE_ADDR", "")},
@@ -2029,44 +2213,6 @@ class StaticPage(Page):
     ]
 
 
-# Non-Latin Unicode ranges we drop from a slug source before
-# transliteration kicks in. Hebrew, Arabic and CJK don't have useful
-# ASCII transliterations for our use case — anyascii produces stubs
-# like "hrn-yvsf" for "אהרן, יוסף" that read as random consonant
-# noise next to the actual Latin name. Stripping them up front leaves
-# only the Latin parts ("Aaron, Joseph Philipp"), which anyascii can
-# then normalise to ASCII for diacritics like umlauts.
-_NON_LATIN_SCRIPT_RANGES = (
-    (0x0370, 0x03FF),   # Greek
-    (0x0400, 0x04FF),   # Cyrillic
-    (0x0500, 0x052F),   # Cyrillic Supplement
-    (0x0530, 0x058F),   # Armenian
-    (0x0590, 0x05FF),   # Hebrew
-    (0x0600, 0x06FF),   # Arabic
-    (0x0700, 0x074F),   # Syriac
-    (0x0750, 0x077F),   # Arabic Supplement
-    (0x0780, 0x07BF),   # Thaana
-    (0x0900, 0x097F),   # Devanagari
-    (0x4E00, 0x9FFF),   # CJK Unified Ideographs
-    (0x3040, 0x309F),   # Hiragana
-    (0x30A0, 0x30FF),   # Katakana
-    (0xAC00, 0xD7AF),   # Hangul syllables
-)
-
-
-def _strip_non_latin_script(value: str) -> str:
-    """Remove characters from non-Latin Unicode scripts."""
-    if not value:
-        return ""
-    out_chars = []
-    for ch in value:
-        cp = ord(ch)
-        if any(lo <= cp <= hi for lo, hi in _NON_LATIN_SCRIPT_RANGES):
-            continue
-        out_chars.append(ch)
-    return "".join(out_chars)
-
-
 def generate_unique_slug(instance, value, slug_field_name="slug"):
     """
     Generate a unique slug for instance, based on value (e.g. name).
@@ -2078,26 +2224,13 @@ def generate_unique_slug(instance, value, slug_field_name="slug"):
       2. anyascii the remainder so Latin diacritics ("Voß" → "voss",
          "Łódź" → "lodz") survive intact.
       3. slugify and de-duplicate against the existing rows by
-         appending -2, -3, …
+         appending -2, -3, … — the taken suffixes come from a single
+         query, see home/slugs.py.
 
     If the source string transliterates to empty (a Hebrew-only name,
     say), fall back to <modelclass>-<short uuid> so the URL is still
     short and recognisable.
     """
-    from anyascii import anyascii
-
-    ModelClass = instance.__class__
-
-    cleaned = _strip_non_latin_script(value or "")
-    base = slugify(anyascii(cleaned))
-    if not base:
-        short_id = str(instance.pk or "")[:8]
-        base = f"{ModelClass.__name__.lower()}-{short_id}".strip("-")
-
-    slug = base
-    i = 2
-    while ModelClass.objects.filter(**{slug_field_name: slug}).exclude(pk=instance.pk).exists():
-        slug = f"{base}-{i}"
-        i += 1
+    from .slugs import SlugAllocator
 
-    return slug
+    return SlugAllocator(instance.__class__, slug_field_name).allocate(instance, value)
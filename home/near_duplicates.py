@@ -0,0 +1,268 @@
+"""
+Near-duplicate detection for persons and books.
+
+``home.audit.duplicate_groups`` only catches names that are equal once
+trimmed and lower-cased. The catalogue's real duplicates are spelling
+variants of the same transliterated name ("Wessely, Naphtali Herz" /
+"Wessely, Naftali Hirz"). Comparing every pair is O(n²), so records
+are first put into blocks that share a cheap key:
+
+- ``t:`` the sorted, transliterated name tokens (word order, accents
+  and punctuation ignored);
+- ``p:`` the sorted phonetic codes of those tokens, which fold the
+  usual German / Yiddish / English transliteration variants
+  (ph/f, w/v, z/s/tz, ch/k/kh, y/i, vowels, silent h);
+- ``s:`` the phonetic code of the first token plus the initial of the
+  second, for "Surname, Given" names abbreviated on one side.
+
+Only records sharing a block are compared. Blocks larger than
+``max_block`` (very common surnames) are skipped, which keeps the number
+of candidate pairs roughly linear in the catalogue size. Each candidate
+is scored by name similarity and nudged up or down by the facts both
+records carry (places, years, authors).
+"""
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from anyascii import anyascii
+
+from home.models import Book, BookAuthor, Person
+
+THRESHOLD = 0.85
+MAX_BLOCK = 100
+
+# Name particles that say nothing about identity.
+PARTICLES = frozenset({"b", "bar", "bat", "ben", "de", "der", "ha", "la", "le", "van", "von"})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_YEAR_RE = re.compile(r"\b(1[0-9]{3})\b")
+# Applied in order; longer clusters first.
+_PHONETIC_RULES = (
+    ("tsch", "c"), ("sch", "s"), ("ph", "f"), ("th", "t"), ("ck", "k"),
+    ("tz", "s"), ("ch", "k"), ("kh", "k"), ("sh", "s"), ("w", "v"),
+    ("z", "s"), ("c", "k"), ("q", "k"), ("x", "ks"), ("y", "i"), ("j", "i"),
+)
+_SILENT = frozenset("aeiouh")
+
+
+def name_tokens(value) -> tuple[str, ...]:
+    """Lower-case ASCII tokens of *value*, particles dropped."""
+    tokens = _TOKEN_RE.findall(anyascii(value or "").lower())
+    return tuple(token for token in tokens if token not in PARTICLES)
+
+
+def phonetic(token: str) -> str:
+    """
+    A coarse phonetic code for one name token: transliteration variants
+    folded, vowels and ``h`` dropped after the first letter, doubled
+    letters collapsed.
+    """
+    for old, new in _PHONETIC_RULES:
+        token = token.replace(old, new)
+    if not token:
+        return ""
+    code = [token[0]]
+    for ch in token[1:]:
+        if ch not in _SILENT and ch != code[-1]:
+            code.append(ch)
+    return "".join(code)
+
+
+def year(value):
+    """The first four-digit year in a free-text date, or ``None``."""
+    match = _YEAR_RE.search(value or "")
+    return int(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class Fact:
+    """A field two records are compared on once their names match."""
+
+    field: str
+    label: str
+    agree: float
+    disagree: float
+    # Years this far apart still agree.
+    tolerance: int = 0
+
+    def compare(self, a, b):
+        """The score adjustment for values *a* and *b* (0 if one is missing)."""
+        if not a or not b:
+            return 0.0
+        if isinstance(a, frozenset):
+            same = bool(a & b)
+        elif isinstance(a, int):
+            same = abs(a - b) <= self.tolerance
+        else:
+            same = a == b
+        return self.agree if same else self.disagree
+
+
+PERSON_FACTS = (
+    Fact("place_of_birth", "place of birth", 0.1, -0.1),
+    Fact("place_of_death", "place of death", 0.1, -0.1),
+    Fact("birth_year", "birth year", 0.1, -0.2, tolerance=1),
+    Fact("death_year", "death year", 0.1, -0.2, tolerance=1),
+)
+
+BOOK_FACTS = (
+    Fact("publication_place", "publication place", 0.1, -0.1),
+    Fact("year", "year", 0.1, -0.2),
+    Fact("authors", "author", 0.15, -0.1),
+)
+
+
+@dataclass
+class Record:
+    pk: object
+    label: str
+    # Token tuples of every non-empty name variant.
+    names: list
+    facts: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        # (sorted tokens, sorted phonetic codes) per name, compared pairwise.
+        self.keys = [
+            (" ".join(sorted(tokens)), " ".join(sorted(map(phonetic, tokens))))
+            for tokens in self.names
+        ]
+
+    def block_keys(self):
+        keys = set()
+        for tokens in self.names:
+            codes = [phonetic(token) for token in tokens]
+            keys.add("t:" + " ".join(sorted(tokens)))
+            keys.add("p:" + " ".join(sorted(codes)))
+            if len(tokens) > 1:
+                keys.add(f"s:{codes[0]} {tokens[1][0]}")
+        return keys
+
+
+@dataclass
+class Pair:
+    score: float
+    name_score: float
+    a: Record
+    b: Record
+    reasons: list
+
+
+@dataclass
+class Result:
+    pairs: list
+    blocks: int = 0
+    skipped_blocks: int = 0
+    candidates: int = 0
+
+
+def name_similarity(a: Record, b: Record) -> float:
+    """Best similarity between any name variant of *a* and of *b*."""
+    best = 0.0
+    for left, left_sounds in a.keys:
+        for right, right_sounds in b.keys:
+            plain = SequenceMatcher(None, left, right).ratio()
+            sounds = SequenceMatcher(None, left_sounds, right_sounds).ratio()
+            # Sounding alike is weaker evidence than being spelt alike.
+            best = max(best, plain, 0.95 * sounds)
+    return best
+
+
+def score_pair(a: Record, b: Record, facts) -> Pair:
+    name_score = name_similarity(a, b)
+    score, reasons = name_score, []
+    for fact in facts:
+        delta = fact.compare(a.facts.get(fact.field), b.facts.get(fact.field))
+        if delta:
+            score += delta
+            reasons.append(f"{'same' if delta > 0 else 'different'} {fact.label}")
+    return Pair(round(min(max(score, 0.0), 1.0), 3), round(name_score, 3), a, b, reasons)
+
+
+def find_near_duplicates(records, facts, threshold=THRESHOLD, max_block=MAX_BLOCK) -> Result:
+    """
+    Candidate pairs of *records* sharing a block key, scored and
+    filtered by *threshold*, best first.
+    """
+    blocks = defaultdict(list)
+    for index, record in enumerate(records):
+        for key in record.block_keys():
+            blocks[key].append(index)
+
+    result = Result(pairs=[], blocks=len(blocks))
+    seen = set()
+    for members in blocks.values():
+        if len(members) > max_block:
+            result.skipped_blocks += 1
+            continue
+        for i, j in combinations(members, 2):
+            if (i, j) in seen:
+                continue
+            seen.add((i, j))
+            pair = score_pair(records[i], records[j], facts)
+            if pair.score >= threshold:
+                result.pairs.append(pair)
+    result.candidates = len(seen)
+    result.pairs.sort(key=lambda pair: (-pair.score, -pair.name_score, pair.a.label, pair.b.label))
+    return result
+
+
+def person_records():
+    """One :class:`Record` per Person, in one query."""
+    rows = Person.objects.order_by().values_list(
+        "pk", "pref_label", "german_name", "hebrew_name",
+        "place_of_birth_id", "place_of_death_id", "date_of_birth", "date_of_death",
+    )
+    records = []
+    for pk, pref_label, german_name, hebrew_name, born_in, died_in, born, died in rows.iterator():
+        names = [tokens for tokens in map(name_tokens, (pref_label, german_name, hebrew_name)) if tokens]
+        if not names:
+            continue
+        records.append(Record(
+            pk,
+            pref_label or german_name or hebrew_name,
+            list(dict.fromkeys(names)),
+            {
+                "place_of_birth": born_in,
+                "place_of_death": died_in,
+                "birth_year": year(born),
+                "death_year": year(died),
+            },
+        ))
+    return records
+
+
+def book_records():
+    """One :class:`Record` per named Book, in two queries."""
+    authors = defaultdict(set)
+    for book_id, person_id in BookAuthor.objects.values_list("book_id", "person_id").iterator():
+        authors[book_id].add(person_id)
+
+    rows = Book.objects.order_by().values_list("pk", "name", "gregorian_year", "publication_place_id")
+    records = []
+    for pk, name, gregorian_year, place in rows.iterator():
+        tokens = name_tokens(name)
+        if not tokens:
+            continue
+        records.append(Record(
+            pk,
+            name,
+            [tokens],
+            {
+                "publication_place": place,
+                "year": gregorian_year or None,
+                "authors": frozenset(authors.get(pk, ())),
+            },
+        ))
+    return records
+
+
+# model name -> (record loader, facts)
+PROFILES = {
+    "Person": (person_records, PERSON_FACTS),
+    "Book": (book_records, BOOK_FACTS),
+}
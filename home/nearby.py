@@ -0,0 +1,161 @@
+"""
+Spatial queries over ``Geolocation``: "places within N km of X" and
+"the k nearest places to this place".
+
+Drupal stored ``sin(lat)``, ``cos(lat)`` and ``lng`` in radians next to
+every coordinate so the great-circle distance collapses to one
+multiply-add and a single ``acos`` per row::
+
+    d = R * acos(sin φ₁·sin φ₂ + cos φ₁·cos φ₂·cos(λ₂ − λ₁))
+
+The queries below first narrow the candidates with a bounding box on
+the indexed ``lat`` / ``lng`` columns and only then let the database
+rank the survivors with that expression — no Python loop over the
+whole table.
+"""
+from __future__ import annotations
+
+import math
+
+from django.core.cache import cache
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ACos, Cos, Greatest, Least
+
+from .models import Geolocation
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+# Search radii tried in turn by nearest_places() until enough
+# neighbours turn up. The last step covers half the globe.
+NEAREST_RADII_KM = (50, 200, 800, 3200, math.pi * EARTH_RADIUS_KM)
+
+NEARBY_COUNT = 8
+NEARBY_CACHE_TIMEOUT = 60 * 60 * 24
+_GENERATION_KEY = "home:nearby:generation"
+
+
+def trig_columns(lat, lng):
+    """Return ``(lat_sin, lat_cos, lng_rad)`` for a coordinate pair."""
+    if lat is None or lng is None:
+        return None, None, None
+    lat_rad = math.radians(lat)
+    return math.sin(lat_rad), math.cos(lat_rad), math.radians(lng)
+
+
+def _bounding_box_q(lat, lng, radius_km) -> Q:
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    q = Q(lat__gte=lat - dlat, lat__lte=lat + dlat)
+
+    # Longitude degrees shrink towards the poles; once the box touches
+    # a pole or spans the globe there is nothing to gain from it.
+    cos_lat = math.cos(math.radians(lat))
+    if abs(lat) + dlat >= 90 or cos_lat <= 0:
+        return q
+    dlng = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    if dlng >= 180:
+        return q
+    west, east = lng - dlng, lng + dlng
+    if west < -180:
+        return q & (Q(lng__gte=west + 360) | Q(lng__lte=east))
+    if east > 180:
+        return q & (Q(lng__gte=west) | Q(lng__lte=east - 360))
+    return q & Q(lng__gte=west, lng__lte=east)
+
+
+def _distance_expression(lat, lng):
+    lat_sin, lat_cos, lng_rad = trig_columns(lat, lng)
+    cos_angle = (
+        F("lat_sin") * Value(lat_sin)
+        + F("lat_cos") * Value(lat_cos) * Cos(F("lng_rad") - Value(lng_rad))
+    )
+    # Rounding can push the cosine a hair past ±1, which acos rejects.
+    clamped = Least(Greatest(cos_angle, Value(-1.0)), Value(1.0))
+    return ACos(clamped, output_field=FloatField()) * Value(EARTH_RADIUS_KM)
+
+
+def places_within(lat, lng, radius_km):
+    """
+    Live cities within *radius_km* of ``(lat, lng)``, as one Geolocation
+    per city (its closest point) annotated with ``distance_km`` and
+    ordered nearest first.
+    """
+    closest = (
+        Geolocation.objects
+        .filter(city__live=True, lat_sin__isnull=False, lat_cos__isnull=False, lng_rad__isnull=False)
+        .filter(_bounding_box_q(lat, lng, radius_km))
+        .annotate(distance_km=_distance_expression(lat, lng))
+        .filter(distance_km__lte=radius_km)
+        # DISTINCT ON keeps the first row per city in this order.
+        .order_by("city_id", "distance_km")
+        .distinct("city_id")
+        .values("pk")
+    )
+    return (
+        Geolocation.objects
+        .filter(pk__in=closest)
+        .annotate(distance_km=_distance_expression(lat, lng))
+        .select_related("city")
+        .order_by("distance_km")
+    )
+
+
+def nearest_places(lat, lng, k, exclude_city=None):
+    """
+    The *k* nearest live cities to ``(lat, lng)`` as a list of
+    Geolocations annotated with ``distance_km``. Cities with several
+    geolocations are counted once, by their closest point.
+    """
+    for radius in NEAREST_RADII_KM:
+        qs = places_within(lat, lng, radius)
+        if exclude_city is not None:
+            qs = qs.exclude(city=exclude_city)
+        found = list(qs[:k])
+        if len(found) == k:
+            break
+    return found
+
+
+def origin_for(city):
+    """First geolocation of *city* with coordinates, or None."""
+    return (
+        Geolocation.objects
+        .filter(city=city, lat__isnull=False, lng__isnull=False)
+        .first()
+    )
+
+
+def _generation() -> int:
+    return cache.get_or_set(_GENERATION_KEY, 1, None)
+
+
+def invalidate_nearby_places() -> None:
+    """Invalidate every cached neighbour list at once."""
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        # Not set yet (or evicted) — nothing cached under it either.
+        pass
+
+
+def nearby_places_for(city, k=NEARBY_COUNT) -> list[dict]:
+    """
+    Cached ``[{"name", "slug", "distance_km"}, …]`` of the *k* places
+    nearest to *city*. Empty when the city has no coordinates.
+    """
+    key = f"home:nearby:{_generation()}:{city.pk}:{k}"
+    result = cache.get(key)
+    if result is None:
+        origin = origin_for(city)
+        result = []
+        if origin is not None:
+            result = [
+                {
+                    "name": geo.city.name,
+                    "slug": geo.city.slug,
+                    "distance_km": round(geo.distance_km, 1),
+                }
+                for geo in nearest_places(origin.lat, origin.lng, k, exclude_city=city)
+            ]
+        cache.set(key, result, NEARBY_CACHE_TIMEOUT)
+    return result
@@ -0,0 +1,178 @@
+"""
+Keyset ("cursor") pagination for the read-only API.
+
+``PageNumberPagination`` pays a ``COUNT(*)`` on every page and an
+``OFFSET`` that grows with the page number, so walking the whole
+catalogue gets slower the further a harvester goes. Here every page
+continues from the sort key of the previous page's last row instead:
+
+    WHERE (name > :last_name) OR (name = :last_name AND pk > :last_pk)
+    ORDER BY name, pk LIMIT 26
+
+DRF's own ``CursorPagination`` only keys on the first ordering field
+and silently drops rows whose key is NULL (``Book.name`` is nullable),
+so the cursor here carries one value per ordering term plus the pk,
+and sorts NULLs last explicitly.
+
+Clients that still send ``?page=N`` get the old page-number response.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework import filters
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _jsonable(value):
+    # Full-precision ISO timestamps: DjangoJSONEncoder cuts them to
+    # milliseconds, which would repeat rows across pages.
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPagination(BasePagination):
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    page_query_param = PageNumberPagination.page_query_param
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self._legacy = None
+        if self.page_query_param in request.query_params:
+            self._legacy = PageNumberPagination()
+            return self._legacy.paginate_queryset(queryset, request, view)
+
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.page_query_param)
+        keys = self.get_sort_keys(request, queryset, view)
+        queryset = queryset.order_by(
+            *(F(attr).desc(nulls_last=True) if descending else F(attr).asc(nulls_last=True)
+              for attr, descending in keys),
+            "pk",
+        )
+
+        position = self.decode_cursor(request, queryset.model, keys)
+        if position is not None:
+            queryset = queryset.filter(self._after(keys, position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.page = rows[: self.page_size]
+        self.next_position = None
+        if len(rows) > self.page_size:
+            last = self.page[-1]
+            self.next_position = [self._value_of(last, attr) for attr, _ in keys] + [last.pk]
+        return self.page
+
+    def get_sort_keys(self, request, queryset, view) -> list[tuple[str, bool]]:
+        """The ordering terms in effect, as ``(attr, descending)`` pairs."""
+        ordering = filters.OrderingFilter().get_ordering(request, queryset, view) or ["pk"]
+        if not all(isinstance(term, str) for term in ordering):
+            return [("pk", False)]
+        return [(term.lstrip("-"), term.startswith("-")) for term in ordering]
+
+    @staticmethod
+    def _after(keys, position) -> Q:
+        """
+        Rows sorting after *position* (one value per key, then the pk):
+        for each key, the earlier keys equal and this one beyond; or
+        every key equal and a larger pk.
+        """
+        *values, pk = position
+        alternatives, equal = [], Q()
+        for (attr, descending), value in zip(keys, values):
+            if value is None:
+                # NULLs sort last, so nothing is beyond a NULL.
+                equal &= Q(**{f"{attr}__isnull": True})
+                continue
+            beyond = "lt" if descending else "gt"
+            alternatives.append(equal & (Q(**{f"{attr}__{beyond}": value}) | Q(**{f"{attr}__isnull": True})))
+            equal &= Q(**{attr: value})
+        alternatives.append(equal & Q(pk__gt=pk))
+        return reduce(or_, alternatives)
+
+    @staticmethod
+    def _value_of(instance, attr):
+        value = instance
+        for part in attr.split("__"):
+            value = getattr(value, part, None)
+            if value is None:
+                return None
+        return value
+
+    @staticmethod
+    def _field_of(model, attr):
+        """The model field behind an ordering *attr* such as ``city__name``."""
+        field = None
+        for part in attr.split("__"):
+            field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+            model = field.related_model
+        return field
+
+    def encode_cursor(self, position) -> str:
+        raw = json.dumps([_jsonable(v) for v in position], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode("ascii")
+
+    def decode_cursor(self, request, model, keys):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            if not isinstance(position, list) or len(position) != len(keys) + 1:
+                raise ValueError(encoded)
+            # Type-check the values here, not as a 500 from the query.
+            fields = [self._field_of(model, attr) for attr, _ in keys] + [model._meta.pk]
+            return [None if value is None else field.to_python(value) for field, value in zip(fields, position)]
+        except (TypeError, ValueError, ValidationError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        if self._legacy is not None:
+            return self._legacy.get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor taken from the previous page's `next` link.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Deprecated page number; prefer following `next`.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -1,55 +1,57 @@
 """
 Defines the ordered sections of the Person detail page and which sections
 have data for a given Person. Used by the view to compute visible_sections
-once and pass it to both the TOC and the content templates.
+once and pass it to both the TOC and the content templates. The relation
+sections are decided from the lists of
+:func:`home.entity_relations.person_relations` the view already holds.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable
+from typing import Any, Callable
 
 from .models import Person
-from .templatetags.value_filters import clean_value
 
 
 @dataclass(frozen=True)
 class Section:
     slug: str
     label: str
-    has_data: Callable[[Person], bool]
+    has_data: Callable[[Person, dict[str, Any]], bool]
 
 
-def _any(*values) -> bool:
-    return any(bool(clean_value(v)) for v in values)
+def _any(p: Person, *fields) -> bool:
+    cleaned = p.cleaned
+    return any(cleaned[name] for name in fields)
 
 
-def _identity_has_data(p: Person) -> bool:
-    return _any(p.german_name, p.hebrew_name, p.pseudonym, p.gender_id,
-                p.occupations.exists())
+def _identity_has_data(p: Person, relations) -> bool:
+    return (_any(p, "german_name", "hebrew_name", "pseudonym", "gender_id")
+            or p.occupations.exists())
 
 
-def _biographical_has_data(p: Person) -> bool:
-    return _any(p.date_of_birth, p.date_of_death,
-                p.place_of_birth_id, p.place_of_death_id)
+def _biographical_has_data(p: Person, relations) -> bool:
+    return _any(p, "date_of_birth", "date_of_death",
+                "place_of_birth_id", "place_of_death_id")
 
 
-def _works_has_data(p: Person) -> bool:
-    return p.bookauthor_set.exists()
+def _works_has_data(p: Person, relations) -> bool:
+    return bool(relations["person_books_by_role"])
 
 
-def _prefaces_has_data(p: Person) -> bool:
-    return p.preface_set.exists()
+def _prefaces_has_data(p: Person, relations) -> bool:
+    return bool(relations["prefaces_by_person"])
 
 
-def _productions_has_data(p: Person) -> bool:
-    return p.production_set.exists()
+def _productions_has_data(p: Person, relations) -> bool:
+    return bool(relations["productions_by_person"])
 
 
-def _mentions_has_data(p: Person) -> bool:
-    return p.mention_set.exists()
+def _mentions_has_data(p: Person, relations) -> bool:
+    return bool(relations["mentions_of_person"])
 
 
-def _identifiers_has_data(p: Person) -> bool:
+def _identifiers_has_data(p: Person, relations) -> bool:
     return bool(p.viaf_id or p.gnd_id)
 
 
@@ -64,6 +66,6 @@ SECTIONS: list[Section] = [
 ]
 
 
-def visible_sections(person: Person) -> list[Section]:
+def visible_sections(person: Person, relations: dict[str, Any]) -> list[Section]:
     """Return SECTIONS in order, filtered to those with data for this person."""
-    return [s for s in SECTIONS if s.has_data(person)]
+    return [s for s in SECTIONS if s.has_data(person, relations)]
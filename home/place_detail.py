@@ -33,6 +33,7 @@ def _translations_has_data(ctx): return _nonempty(ctx, "translations_here")
 def _born_has_data(ctx): return _nonempty(ctx, "born_here")
 def _died_has_data(ctx): return _nonempty(ctx, "died_here")
 def _mentions_has_data(ctx): return _nonempty(ctx, "mentions_here")
+def _nearby_has_data(ctx): return _nonempty(ctx, "nearby_places")
 
 
 SECTIONS: list[Section] = [
@@ -42,6 +43,7 @@ SECTIONS: list[Section] = [
     Section("persons_born", "People born here", _born_has_data),
     Section("persons_died", "People died here", _died_has_data),
     Section("mentions", "Mentions in this city", _mentions_has_data),
+    Section("nearby", "Nearby places", _nearby_has_data),
 ]
 
 
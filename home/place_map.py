@@ -0,0 +1,190 @@
+"""
+Server-side marker clustering for the /places/ overview map.
+
+The places index used to embed one JSON marker per Geolocation in the
+HTML, so the page weight grew with every city and Leaflet had to lay
+out the whole catalogue on the client. Instead we precompute a grid
+index over ``Geolocation.lat/lng`` once: for every zoom level between
+0 and ``MAX_CLUSTER_ZOOM`` the points are bucketed into square cells
+roughly ``CELL_PX`` screen pixels wide, and each bucket collapses to a
+single weighted centroid. The map then asks
+:func:`clusters_for_viewport` for the buckets inside its current
+bounding box and zoom.
+
+The index is tiny (a few thousand tuples) and lives in the default
+cache; :mod:`home.signals` drops it whenever a City or Geolocation
+changes.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from .models import Geolocation
+
+CLUSTER_INDEX_CACHE_KEY = "home:place_map:cluster_index"
+CLUSTER_INDEX_TIMEOUT = 60 * 60 * 24
+
+# Above this zoom every place is shown as its own marker.
+MAX_CLUSTER_ZOOM = 12
+
+# Approximate width of one grid cell on screen. Leaflet tiles are 256
+# px wide and cover 360° of longitude at zoom 0.
+CELL_PX = 60
+TILE_PX = 256
+
+
+@dataclass(frozen=True)
+class Cluster:
+    lat: float
+    lng: float
+    count: int
+    # Only set for single-place buckets, where the popup links through.
+    name: str = ""
+    url: str = ""
+
+
+@dataclass(frozen=True)
+class ClusterIndex:
+    levels: dict[int, list[Cluster]]
+    # (south, west, north, east) of every indexed point, or None when
+    # no city carries coordinates yet.
+    bounds: tuple[float, float, float, float] | None
+
+    @property
+    def is_empty(self) -> bool:
+        return self.bounds is None
+
+
+def cell_size(zoom: int) -> float:
+    """Grid cell edge length in degrees at *zoom*."""
+    return 360.0 / (2 ** zoom) * CELL_PX / TILE_PX
+
+
+def _load_points() -> list[tuple[float, float, str, str]]:
+    rows = (
+        Geolocation.objects
+        .filter(city__live=True, lat__isnull=False, lng__isnull=False)
+        .values_list("lat", "lng", "city__name", "city__slug")
+    )
+    return [
+        (lat, lng, name or "", f"/places/{slug}/" if slug else "")
+        for lat, lng, name, slug in rows
+    ]
+
+
+def build_cluster_index(points=None) -> ClusterIndex:
+    """
+    Bucket every geolocated, live city into per-zoom grid cells.
+
+    *points* is an iterable of ``(lat, lng, name, url)`` tuples; when
+    omitted the rows are read from the database in a single query.
+    """
+    if points is None:
+        points = _load_points()
+    points = list(points)
+    if not points:
+        return ClusterIndex(levels={}, bounds=None)
+
+    levels: dict[int, list[Cluster]] = {}
+    for zoom in range(MAX_CLUSTER_ZOOM + 1):
+        size = cell_size(zoom)
+        # cell -> [count, sum_lat, sum_lng, first_point]
+        cells: dict[tuple[int, int], list] = {}
+        for point in points:
+            lat, lng = point[0], point[1]
+            key = (math.floor(lng / size), math.floor(lat / size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [1, lat, lng, point]
+            else:
+                bucket[0] += 1
+                bucket[1] += lat
+                bucket[2] += lng
+        levels[zoom] = [
+            Cluster(lat=first[0], lng=first[1], count=1, name=first[2], url=first[3])
+            if count == 1
+            else Cluster(lat=sum_lat / count, lng=sum_lng / count, count=count)
+            for count, sum_lat, sum_lng, first in cells.values()
+        ]
+
+    lats = [p[0] for p in points]
+    lngs = [p[1] for p in points]
+    return ClusterIndex(levels=levels, bounds=(min(lats), min(lngs), max(lats), max(lngs)))
+
+
+def get_cluster_index() -> ClusterIndex:
+    """Return the cached index, rebuilding it on a cache miss."""
+    index = cache.get(CLUSTER_INDEX_CACHE_KEY)
+    if index is None:
+        index = build_cluster_index()
+        cache.set(CLUSTER_INDEX_CACHE_KEY, index, CLUSTER_INDEX_TIMEOUT)
+    return index
+
+
+def invalidate_cluster_index() -> None:
+    cache.delete(CLUSTER_INDEX_CACHE_KEY)
+
+
+def parse_bbox(raw: str) -> tuple[float, float, float, float] | None:
+    """
+    Parse a Leaflet ``map.getBounds().toBBoxString()`` value
+    (``west,south,east,north``). Returns None for anything malformed
+    so the caller can fall back to the whole world.
+    """
+    try:
+        west, south, east, north = (float(part) for part in raw.split(","))
+    except (AttributeError, ValueError):
+        return None
+    if not all(math.isfinite(v) for v in (west, south, east, north)):
+        return None
+    return west, south, east, north
+
+
+def _in_bbox(cluster: Cluster, bbox) -> bool:
+    west, south, east, north = bbox
+    if not south <= cluster.lat <= north:
+        return False
+    if east - west >= 360:
+        return True
+    # Normalise into [-180, 180) so a viewport panned past the
+    # antimeridian still matches.
+    west = (west + 180) % 360 - 180
+    east = (east + 180) % 360 - 180
+    if west <= east:
+        return west <= cluster.lng <= east
+    return cluster.lng >= west or cluster.lng <= east
+
+
+def clusters_for_viewport(zoom: int, bbox=None, index: ClusterIndex | None = None) -> dict:
+    """
+    Return a GeoJSON FeatureCollection with the clusters of *zoom*
+    that fall inside *bbox* (``west, south, east, north``). Each
+    feature carries ``count``; single places also carry ``name`` and
+    ``url``.
+    """
+    if index is None:
+        index = get_cluster_index()
+    zoom = max(0, min(int(zoom), MAX_CLUSTER_ZOOM))
+
+    features = []
+    for cluster in index.levels.get(zoom, []):
+        if bbox is not None and not _in_bbox(cluster, bbox):
+            continue
+        properties = {"count": cluster.count}
+        if cluster.count == 1:
+            properties["name"] = cluster.name
+            properties["url"] = cluster.url
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [cluster.lng, cluster.lat]},
+            "properties": properties,
+        })
+
+    collection = {"type": "FeatureCollection", "features": features}
+    if index.bounds is not None:
+        south, west, north, east = index.bounds
+        collection["bbox"] = [west, south, east, north]
+    return collection
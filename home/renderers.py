@@ -0,0 +1,31 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def ndjson_line(item) -> str:
+    """One newline-terminated JSON document."""
+    return json.dumps(item, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON (``?format=ndjson``): one record per line.
+
+    A paginated list renders only its ``results``; ``&all=1`` bypasses
+    this renderer and streams the whole result set, see
+    ``ReadOnlyBaseViewSet.list``.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = data["results"]
+        items = data if isinstance(data, list) else [data]
+        return "".join(ndjson_line(item) for item in items).encode(self.charset)
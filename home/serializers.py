@@ -31,172 +31,255 @@ from .models import (
     Preface,
     Production,
 )
-
-
-class LanguageSerializer(serializers.ModelSerializer):
+from .taxonomy_counts import live_counts
+
+# Columns a "?view=summary" falls back to when a serializer's Meta does
+# not list its own summary_fields (the primary key is always added).
+DEFAULT_SUMMARY_FIELDS = ("name", "title", "pref_label", "slug")
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that can be narrowed to a subset of its fields.
+
+    ``fields`` keeps only the named fields; ``summary=True`` keeps
+    ``Meta.summary_fields`` and renders the remaining relations as
+    primary keys instead of nested objects. Both come from the
+    ``?fields=`` / ``?view=summary`` query parameters, see
+    ``home.api.ReadOnlyBaseViewSet``.
+    """
+
+    def __init__(self, *args, fields=None, summary=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        if summary and fields is None:
+            fields = self.summary_field_names()
+        if fields is not None:
+            keep = set(fields)
+            unknown = sorted(keep - set(self.fields))
+            if unknown:
+                raise serializers.ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown)}."]})
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+        if summary:
+            for name, field in list(self.fields.items()):
+                if isinstance(field, serializers.ListSerializer):
+                    self.fields[name] = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+                elif isinstance(field, serializers.BaseSerializer):
+                    self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    @classmethod
+    def summary_field_names(cls) -> list[str]:
+        model = cls.Meta.model
+        names = getattr(cls.Meta, "summary_fields", None)
+        if names is None:
+            concrete = {f.name for f in model._meta.concrete_fields}
+            names = [name for name in DEFAULT_SUMMARY_FIELDS if name in concrete]
+        pk_name = model._meta.pk.name
+        return [pk_name, *(name for name in names if name != pk_name)]
+
+
+class LiveCountField(serializers.ReadOnlyField):
+    """
+    A term's live book / person count from :mod:`home.taxonomy_counts`.
+    The cached counts are looked up once per serializer context, not
+    once per row.
+    """
+
+    def __init__(self, count, **kwargs):
+        super().__init__(source="*", **kwargs)
+        self.count = count
+
+    def to_representation(self, instance):
+        model = type(instance)
+        counts = self.context.setdefault("live_counts", {})
+        if model not in counts:
+            counts[model] = live_counts(model)
+        return counts[model].get(instance.pk, {}).get(self.count, 0)
+
+
+class LanguageSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Language
         fields = "__all__"
 
 
-class CitySerializer(serializers.ModelSerializer):
+class CitySerializer(SparseFieldsetSerializer):
     class Meta:
         model = City
         fields = "__all__"
+        summary_fields = ("name", "slug")
 
 
-class GeolocationSerializer(serializers.ModelSerializer):
+class GeolocationSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Geolocation
         fields = "__all__"
+        summary_fields = ("city", "lat", "lng")
 
 
-class GenderSerializer(serializers.ModelSerializer):
+class GenderSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Gender
         fields = "__all__"
 
 
-class OccupationSerializer(serializers.ModelSerializer):
+class OccupationSerializer(SparseFieldsetSerializer):
+    person_count = LiveCountField("person_count")
+
     class Meta:
         model = Occupation
         fields = "__all__"
 
 
-class PersonSerializer(serializers.ModelSerializer):
+class PersonSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Person
         fields = "__all__"
+        summary_fields = ("pref_label", "german_name", "hebrew_name", "slug")
         depth = 1  # Resolve gender, places, occupations as well
 
 
-class PublisherSerializer(serializers.ModelSerializer):
+class PublisherSerializer(SparseFieldsetSerializer):
+    book_count = LiveCountField("book_count")
+    original_book_count = LiveCountField("original_book_count")
+
     class Meta:
         model = Publisher
         fields = "__all__"
 
 
-class SeriesSerializer(serializers.ModelSerializer):
+class SeriesSerializer(SparseFieldsetSerializer):
+    book_count = LiveCountField("book_count")
+
     class Meta:
         model = Series
         fields = "__all__"
 
 
-class TopicSerializer(serializers.ModelSerializer):
+class TopicSerializer(SparseFieldsetSerializer):
+    book_count = LiveCountField("book_count")
+
     class Meta:
         model = Topic
         fields = "__all__"
 
 
-class AlignmentSerializer(serializers.ModelSerializer):
+class AlignmentSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Alignment
         fields = "__all__"
 
 
-class FontSerializer(serializers.ModelSerializer):
+class FontSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Font
         fields = "__all__"
 
 
-class TargetAudienceSerializer(serializers.ModelSerializer):
+class TargetAudienceSerializer(SparseFieldsetSerializer):
     class Meta:
         model = TargetAudience
         fields = "__all__"
 
 
-class TypographySerializer(serializers.ModelSerializer):
+class TypographySerializer(SparseFieldsetSerializer):
     class Meta:
         model = Typography
         fields = "__all__"
 
 
-class DateFormatSerializer(serializers.ModelSerializer):
+class DateFormatSerializer(SparseFieldsetSerializer):
     class Meta:
         model = DateFormat
         fields = "__all__"
 
 
-class TextualModelSerializer(serializers.ModelSerializer):
+class TextualModelSerializer(SparseFieldsetSerializer):
     class Meta:
         model = TextualModel
         fields = "__all__"
 
 
-class LanguageCountSerializer(serializers.ModelSerializer):
+class LanguageCountSerializer(SparseFieldsetSerializer):
     class Meta:
         model = LanguageCount
         fields = "__all__"
 
 
-class FootnoteLocationSerializer(serializers.ModelSerializer):
+class FootnoteLocationSerializer(SparseFieldsetSerializer):
     class Meta:
         model = FootnoteLocation
         fields = "__all__"
 
 
-class OriginalTypeSerializer(serializers.ModelSerializer):
+class OriginalTypeSerializer(SparseFieldsetSerializer):
     class Meta:
         model = OriginalType
         fields = "__all__"
 
 
-class TranslationTypeSerializer(serializers.ModelSerializer):
+class TranslationTypeSerializer(SparseFieldsetSerializer):
     class Meta:
         model = TranslationType
         fields = "__all__"
 
 
-class MentionDescriptionSerializer(serializers.ModelSerializer):
+class MentionDescriptionSerializer(SparseFieldsetSerializer):
     class Meta:
         model = MentionDescription
         fields = "__all__"
 
 
-class ProductionRoleSerializer(serializers.ModelSerializer):
+class ProductionRoleSerializer(SparseFieldsetSerializer):
     class Meta:
         model = ProductionRole
         fields = "__all__"
 
 
-class EditionSerializer(serializers.ModelSerializer):
+class EditionSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Edition
         fields = "__all__"
+        summary_fields = ("name", "book", "year")
         depth = 1
 
 
-class TranslationSerializer(serializers.ModelSerializer):
+class TranslationSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Translation
         fields = "__all__"
+        summary_fields = ("title", "book", "language", "year")
         depth = 1
 
 
-class MentionSerializer(serializers.ModelSerializer):
+class MentionSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Mention
         fields = "__all__"
+        summary_fields = ("book", "mentionee", "mentionee_city")
         depth = 1
 
 
-class PrefaceSerializer(serializers.ModelSerializer):
+class PrefaceSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Preface
         fields = "__all__"
+        summary_fields = ("title", "book", "writer")
         depth = 1
 
 
-class ProductionSerializer(serializers.ModelSerializer):
+class ProductionSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Production
         fields = "__all__"
+        summary_fields = ("book", "producer", "role")
         depth = 1
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Book
         fields = "__all__"
+        summary_fields = ("name", "slug", "gregorian_year", "hebrew_year_of_publication", "bundle")
         depth = 1  # Include languages, authors, places, etc.
@@ -0,0 +1,138 @@
+"""
+Model signal receivers for the ``home`` app.
+
+Connected from :meth:`home.apps.HomeConfig.ready`. Each receiver keeps
+a piece of derived, cached state in step with the rows it is built
+from.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from wagtail.signals import page_published, page_unpublished, published, unpublished
+
+from . import entity_relations, stats
+from .models import (
+    Book, BookAuthor, City, Edition, Geolocation, Mention, Person, Preface, Production, SlugAlias,
+    Translation,
+)
+from .nearby import invalidate_nearby_places
+from .place_map import invalidate_cluster_index
+from .sitemaps import SECTION_FOR_MODEL, refresh_on_commit
+from .slug_aliases import ALIASED_MODELS, add_alias
+from .taxonomy_counts import COUNTED_BY, COUNTS, invalidate_taxonomy_counts
+
+
+@receiver([post_save, post_delete], sender=Geolocation)
+@receiver([post_save, post_delete], sender=City)
+def drop_place_geo_caches(sender, **kwargs):
+    """Coordinates, names, slugs or live state changed → re-cluster."""
+    invalidate_cluster_index()
+    invalidate_nearby_places()
+
+
+def remember_replaced_slug(sender, instance, raw=False, **kwargs):
+    """A saved object's slug changed → keep the old one as a redirect."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    old = sender._default_manager.filter(pk=instance.pk).values_list("slug", flat=True).first()
+    if old and old != instance.slug:
+        add_alias(sender, old, instance.pk)
+
+
+def drop_slug_aliases(sender, instance, **kwargs):
+    """The object is gone → so are the redirects to it."""
+    SlugAlias.objects.filter(model=sender._meta.label_lower, target_pk=str(instance.pk)).delete()
+
+
+for _model in ALIASED_MODELS:
+    pre_save.connect(remember_replaced_slug, sender=_model)
+    post_delete.connect(drop_slug_aliases, sender=_model)
+
+
+@receiver([page_published, page_unpublished])
+def refresh_page_sitemap(sender, **kwargs):
+    """A Wagtail page went live or was withdrawn → rewrite its sitemap pages."""
+    refresh_on_commit("pages")
+
+
+def refresh_entity_sitemap(sender, **kwargs):
+    """A book / person / place was (un)published → rewrite its sitemap pages."""
+    refresh_on_commit(SECTION_FOR_MODEL[sender])
+
+
+for _model in SECTION_FOR_MODEL:
+    published.connect(refresh_entity_sitemap, sender=_model)
+    unpublished.connect(refresh_entity_sitemap, sender=_model)
+
+
+def refresh_entity_relations(sender, instance, raw=False, update_fields=None, **kwargs):
+    """A source row was saved → rebuild the place / person page entries it feeds."""
+    if not raw:
+        entity_relations.refresh(instance, update_fields=update_fields)
+
+
+def forget_entity_relations(sender, instance, **kwargs):
+    """A book or person is going away → drop its place page entries."""
+    entity_relations.forget(instance)
+
+
+for _model in (Book, Person, Edition, Translation, Mention, Preface, Production, BookAuthor):
+    post_save.connect(refresh_entity_relations, sender=_model)
+for _model in (Book, Person):
+    pre_delete.connect(forget_entity_relations, sender=_model)
+
+
+def drop_taxonomy_counts(sender, **kwargs):
+    """A book or person went live, was withdrawn or deleted → recount its terms."""
+    invalidate_taxonomy_counts(*COUNTED_BY[sender.__name__])
+
+
+def drop_own_taxonomy_counts(sender, **kwargs):
+    """A term was added, renamed or deleted → rebuild its index list."""
+    invalidate_taxonomy_counts(sender)
+
+
+for _model in (Book, Person):
+    for _signal in (published, unpublished, post_delete):
+        _signal.connect(drop_taxonomy_counts, sender=_model)
+for _model in COUNTS:
+    post_save.connect(drop_own_taxonomy_counts, sender=_model)
+    post_delete.connect(drop_own_taxonomy_counts, sender=_model)
+
+
+def recount_stats(sender, instance, raw=False, update_fields=None, **kwargs):
+    """A book or person was saved → move it between the statistics counters."""
+    if not raw:
+        stats.update(instance, update_fields=update_fields)
+
+
+def uncount_stats(sender, instance, **kwargs):
+    """A book or person was deleted → take it out of the statistics counters."""
+    stats.update(instance, deleted=True)
+
+
+def recount_stats_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """A book's languages or a person's occupations changed → recount the objects concerned."""
+    if not reverse:
+        if action.startswith("post_"):
+            stats.update(instance)
+        return
+    # instance is the Language / Occupation; model the Book / Person.
+    field = STATS_M2M[sender]
+    if action == "pre_clear":
+        instance._stats_cleared = list(model.objects.filter(**{field: instance}).values_list("pk", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_stats_cleared", ())
+    elif action not in ("post_add", "post_remove"):
+        return
+    for obj in model.objects.filter(pk__in=pk_set):
+        stats.update(obj)
+
+
+STATS_M2M = {Book.languages.through: "languages", Person.occupations.through: "occupations"}
+
+for _model in (Book, Person):
+    post_save.connect(recount_stats, sender=_model)
+    post_delete.connect(uncount_stats, sender=_model)
+for _through in STATS_M2M:
+    m2m_changed.connect(recount_stats_m2m, sender=_through)
@@ -1,11 +1,48 @@
 # home/sitemaps.py
+"""
+XML sitemaps: an index at ``/sitemap.xml`` pointing at per-type pages
+``/sitemaps/<section>-<n>.xml`` of at most :data:`SITEMAP_PAGE_SIZE`
+URLs each.
+
+The entity sections read only ``slug`` and ``updated_at`` and give
+every URL a ``<lastmod>``. :func:`write_sitemaps` renders the index and
+every page into ``HASKALA_SITEMAP_ROOT`` (``STATIC_ROOT/sitemaps``),
+each with a gzip sibling, so nginx serves them as files. It runs from
+``manage.py write_sitemaps`` and, once the files exist, after each
+publish / unpublish (:func:`refresh_on_commit`). The views in
+``home.views`` render the same documents on the fly when the files are
+missing (dev, or before the first run).
+"""
+from __future__ import annotations
+
+import gzip
+import os
+import tempfile
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Max
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.functional import cached_property
 
 from .models import Book, Person, City, HomePage, ContactPage, StaticPage
 
 from wagtail.models import Page
 
+# The protocol allows 50,000 URLs / 50 MB per file; smaller pages keep
+# a single regeneration cheap and the files quick to fetch.
+SITEMAP_PAGE_SIZE = 10_000
+
+INDEX_FILENAME = "sitemap.xml"
+
 
 class StaticViewSitemap(Sitemap):
     """
@@ -30,52 +67,69 @@ class StaticViewSitemap(Sitemap):
         return reverse(item)
 
 
-class BookSitemap(Sitemap):
+class EntitySitemap(Sitemap):
     """
-    All book detail pages (/books/<title>/)
+    Live rows of ``model`` with a slug, as ``(slug, updated_at)`` tuples
+    ordered by the unique slug index so pages are stable.
     """
+    model = None
+    url_name = None
     changefreq = "monthly"
-    priority = 0.8
+    limit = SITEMAP_PAGE_SIZE
+
+    def queryset(self):
+        return self.model.objects.filter(live=True, slug__gt="")
+
+    @cached_property
+    def paginator(self):
+        # Django builds a new Paginator (and COUNT query) on every access.
+        return Paginator(self._items(), self.limit)
 
     def items(self):
-        return Book.objects.filter(live=True)
+        return self.queryset().order_by("slug").values_list("slug", "updated_at", named=True)
 
-    def lastmod(self, obj):
-        # created_at / updated_at are available on the Book model
-        return obj.updated_at
+    def lastmod(self, item):
+        return item.updated_at
 
-    def location(self, obj):
-        return reverse("book-detail", kwargs={"slug": obj.slug})
+    @cached_property
+    def _url_template(self):
+        # One reverse() per sitemap instead of one per URL.
+        return reverse(self.url_name, kwargs={"slug": "__slug__"})
+
+    def location(self, item):
+        return self._url_template.replace("__slug__", item.slug)
 
+    def get_latest_lastmod(self):
+        # Django's default evaluates lastmod() over every item.
+        return self.queryset().aggregate(latest=Max("updated_at"))["latest"]
 
-class PersonSitemap(Sitemap):
+
+class BookSitemap(EntitySitemap):
     """
-    All person detail pages (/persons/<uuid>/)
+    All book detail pages (/books/<slug>/)
     """
-    changefreq = "monthly"
-    priority = 0.6
+    model = Book
+    url_name = "book-detail"
+    priority = 0.8
 
-    def items(self):
-        return Person.objects.filter(live=True)
 
-    def location(self, obj):
-        return reverse("person-detail", kwargs={"slug": obj.slug})
+class PersonSitemap(EntitySitemap):
+    """
+    All person detail pages (/persons/<slug>/)
+    """
+    model = Person
+    url_name = "person-detail"
+    priority = 0.6
 
 
-class PlaceSitemap(Sitemap):
+class PlaceSitemap(EntitySitemap):
     """
     All place/city detail pages (/places/<slug>/)
-    Slug is generated from City.name via slugify - same as in _get_place_by_slug().
     """
-    changefreq = "monthly"
+    model = City
+    url_name = "place-detail"
     priority = 0.6
 
-    def items(self):
-        return City.objects.filter(live=True)
-
-    def location(self, obj):
-        return reverse("place-detail", kwargs={"slug": obj.slug})
-
 
 class WagtailPageSitemap(Sitemap):
     """
@@ -99,3 +153,143 @@ class WagtailPageSitemap(Sitemap):
     def location(self, obj):
         # wagtail Page has .url
         return obj.url
+
+
+# section name -> sitemap class, in index order
+SITEMAPS = {
+    "static": StaticViewSitemap,
+    "pages": WagtailPageSitemap,
+    "books": BookSitemap,
+    "persons": PersonSitemap,
+    "places": PlaceSitemap,
+}
+
+# snippet model -> the section listing it
+SECTION_FOR_MODEL = {Book: "books", Person: "persons", City: "places"}
+
+
+def page_filename(section, page):
+    return f"{section}-{page}.xml"
+
+
+def _site(base_url):
+    """The ``(site, protocol)`` pair ``Sitemap.get_urls`` expects, from a base URL."""
+    parts = urlsplit(base_url)
+    return SimpleNamespace(domain=parts.netloc), parts.scheme or "https"
+
+
+def _render_page(sitemap, page, base_url):
+    site, protocol = _site(base_url)
+    urls = sitemap.get_urls(page=page, site=site, protocol=protocol)
+    return render_to_string("sitemap.xml", {"urlset": urls})
+
+
+def render_page(section, page, base_url):
+    """
+    Page *page* of *section* as XML. Raises ``KeyError`` for an unknown
+    section and ``django.core.paginator.InvalidPage`` past the last page.
+    """
+    return _render_page(SITEMAPS[section](), page, base_url)
+
+
+def render_index(base_url):
+    """The sitemap index: one entry per section page."""
+    base_url = base_url.rstrip("/")
+    entries = []
+    for section, sitemap_class in SITEMAPS.items():
+        sitemap = sitemap_class()
+        lastmod = sitemap.get_latest_lastmod()
+        for page in sitemap.paginator.page_range:
+            path = reverse("sitemap-page", kwargs={"section": section, "page": page})
+            entries.append(SitemapIndexItem(f"{base_url}{path}", lastmod))
+    return render_to_string("sitemap_index.xml", {"sitemaps": entries})
+
+
+def _write(path, content):
+    """Atomically replace *path* and its ``.gz`` sibling."""
+    data = content.encode("utf-8")
+    for target, payload in ((Path(f"{path}.gz"), gzip.compress(data, mtime=0)), (Path(path), data)):
+        # A temp name of its own per call: workers publishing at the same
+        # time must not write into, or rename away, each other's file.
+        tmp = tempfile.NamedTemporaryFile(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False)
+        try:
+            with tmp:
+                tmp.write(payload)
+            # mkstemp creates 0600; nginx reads these as another user.
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, target)
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+
+def write_sitemaps(sections=None, root=None, base_url=None):
+    """
+    Render the pages of *sections* (default: all) and the index into
+    *root*. The index is written after the pages and before page files
+    left over from a section that shrank are dropped, so it never
+    points at a missing page.
+    Returns the number of files written (without the ``.gz`` copies).
+    """
+    root = Path(root or settings.HASKALA_SITEMAP_ROOT)
+    base_url = base_url or settings.HASKALA_SITEMAP_BASE_URL
+    root.mkdir(parents=True, exist_ok=True)
+
+    written, stale = 0, []
+    for section in sections or SITEMAPS:
+        sitemap = SITEMAPS[section]()
+        current = set()
+        for page in sitemap.paginator.page_range:
+            name = page_filename(section, page)
+            _write(root / name, _render_page(sitemap, page, base_url))
+            current.add(name)
+            written += 1
+        stale += [path for path in root.glob(f"{section}-*.xml") if path.name not in current]
+
+    _write(root / INDEX_FILENAME, render_index(base_url))
+    for path in stale:
+        path.unlink()
+        Path(f"{path}.gz").unlink(missing_ok=True)
+    return written + 1
+
+
+def sitemaps_on_disk():
+    return (Path(settings.HASKALA_SITEMAP_ROOT) / INDEX_FILENAME).exists()
+
+
+# Attribute on the (per-thread) connection holding the sections
+# refreshed by the commit in progress; see refresh_on_commit().
+_REFRESHED_ATTR = "haskala_sitemap_sections"
+
+
+def _refresh_section(connection, refreshed, section):
+    # The first callback of a commit detaches the set, so the next
+    # transaction starts a new one; the later callbacks of this commit
+    # still share it.
+    if getattr(connection, _REFRESHED_ATTR, None) is refreshed:
+        setattr(connection, _REFRESHED_ATTR, None)
+    if section in refreshed:
+        return
+    refreshed.add(section)
+    write_sitemaps([section])
+
+
+def refresh_on_commit(section):
+    """
+    Re-render *section* once the current transaction commits. Several
+    publishes in one transaction share a single rewrite. No-op until
+    ``write_sitemaps`` has produced the files at least once.
+
+    Every publish queues a callback and the callbacks skip sections
+    already rewritten by the same commit. Nothing is skipped when
+    queuing, so a rolled-back block, whose callbacks Django drops,
+    cannot hold back a later refresh.
+    """
+    if not sitemaps_on_disk():
+        return
+    connection = transaction.get_connection()
+    refreshed = getattr(connection, _REFRESHED_ATTR, None)
+    if refreshed is None:
+        refreshed = set()
+        setattr(connection, _REFRESHED_ATTR, refreshed)
+    transaction.on_commit(partial(_refresh_section, connection, refreshed, section))
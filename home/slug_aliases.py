@@ -0,0 +1,87 @@
+"""
+Permanent redirects from slugs that no longer address an object.
+
+The taxonomy detail views used to fall back to iterating the whole
+Topic / Publisher / Series / Occupation table and comparing
+``slugify(name)`` with the requested slug whenever the ``slug`` column
+did not match, so every crawler probe or stale bookmark cost a table
+scan. Old slugs now live in the indexed :class:`~home.models.SlugAlias`
+table instead:
+
+- migration 0037 records the legacy ``slugify(name)`` forms and the
+  pre-0029 Book / Person / City slugs,
+- :func:`home.signals.remember_replaced_slug` records a slug whenever
+  an object is saved under a new one.
+
+:func:`redirect_old_slugs` wraps a detail view: when the view raises
+``Http404`` the slug is looked up in the alias table (one indexed
+query) and, on a hit, answered with a 301 to the object's current URL.
+"""
+from __future__ import annotations
+
+from functools import wraps
+
+from django.http import Http404, HttpResponsePermanentRedirect
+from django.urls import reverse
+
+from .models import Book, City, Occupation, Person, Publisher, Series, SlugAlias, Topic
+
+# model -> (detail URL name, slug URL kwarg)
+ALIASED_MODELS = {
+    Book: ("book-detail", "slug"),
+    Person: ("person-detail", "slug"),
+    City: ("place-detail", "slug"),
+    Topic: ("topic-detail", "topic_slug"),
+    Publisher: ("publisher-detail", "publisher_slug"),
+    Occupation: ("occupation-detail", "occupation_slug"),
+    Series: ("series-detail", "series_slug"),
+}
+
+
+def add_alias(model, slug, target_pk):
+    """Make *slug* redirect to the *model* row *target_pk* (the newest owner wins)."""
+    SlugAlias.objects.update_or_create(
+        model=model._meta.label_lower, slug=slug, defaults={"target_pk": str(target_pk)},
+    )
+
+
+def current_slug_for(model, slug):
+    """
+    The current slug of the object *slug* used to address, or ``None``
+    (also when that object is an unpublished draft).
+    """
+    target = (
+        SlugAlias.objects.filter(model=model._meta.label_lower, slug=slug)
+        .values_list("target_pk", flat=True)
+        .first()
+    )
+    if target is None:
+        return None
+    objects = model._default_manager.filter(pk=target)
+    if any(field.name == "live" for field in model._meta.concrete_fields):
+        objects = objects.filter(live=True)
+    return objects.values_list("slug", flat=True).first()
+
+
+def redirect_old_slugs(model):
+    """Decorator for a *model* detail view: 301 from aliased slugs."""
+    url_name, kwarg = ALIASED_MODELS[model]
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            try:
+                return view(request, *args, **kwargs)
+            except Http404:
+                slug = kwargs.get(kwarg)
+                current = current_slug_for(model, slug) if slug else None
+                if not current or current == slug:
+                    raise
+            url = reverse(url_name, kwargs={**kwargs, kwarg: current})
+            if request.GET:
+                url = f"{url}?{request.GET.urlencode()}"
+            return HttpResponsePermanentRedirect(url)
+
+        return wrapped
+
+    return decorator
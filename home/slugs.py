@@ -0,0 +1,143 @@
+"""
+Slug allocation for the slugged catalogue models.
+
+``generate_unique_slug`` used to probe ``base``, ``base-2``,
+``base-3`` … with one ``.exists()`` query each. Frequent names and the
+``person-<uuid>`` fallback of Hebrew-only names collide many times over,
+so a backfill or a bulk import cost O(n²) queries. Here every slug
+already taken under a base — the base itself and ``base-<n>`` — is
+fetched in one query and the next free suffix is picked in memory;
+:meth:`SlugAllocator.assign` does the same for thousands of new rows
+with one query per batch of bases.
+"""
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Bases looked up per query in SlugAllocator.assign().
+PREFIX_BATCH = 200
+
+_FREE = object()
+
+# Non-Latin Unicode ranges we drop from a slug source before
+# transliteration kicks in. Hebrew, Arabic and CJK don't have useful
+# ASCII transliterations for our use case — anyascii produces stubs
+# like "hrn-yvsf" for "אהרן, יוסף" that read as random consonant
+# noise next to the actual Latin name. Stripping them up front leaves
+# only the Latin parts ("Aaron, Joseph Philipp"), which anyascii can
+# then normalise to ASCII for diacritics like umlauts.
+_NON_LATIN_SCRIPT_RANGES = (
+    (0x0370, 0x03FF),   # Greek
+    (0x0400, 0x04FF),   # Cyrillic
+    (0x0500, 0x052F),   # Cyrillic Supplement
+    (0x0530, 0x058F),   # Armenian
+    (0x0590, 0x05FF),   # Hebrew
+    (0x0600, 0x06FF),   # Arabic
+    (0x0700, 0x074F),   # Syriac
+    (0x0750, 0x077F),   # Arabic Supplement
+    (0x0780, 0x07BF),   # Thaana
+    (0x0900, 0x097F),   # Devanagari
+    (0x4E00, 0x9FFF),   # CJK Unified Ideographs
+    (0x3040, 0x309F),   # Hiragana
+    (0x30A0, 0x30FF),   # Katakana
+    (0xAC00, 0xD7AF),   # Hangul syllables
+)
+
+
+def _strip_non_latin_script(value: str) -> str:
+    """Remove characters from non-Latin Unicode scripts."""
+    if not value:
+        return ""
+    out_chars = []
+    for ch in value:
+        cp = ord(ch)
+        if any(lo <= cp <= hi for lo, hi in _NON_LATIN_SCRIPT_RANGES):
+            continue
+        out_chars.append(ch)
+    return "".join(out_chars)
+
+
+def slug_base(instance, value) -> str:
+    """
+    The undecorated slug for *instance*: non-Latin scripts stripped,
+    anyascii'd and slugified, or ``<modelclass>-<short pk>`` when
+    nothing is left.
+    """
+    from anyascii import anyascii
+
+    base = slugify(anyascii(_strip_non_latin_script(value or "")))
+    if not base:
+        short_id = str(instance.pk or "")[:8]
+        base = f"{instance.__class__.__name__.lower()}-{short_id}".strip("-")
+    return base
+
+
+def next_free_slug(base, taken) -> str:
+    """*base*, or the first ``base-<n>`` (n ≥ 2) not in *taken*."""
+    if base not in taken:
+        return base
+    i = 2
+    while f"{base}-{i}" in taken:
+        i += 1
+    return f"{base}-{i}"
+
+
+class SlugAllocator:
+    """
+    Hands out unique slugs for one model, remembering every slug it has
+    seen or allocated, so a run of allocations costs one query per
+    distinct base at most (one per :data:`PREFIX_BATCH` bases with
+    :meth:`assign`).
+    """
+
+    def __init__(self, model, field="slug"):
+        self.model = model
+        self.field = field
+        # slug -> pk of its owner (None for slugs handed to unsaved rows)
+        self._owners: dict[str, object] = {}
+        self._loaded: set[str] = set()
+
+    def allocate(self, instance, value) -> str:
+        """A unique slug for *instance* built from *value*."""
+        base = slug_base(instance, value)
+        self._load([base])
+        return self._claim(instance, base)
+
+    def assign(self, instances, source):
+        """
+        Set a unique slug on every instance in *instances* that has
+        none, built from ``source(instance)``; instances whose source is
+        ``None`` are left alone. Slugs are handed out in the given order.
+        """
+        todo = []
+        for instance in instances:
+            if getattr(instance, self.field):
+                continue
+            value = source(instance)
+            if value is not None:
+                todo.append((instance, slug_base(instance, value)))
+        self._load(base for _, base in todo)
+        for instance, base in todo:
+            setattr(instance, self.field, self._claim(instance, base))
+
+    def _load(self, bases):
+        missing = sorted(set(bases) - self._loaded)
+        for start in range(0, len(missing), PREFIX_BATCH):
+            batch = missing[start:start + PREFIX_BATCH]
+            query = Q()
+            for base in batch:
+                query |= Q(**{self.field: base}) | Q(**{f"{self.field}__startswith": f"{base}-"})
+            self._owners.update(self.model.objects.filter(query).values_list(self.field, "pk"))
+            self._loaded.update(batch)
+
+    def _claim(self, instance, base):
+        def free(slug):
+            owner = self._owners.get(slug, _FREE)
+            # A row may keep its own slug; unsaved rows (pk None) own nothing.
+            return owner is _FREE or (owner is not None and owner == instance.pk)
+
+        slug, i = base, 2
+        while not free(slug):
+            slug = f"{base}-{i}"
+            i += 1
+        self._owners[slug] = instance.pk
+        return slug
@@ -0,0 +1,218 @@
+"""
+Catalogue statistics: live books per decade, language, publication
+place and bundle, the digitized share, and live persons per
+occupation.
+
+Aggregating these over the wide Book table on every request is slow,
+so they live in rollup counters (:class:`~home.models.StatsCount`).
+Each live book or person is recorded in
+:class:`~home.models.StatsMembership` with the counters it is counted
+in. When one changes, :func:`update` compares its current counters
+with the recorded ones and moves it: one ``+1`` and one ``-1``
+``UPDATE`` over the counters that differ. The cost of a change does
+not depend on the size of the catalogue.
+
+:mod:`home.signals` calls :func:`update` on Book / Person saves and
+deletes and on changes to their languages / occupations. Bulk writes
+and vocabulary deletes bypass those signals; ``import_haskala_all``
+ends with :func:`rebuild`, and ``manage.py rebuild_stats`` runs it by
+hand.
+
+:func:`summary` reads the counters into the dict behind ``/api/stats/``
+and ``/stats/``, cached until the next change.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter, defaultdict
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+from django.apps import apps as global_apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import BUNDLE_CHOICES, City, Language, Occupation, StatsCount, StatsMembership
+
+Dimension = StatsCount.Dimension
+
+BATCH_SIZE = 1000
+SUMMARY_CACHE_KEY = "home:stats:summary"
+SUMMARY_TIMEOUT = 60 * 60 * 24
+
+# What digital_books_list_view counts as a digitized book.
+DIGITAL_URL = re.compile(r"^https?://")
+
+# Columns the counters are derived from; saves that touch none of
+# them (e.g. Wagtail's draft bookkeeping) leave the counters alone.
+BOOK_COLUMNS = ("live", "gregorian_year", "publication_place_id", "bundle", "digital_book_url")
+PERSON_COLUMNS = ("live",)
+
+
+def book_facts(row, language_ids) -> set[tuple[str, str]]:
+    """The ``(dimension, key)`` counters a book with these columns is counted in."""
+    if not row["live"]:
+        return set()
+    year = row["gregorian_year"]
+    facts = {
+        (Dimension.BOOKS.value, ""),
+        (Dimension.DECADE.value, str(year // 10 * 10) if year else ""),
+        (Dimension.PLACE.value, str(row["publication_place_id"] or "")),
+        (Dimension.BUNDLE.value, row["bundle"] or ""),
+        (Dimension.DIGITIZED.value, "yes" if DIGITAL_URL.match(row["digital_book_url"] or "") else "no"),
+    }
+    facts.update((Dimension.LANGUAGE.value, str(pk)) for pk in language_ids or [""])
+    return facts
+
+
+def person_facts(row, occupation_ids) -> set[tuple[str, str]]:
+    """The ``(dimension, key)`` counters a person with these columns is counted in."""
+    if not row["live"]:
+        return set()
+    facts = {(Dimension.PERSONS.value, "")}
+    facts.update((Dimension.OCCUPATION.value, str(pk)) for pk in occupation_ids or [""])
+    return facts
+
+
+# model name -> (columns, many-to-many field, facts function)
+SOURCES = {
+    "Book": (BOOK_COLUMNS, "languages", book_facts),
+    "Person": (PERSON_COLUMNS, "occupations", person_facts),
+}
+
+
+def _matching(facts):
+    return reduce(or_, (Q(dimension=dimension, key=key) for dimension, key in facts))
+
+
+def update(instance, deleted=False, update_fields=None):
+    """Move the Book or Person *instance* to the counters it now belongs in."""
+    columns, m2m, facts_for = SOURCES[instance._meta.concrete_model.__name__]
+    if update_fields is not None:
+        changed = {
+            field.attname for field in instance._meta.concrete_fields
+            if field.name in update_fields or field.attname in update_fields
+        }
+        if not changed & set(columns):
+            return
+    if deleted:
+        new = set()
+    else:
+        row = {column: getattr(instance, column) for column in columns}
+        new = facts_for(row, list(getattr(instance, m2m).values_list("pk", flat=True)))
+
+    with transaction.atomic():
+        members = StatsMembership.objects.filter(object_pk=instance.pk)
+        old = set(members.values_list("dimension", "key"))
+        added, removed = new - old, old - new
+        if removed:
+            members.filter(_matching(removed)).delete()
+            StatsCount.objects.filter(_matching(removed)).update(count=F("count") - 1)
+        if added:
+            StatsMembership.objects.bulk_create(
+                StatsMembership(object_pk=instance.pk, dimension=dimension, key=key) for dimension, key in added
+            )
+            StatsCount.objects.bulk_create(
+                (StatsCount(dimension=dimension, key=key) for dimension, key in added), ignore_conflicts=True,
+            )
+            StatsCount.objects.filter(_matching(added)).update(count=F("count") + 1)
+    if added or removed:
+        transaction.on_commit(invalidate_summary)
+
+
+def rebuild(apps=global_apps, batch_size=BATCH_SIZE) -> int:
+    """
+    Recount everything from the live books and persons; returns the
+    number of counters. *apps* is the migration state when run from a
+    migration.
+    """
+    Count = apps.get_model("home", "StatsCount")
+    Membership = apps.get_model("home", "StatsMembership")
+    counts = Counter()
+
+    def memberships():
+        for model_name, (columns, m2m, facts_for) in SOURCES.items():
+            Model = apps.get_model("home", model_name)
+            through = getattr(Model, m2m).through
+            source, target = (f.attname for f in through._meta.concrete_fields if f.is_relation)
+            links = defaultdict(list)
+            for object_pk, related_pk in through.objects.values_list(source, target).iterator(chunk_size=batch_size):
+                links[object_pk].append(related_pk)
+            rows = Model.objects.filter(live=True).values("pk", *columns).iterator(chunk_size=batch_size)
+            for row in rows:
+                for dimension, key in facts_for(row, links.get(row["pk"])):
+                    counts[dimension, key] += 1
+                    yield Membership(object_pk=row["pk"], dimension=dimension, key=key)
+
+    with transaction.atomic():
+        Membership.objects.all().delete()
+        Count.objects.all().delete()
+        members = memberships()
+        while batch := list(islice(members, batch_size)):
+            Membership.objects.bulk_create(batch)
+        Count.objects.bulk_create(
+            (Count(dimension=dimension, key=key, count=n) for (dimension, key), n in counts.items()),
+            batch_size=batch_size,
+        )
+    if apps is global_apps:
+        transaction.on_commit(invalidate_summary)
+    return len(counts)
+
+
+def invalidate_summary() -> None:
+    cache.delete(SUMMARY_CACHE_KEY)
+
+
+def _names(model, keys):
+    return {str(pk): name for pk, name in model.objects.filter(pk__in=[k for k in keys if k]).values_list("pk", "name")}
+
+
+def _rows(counts, labels, by_key=False):
+    rows = [
+        {"key": key, "label": labels.get(key) or (key if key else "Unknown"), "count": n}
+        for key, n in counts.items()
+    ]
+    if by_key:
+        rows.sort(key=lambda row: (row["key"] == "", row["key"].zfill(8)))
+    else:
+        rows.sort(key=lambda row: (-row["count"], row["label"]))
+    return rows
+
+
+def build_summary() -> dict:
+    by_dimension = defaultdict(dict)
+    for dimension, key, n in StatsCount.objects.filter(count__gt=0).values_list("dimension", "key", "count"):
+        by_dimension[dimension][key] = n
+
+    books = by_dimension[Dimension.BOOKS].get("", 0)
+    digitized = by_dimension[Dimension.DIGITIZED].get("yes", 0)
+    decades = by_dimension[Dimension.DECADE]
+    return {
+        "books": {
+            "total": books,
+            "digitized": digitized,
+            "digitization_ratio": round(digitized / books, 4) if books else 0.0,
+            "per_decade": _rows(decades, {key: f"{key}s" for key in decades if key}, by_key=True),
+            "per_language": _rows(by_dimension[Dimension.LANGUAGE],
+                                  _names(Language, by_dimension[Dimension.LANGUAGE])),
+            "per_publication_place": _rows(by_dimension[Dimension.PLACE],
+                                           _names(City, by_dimension[Dimension.PLACE])),
+            "per_bundle": _rows(by_dimension[Dimension.BUNDLE], dict(BUNDLE_CHOICES)),
+        },
+        "persons": {
+            "total": by_dimension[Dimension.PERSONS].get("", 0),
+            "per_occupation": _rows(by_dimension[Dimension.OCCUPATION],
+                                    _names(Occupation, by_dimension[Dimension.OCCUPATION])),
+        },
+    }
+
+
+def summary() -> dict:
+    """The statistics behind ``/api/stats/`` and ``/stats/``; cached."""
+    data = cache.get(SUMMARY_CACHE_KEY)
+    if data is None:
+        data = build_summary()
+        cache.set(SUMMARY_CACHE_KEY, data, SUMMARY_TIMEOUT)
+    return data
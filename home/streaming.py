@@ -0,0 +1,41 @@
+"""
+Streaming responses that stream under both WSGI and ASGI.
+
+Django's ASGI handler cannot iterate a synchronous iterator without
+blocking the event loop, so it reads the whole thing into a list
+first (with a warning), and a bulk dump ends up in memory after all.
+The WSGI handler has the mirror-image problem with async iterators.
+:func:`streaming_response` hands each handler the kind it can stream.
+"""
+from __future__ import annotations
+
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# Chunks pulled from the synchronous iterator per hop to its thread.
+CHUNKS_PER_HOP = 200
+
+
+async def aiterate(iterator, batch=CHUNKS_PER_HOP):
+    """
+    Yield from a synchronous *iterator* without blocking the event loop.
+
+    The iterator is advanced in the request's thread-sensitive thread,
+    the one the view ran in, which is what a database cursor opened by
+    the view (``QuerySet.iterator()``) requires.
+    """
+    iterator = iter(iterator)
+    take = sync_to_async(lambda: list(islice(iterator, batch)))
+    while chunks := await take():
+        for chunk in chunks:
+            yield chunk
+
+
+def streaming_response(request, chunks, **kwargs):
+    """A ``StreamingHttpResponse`` over the synchronous iterable *chunks*."""
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        chunks = aiterate(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
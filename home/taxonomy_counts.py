@@ -0,0 +1,65 @@
+"""
+Live book / person counts per taxonomy term.
+
+The topic, publisher, series and occupation index pages list every
+term; showing how many live books or persons each one has would cost
+a ``COUNT`` query per row if done per term. :func:`index_entries`
+instead reads all terms of a vocabulary with their counts from one
+annotated ``GROUP BY`` query and keeps the list in the default cache.
+The API serializers read the same cached counts (:func:`live_counts`).
+
+:mod:`home.signals` drops the cached lists when a book or person is
+published, unpublished or deleted, and when a term itself changes.
+"""
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Occupation, Publisher, Series, Topic
+
+COUNTS_TIMEOUT = 60 * 60 * 24
+
+# taxonomy model -> {annotation: reverse relation to live Book / Person rows}
+COUNTS = {
+    Topic: {"book_count": "book"},
+    Publisher: {"book_count": "publications", "original_book_count": "original_publications"},
+    Series: {"book_count": "books"},
+    Occupation: {"person_count": "person"},
+}
+
+# Book / Person -> the taxonomies whose counts they feed
+COUNTED_BY = {"Book": (Topic, Publisher, Series), "Person": (Occupation,)}
+
+
+def _cache_key(model) -> str:
+    return f"home:taxonomy_counts:{model._meta.model_name}"
+
+
+def annotate_live_counts(queryset):
+    """*queryset* with one live-row ``Count`` per entry of ``COUNTS``."""
+    return queryset.annotate(**{
+        name: Count(path, filter=Q(**{f"{path}__live": True}), distinct=True)
+        for name, path in COUNTS[queryset.model].items()
+    })
+
+
+def index_entries(model) -> list:
+    """All terms of *model* by name, with their counts; cached."""
+    key = _cache_key(model)
+    entries = cache.get(key)
+    if entries is None:
+        entries = list(annotate_live_counts(model.objects.order_by("name")))
+        cache.set(key, entries, COUNTS_TIMEOUT)
+    return entries
+
+
+def live_counts(model) -> dict:
+    """``{pk: {annotation: count}}`` for every term of *model*."""
+    names = COUNTS[model]
+    return {entry.pk: {name: getattr(entry, name) for name in names} for entry in index_entries(model)}
+
+
+def invalidate_taxonomy_counts(*models) -> None:
+    """Drop the cached lists of *models* (default: all of them)."""
+    cache.delete_many([_cache_key(model) for model in models or COUNTS])
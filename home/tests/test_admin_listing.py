@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from home.models import Book, BookAuthor, Edition, Mention, Person, Preface, Production, Translation
+from home.wagtail_hooks import BookViewSet, listing_relations
+
+from .test_api_queries import seed_catalogue
+from .test_book_detail import TEST_OVERRIDES
+
+LISTED_MODELS = (Book, Person, BookAuthor, Edition, Translation, Mention, Preface, Production)
+
+
+class ListingRelationsTest(TestCase):
+    def test_book_listing_prefetches_authors(self):
+        self.assertEqual(listing_relations(Book, BookViewSet.list_display), ((), ("authors",)))
+
+    def test_foreign_key_columns_are_joined(self):
+        self.assertEqual(
+            listing_relations(Translation, ("title", "book", "language", "city", "year")),
+            (("book", "language", "city"), ()),
+        )
+
+
+@TEST_OVERRIDES
+class SnippetListingQueryCountTest(TestCase):
+    """A snippet listing page costs the same queries for 1 or 5 rows."""
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(get_user_model().objects.create_superuser("admin", "admin@example.com", "pw"))
+
+    def _list_queries(self, model):
+        url = reverse(model.snippet_viewset.get_url_name("list"))
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200, model.__name__)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        seed_catalogue(batch=1, size=1)
+        baseline = {model: self._list_queries(model) for model in LISTED_MODELS}
+
+        seed_catalogue(batch=2, size=4)
+        for model in LISTED_MODELS:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(self._list_queries(model), baseline[model])
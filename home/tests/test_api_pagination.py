@@ -0,0 +1,107 @@
+import base64
+import json
+
+from django.db import connection
+from django.db.models import F
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from home.models import Book, Language
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+@TEST_OVERRIDES
+class KeysetPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Duplicate and missing names exercise the (value, pk) cursor.
+        names = [f"Book {i % 7}" for i in range(40)] + [None] * 12
+        cls.books = [
+            Book.objects.create(name=name, gregorian_year=1780 + i % 3 if i % 4 else None)
+            for i, name in enumerate(names)
+        ]
+
+    def _walk(self, url, params=None):
+        seen = []
+        client = Client()
+        resp = client.get(url, params)
+        while True:
+            body = resp.json()
+            seen.extend(item["uuid"] for item in body["results"])
+            if not body["next"]:
+                return seen
+            resp = client.get(body["next"])
+
+    def test_walk_visits_every_row_once(self):
+        seen = self._walk("/api/books/")
+        self.assertEqual(len(seen), len(self.books))
+        self.assertEqual(set(seen), {str(book.uuid) for book in self.books})
+
+    def test_descending_walk(self):
+        seen = self._walk("/api/books/", {"ordering": "-name"})
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), len(self.books))
+
+    def test_every_ordering_term_is_keyed(self):
+        seen = self._walk("/api/books/", {"ordering": "-gregorian_year,name"})
+        expected = Book.objects.order_by(
+            F("gregorian_year").desc(nulls_last=True), F("name").asc(nulls_last=True), "pk",
+        ).values_list("uuid", flat=True)
+        self.assertEqual(seen, [str(pk) for pk in expected])
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            body = Client().get("/api/books/").json()
+        self.assertNotIn("count", body)
+        self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+
+    def test_page_number_still_works(self):
+        body = Client().get("/api/books/", {"page": 2}).json()
+        self.assertEqual(body["count"], len(self.books))
+
+    def test_bad_cursor_is_404(self):
+        self.assertEqual(Client().get("/api/books/", {"cursor": "%%%"}).status_code, 404)
+
+    def test_mistyped_cursor_is_404(self):
+        def cursor(*position):
+            return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+        pk = str(self.books[0].uuid)
+        for params in (
+            {"cursor": cursor("Book 1", "not-a-uuid")},
+            {"cursor": cursor("abc", pk), "ordering": "gregorian_year"},
+            {"cursor": cursor(1780, pk), "ordering": "gregorian_year,name"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(Client().get("/api/books/", params).status_code, 404)
+
+
+@TEST_OVERRIDES
+class NdjsonBulkTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(60):
+            Language.objects.create(name=f"Language {i:02d}")
+
+    def test_all_streams_every_record(self):
+        resp = Client().get("/api/languages/", {"format": "ndjson", "all": "1"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 60)
+        self.assertEqual(json.loads(lines[0])["name"], "Language 00")
+
+    def test_all_honours_filters_and_fields(self):
+        resp = Client().get(
+            "/api/languages/", {"format": "ndjson", "all": "1", "search": "Language 1", "fields": "name"},
+        )
+        records = [json.loads(line) for line in b"".join(resp.streaming_content).decode().splitlines()]
+        self.assertEqual(len(records), 10)
+        self.assertEqual(set(records[0]), {"name"})
+
+    def test_paginated_ndjson(self):
+        resp = Client().get("/api/languages/", {"format": "ndjson"})
+        self.assertFalse(resp.streaming)
+        self.assertEqual(len(resp.content.decode().splitlines()), 25)
@@ -0,0 +1,174 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from home.api import BookViewSet, PersonViewSet, api_router
+from home.eager_loading import eager_loading_plan
+from home.models import (
+    Alignment,
+    Book,
+    BookAuthor,
+    City,
+    DateFormat,
+    Edition,
+    Font,
+    FootnoteLocation,
+    Gender,
+    Geolocation,
+    Language,
+    LanguageCount,
+    Mention,
+    MentionDescription,
+    Occupation,
+    OriginalType,
+    Person,
+    Preface,
+    Production,
+    ProductionRole,
+    Publisher,
+    Series,
+    TargetAudience,
+    TextualModel,
+    Topic,
+    Translation,
+    TranslationType,
+    Typography,
+)
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+def seed_catalogue(batch, size=3):
+    """
+    Create *size* fully linked books (plus their people, places and
+    lookup terms). *batch* keeps names and legacy ids unique across
+    calls.
+    """
+    for i in range(size):
+        n = batch * 100 + i
+        gender = Gender.objects.create(name=f"Gender {n}", legacy_tid=n)
+        occupation = Occupation.objects.create(name=f"Occupation {n}", legacy_tid=n)
+        topic = Topic.objects.create(name=f"Topic {n}", legacy_tid=n)
+        city = City.objects.create(name=f"City {n}")
+        Geolocation.objects.create(city=city, lat=50.0 + i, lng=10.0 + i)
+        language = Language.objects.create(name=f"Language {n}")
+        person = Person.objects.create(
+            pref_label=f"Person {n}", gender=gender, place_of_birth=city, place_of_death=city,
+        )
+        person.occupations.add(occupation)
+
+        book = Book.objects.create(
+            name=f"Book {n}",
+            alignment=Alignment.objects.create(name=f"Alignment {n}"),
+            publisher=Publisher.objects.create(name=f"Publisher {n}"),
+            series=Series.objects.create(name=f"Series {n}"),
+            publication_place=city,
+            original_type=OriginalType.objects.create(name=f"Original type {n}"),
+            translation_type=TranslationType.objects.create(name=f"Translation type {n}"),
+            location_of_footnotes=FootnoteLocation.objects.create(name=f"Footnote location {n}"),
+            format_of_publication_date=DateFormat.objects.create(name=f"Date format {n}"),
+            languages_number=LanguageCount.objects.create(name=f"Language count {n}"),
+            topic=topic,
+        )
+        BookAuthor.objects.create(book=book, person=person, role="old_text_author")
+        book.languages.add(language)
+        book.fonts.add(Font.objects.create(name=f"Font {n}"))
+        book.target_audience.add(TargetAudience.objects.create(name=f"Audience {n}"))
+        book.typography.add(Typography.objects.create(name=f"Typography {n}"))
+        book.main_textual_models.add(TextualModel.objects.create(name=f"Textual model {n}"))
+
+        Edition.objects.create(book=book, city=city, name=f"Edition {n}")
+        Translation.objects.create(book=book, translator=person, language=language, city=city, title=f"T {n}")
+        Mention.objects.create(
+            book=book, mentionee=person, mentionee_city=city,
+            mentionee_description=MentionDescription.objects.create(name=f"Description {n}", legacy_tid=n),
+        )
+        Preface.objects.create(book=book, writer=person, title=f"Preface {n}")
+        Production.objects.create(
+            book=book, producer=person,
+            role=ProductionRole.objects.create(name=f"Role {n}", legacy_tid=n),
+        )
+
+
+class EagerLoadingPlanTest(TestCase):
+    def test_book_plan_covers_foreign_keys_and_m2ms(self):
+        plan = eager_loading_plan(BookViewSet.serializer_class())
+        self.assertIn("publisher", plan.select_related)
+        self.assertIn("publication_place", plan.select_related)
+        self.assertIn("authors", plan.prefetch_related)
+        self.assertIn("languages", plan.prefetch_related)
+        # Depth-0 many-to-many lists on the nested authors.
+        self.assertIn("authors__occupations", plan.prefetch_related)
+
+    def test_person_plan(self):
+        plan = eager_loading_plan(PersonViewSet.serializer_class())
+        self.assertEqual(
+            set(plan.select_related) & {"gender", "place_of_birth", "place_of_death"},
+            {"gender", "place_of_birth", "place_of_death"},
+        )
+        self.assertIn("occupations", plan.prefetch_related)
+
+
+@TEST_OVERRIDES
+class ApiListQueryCountTest(TestCase):
+    """
+    Every list endpoint must cost the same number of queries no matter
+    how many rows are on the page — a new serializer relation without a
+    matching join or prefetch fails here.
+    """
+
+    def _list_queries(self, prefix):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = Client().get(f"/api/{prefix}/")
+        self.assertEqual(resp.status_code, 200, prefix)
+        self.assertTrue(resp.json()["results"], prefix)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        seed_catalogue(batch=1, size=1)
+        baseline = {prefix: self._list_queries(prefix) for prefix, _, _ in api_router.registry}
+
+        seed_catalogue(batch=2, size=4)
+        for prefix, _, _ in api_router.registry:
+            with self.subTest(route=prefix):
+                self.assertEqual(self._list_queries(prefix), baseline[prefix])
+
+
+@TEST_OVERRIDES
+class SparseFieldsetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogue(batch=1, size=2)
+
+    def test_fields_narrows_items(self):
+        resp = Client().get("/api/books/", {"fields": "name,slug"})
+        self.assertEqual(resp.status_code, 200)
+        for item in resp.json()["results"]:
+            self.assertEqual(set(item), {"name", "slug"})
+
+    def test_fields_narrows_sql_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            Client().get("/api/books/", {"fields": "name,slug,publisher"})
+        book_sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "home_book"' in q["sql"]
+                        and "COUNT(" not in q["sql"])
+        self.assertIn('"home_book"."slug"', book_sql)
+        self.assertIn('"home_publisher"."name"', book_sql)
+        self.assertNotIn('"home_book"."full_title"', book_sql)
+
+    def test_summary_view(self):
+        summary = Client().get("/api/books/", {"view": "summary"})
+        full = Client().get("/api/books/")
+        item = summary.json()["results"][0]
+        self.assertEqual(
+            set(item), {"uuid", "name", "slug", "gregorian_year", "hebrew_year_of_publication", "bundle"},
+        )
+        self.assertLess(len(summary.content) * 10, len(full.content))
+
+    def test_summary_flattens_relations(self):
+        item = Client().get("/api/editions/", {"view": "summary"}).json()["results"][0]
+        self.assertIsInstance(item["book"], str)
+        self.assertEqual(set(item), {"uuid", "name", "book", "year"})
+
+    def test_unknown_field_or_view_is_rejected(self):
+        self.assertEqual(Client().get("/api/books/", {"fields": "name,nope"}).status_code, 400)
+        self.assertEqual(Client().get("/api/books/", {"view": "tiny"}).status_code, 400)
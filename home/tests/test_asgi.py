@@ -0,0 +1,48 @@
+import json
+import warnings
+
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from haskala.metrics import registry
+from home.models import Book, Language
+from home.streaming import streaming_response
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+@TEST_OVERRIDES
+class AsgiRequestTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.book = Book.objects.create(name="Served Over ASGI")
+        for i in range(30):
+            Language.objects.create(name=f"Language {i:02d}")
+
+    def setUp(self):
+        registry.reset()
+
+    async def test_ndjson_dump_streams_without_buffering(self):
+        with warnings.catch_warnings():
+            # Django's warning when it has to buffer a sync iterator.
+            warnings.filterwarnings("error", message="StreamingHttpResponse must consume")
+            resp = await AsyncClient().get("/api/languages/", {"format": "ndjson", "all": "1"})
+            self.assertTrue(resp.is_async)
+            body = b"".join([chunk async for chunk in resp.streaming_content])
+        lines = body.decode().splitlines()
+        self.assertEqual(len(lines), 30)
+        self.assertEqual(json.loads(lines[0])["name"], "Language 00")
+
+    async def test_middleware_counts_queries_in_async_mode(self):
+        resp = await AsyncClient().get(reverse("book-detail", args=[self.book.slug]))
+        self.assertEqual(resp.status_code, 200)
+        metrics = registry.snapshot()["home.views.book_detail_view"]
+        self.assertEqual(metrics.requests, 1)
+        self.assertGreater(metrics.queries, 0)
+
+
+class StreamingResponseTest(SimpleTestCase):
+    def test_wsgi_request_keeps_the_sync_iterator(self):
+        resp = streaming_response(RequestFactory().get("/"), iter(["a", "b"]))
+        self.assertFalse(resp.is_async)
+        self.assertEqual(b"".join(resp.streaming_content), b"ab")
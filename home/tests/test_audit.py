@@ -0,0 +1,58 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from home.audit import duplicate_groups, name_punctuation_rows, orphan_places
+from home.models import Book, City, Person
+
+
+class AuditTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.berlin = City.objects.create(name="Berlin")
+        cls.vilna = City.objects.create(name="Vilna")
+        cls.nowhere = City.objects.create(name="Nowhere")
+        cls.nowhere_again = City.objects.create(name=" nowhere ")
+        Book.objects.create(name="Phaedon", publication_place=cls.berlin)
+        cls.moses = Person.objects.create(pref_label="Moses Mendelssohn", place_of_death=cls.vilna)
+        cls.moses_again = Person.objects.create(pref_label="moses mendelssohn ")
+        cls.doctor = Person.objects.create(pref_label="(Dr.) Marcus Herz", german_name="Herz")
+
+    def test_orphan_places(self):
+        self.assertEqual(set(orphan_places()), {self.nowhere, self.nowhere_again})
+        self.assertEqual(list(orphan_places(City.objects.filter(name="Berlin"))), [])
+
+    def test_name_punctuation(self):
+        self.assertEqual(list(name_punctuation_rows()), [(self.doctor.pk, "pref_label", "(Dr.) Marcus Herz")])
+
+    def test_duplicates(self):
+        self.assertEqual(list(duplicate_groups()), [
+            ("Person", "pref_label", "moses mendelssohn", sorted([self.moses.pk, self.moses_again.pk])),
+            ("City", "name", "nowhere", sorted([self.nowhere.pk, self.nowhere_again.pk])),
+        ])
+
+    def test_command_query_count_is_constant(self):
+        def run():
+            with tempfile.TemporaryDirectory() as tmp, CaptureQueriesContext(connection) as ctx:
+                out = StringIO()
+                call_command("audit_data_quality", out_dir=tmp, stdout=out)
+                with (Path(tmp) / "duplicates.csv").open(encoding="utf-8") as f:
+                    duplicates = list(csv.reader(f))
+            return len(ctx), out.getvalue(), duplicates
+
+        queries, output, duplicates = run()
+        self.assertIn("orphan_places: 2 / 4", output)
+        self.assertIn("person_name_punctuation: 1 field/value pairs", output)
+        self.assertIn("duplicates: 2 keys across 4 rows", output)
+        self.assertEqual(duplicates[1][:3], ["Person", "pref_label", "moses mendelssohn"])
+
+        for i in range(10):
+            City.objects.create(name=f"Orphan {i}")
+            Person.objects.create(pref_label=f"'Person {i % 2}")
+        self.assertEqual(run()[0], queries)
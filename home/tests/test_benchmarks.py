@@ -0,0 +1,74 @@
+import tempfile
+
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+
+from benchmarks.catalogue import generate
+from benchmarks.report import compare, run_scenarios
+from home.models import Book, BookAuthor, City, Mention, Person
+
+from .test_book_detail import TEST_OVERRIDES
+
+SCALE = 0.02
+
+
+def fingerprint(seed):
+    """Counts and identifying columns of a generated catalogue, rolled back afterwards."""
+    with transaction.atomic():
+        counts = generate(scale=SCALE, seed=seed)
+        rows = (
+            list(Book.objects.order_by("uuid").values_list("uuid", "slug", "publisher__name", "full_title")),
+            list(Person.objects.order_by("uuid").values_list("uuid", "slug", "place_of_birth__name")),
+            list(BookAuthor.objects.order_by("book_id", "person_id").values_list("book_id", "person_id")),
+        )
+        transaction.set_rollback(True)
+    return counts, rows
+
+
+def report(median_ms, queries, scale=1, seed=1):
+    return {
+        "meta": {"scale": scale, "seed": seed},
+        "scenarios": {"book-detail": {"median_ms": median_ms, "queries": queries}},
+    }
+
+
+class CatalogueTest(TestCase):
+    def test_same_seed_same_catalogue(self):
+        first, second = fingerprint(seed=7), fingerprint(seed=7)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[1], fingerprint(seed=8)[1])
+
+    def test_counts_and_relations(self):
+        counts = generate(scale=SCALE, seed=1)
+        self.assertEqual(Book.objects.count(), counts["Book"])
+        self.assertEqual(counts["Book"], 20)
+        self.assertEqual(Person.objects.count(), 28)
+        self.assertTrue(City.objects.filter(geolocation__isnull=False).exists())
+        self.assertFalse(Book.objects.filter(bookauthor__isnull=True).exists())
+        self.assertTrue(Mention.objects.exists())
+        self.assertFalse(Book.objects.exclude(live=True).exists())
+
+
+class CompareTest(SimpleTestCase):
+    def test_slower_median_and_more_queries_are_regressions(self):
+        self.assertEqual(compare(report(110, 10), report(100, 10)), [])
+        self.assertEqual(len(compare(report(140, 10), report(100, 10))), 1)
+        self.assertEqual(len(compare(report(100, 11), report(100, 10))), 1)
+
+    def test_small_timings_are_not_regressions(self):
+        self.assertEqual(compare(report(3.5, 10), report(1.0, 10)), [])
+
+    def test_different_scale_is_an_error(self):
+        with self.assertRaises(ValueError):
+            compare(report(100, 10, scale=10), report(100, 10))
+
+
+@TEST_OVERRIDES
+class ScenarioRunTest(TestCase):
+    def test_detail_and_api_scenarios_run(self):
+        generate(scale=SCALE, seed=1)
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run_scenarios(["book-detail", "api-books"], workdir, rounds=1)
+        self.assertEqual(results["book-detail"]["runs"], 10)
+        self.assertEqual(results["api-books"]["group"], "api")
+        self.assertGreater(results["book-detail"]["queries"], 0)
@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from home.entity_relations import person_relations, place_relations, rebuild
+from home.models import (
+    Book, BookAuthor, City, Edition, EntityRelation, Mention, Person, Preface, Translation,
+)
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+def table():
+    return sorted(
+        EntityRelation.objects.values_list(
+            "city_id", "person_id", "role", "book_id", "related_person_id", "edition_id", "mention_id",
+        ),
+        key=repr,
+    )
+
+
+@TEST_OVERRIDES
+class EntityRelationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.berlin = City.objects.create(name="Berlin")
+        cls.vienna = City.objects.create(name="Vienna")
+        cls.moses = Person.objects.create(pref_label="Mendelssohn, Moses", place_of_birth=cls.berlin)
+        cls.maimon = Person.objects.create(pref_label="Maimon, Salomon", place_of_death=cls.berlin)
+        cls.phaedon = Book.objects.create(
+            name="Phaedon", gregorian_year=1767,
+            publication_place=cls.berlin, original_publication_place=cls.berlin,
+        )
+        cls.jerusalem = Book.objects.create(name="Jerusalem", gregorian_year=1783,
+                                            publication_place=cls.vienna)
+        cls.edition = Edition.objects.create(book=cls.phaedon, city=cls.vienna, year="1769")
+        Translation.objects.create(book=cls.jerusalem, city=cls.berlin, year="1790")
+        cls.mention = Mention.objects.create(book=cls.jerusalem, mentionee=cls.maimon,
+                                             mentionee_city=cls.vienna)
+        BookAuthor.objects.create(book=cls.phaedon, person=cls.moses, role="old_text_author")
+        BookAuthor.objects.create(book=cls.jerusalem, person=cls.moses, role="old_text_author")
+        Preface.objects.create(book=cls.jerusalem, writer=cls.maimon)
+
+    def test_place_entries_from_one_query(self):
+        with self.assertNumQueries(1):
+            berlin = place_relations(self.berlin)
+        self.assertEqual(berlin["books_published_here"], [self.phaedon])
+        self.assertEqual([t.book for t in berlin["translations_here"]], [self.jerusalem])
+        self.assertEqual(berlin["born_here"], [self.moses])
+        self.assertEqual(berlin["died_here"], [self.maimon])
+
+        with self.assertNumQueries(1):
+            vienna = place_relations(self.vienna)
+            self.assertEqual([e.book for e in vienna["editions_here"]], [self.phaedon])
+            self.assertEqual([m.mentionee for m in vienna["mentions_here"]], [self.maimon])
+
+    def test_person_entries_from_one_query(self):
+        with self.assertNumQueries(1):
+            moses = person_relations(self.moses)
+        self.assertEqual(moses["person_books_by_role"], {"Old text author": [self.jerusalem, self.phaedon]})
+
+        with self.assertNumQueries(1):
+            maimon = person_relations(self.maimon)
+            self.assertEqual([p.book for p in maimon["prefaces_by_person"]], [self.jerusalem])
+            self.assertEqual([m.mentionee_city for m in maimon["mentions_of_person"]], [self.vienna])
+
+    def test_saves_and_deletes_keep_entries_current(self):
+        self.phaedon.publication_place = self.vienna
+        self.phaedon.original_publication_place = None
+        self.phaedon.save()
+        self.assertEqual(place_relations(self.berlin)["books_published_here"], [])
+        self.assertEqual(place_relations(self.vienna)["books_published_here"], [self.phaedon, self.jerusalem])
+
+        self.edition.delete()
+        self.assertEqual(place_relations(self.vienna)["editions_here"], [])
+
+        self.maimon.delete()
+        self.assertEqual(place_relations(self.berlin)["died_here"], [])
+        self.assertEqual(place_relations(self.vienna)["mentions_here"][0].mentionee, None)
+
+    def test_unpublished_books_and_persons_are_hidden(self):
+        self.moses.live = False
+        self.moses.save(update_fields=["live"])
+        self.assertEqual(place_relations(self.berlin)["born_here"], [])
+
+    def test_rebuild_matches_incremental_updates(self):
+        incremental = table()
+        self.assertEqual(rebuild(batch_size=2), len(incremental))
+        self.assertEqual(table(), incremental)
+
+    def test_person_page_lists_prefaces(self):
+        resp = self.client.get(reverse("person-detail", args=[self.maimon.slug]))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("prefaces", [section.slug for section in resp.context["visible_sections"]])
+        self.assertEqual([p.book for p in resp.context["prefaces_by_person"]], [self.jerusalem])
@@ -0,0 +1,72 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from home.models import Book, Language, Publisher
+
+COLUMNS = ["nid", "vid", "type", "title", "status", "publisher_name_tid", "language_tid"]
+
+
+class ImportBooksTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hebrew = Language.objects.create(name="Hebrew", legacy_tid=10)
+        cls.german = Language.objects.create(name="German", legacy_tid=11)
+        cls.publisher = Publisher.objects.create(name="Sample Verlag", legacy_tid=20)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, rows):
+        path = Path(self.tmp.name) / "books.csv"
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def _import(self, rows):
+        out = StringIO()
+        call_command("import_haskala_books", file=str(self._write(rows)), stdout=out)
+        return out.getvalue()
+
+    def _rows(self, count, title="Book"):
+        return [
+            {"nid": n, "vid": n, "type": "book", "title": f"{title} {n}", "status": "1",
+             "publisher_name_tid": "20", "language_tid": "10"}
+            for n in range(1, count + 1)
+        ]
+
+    def test_creates_books_with_relations(self):
+        output = self._import(self._rows(3))
+        self.assertIn("3 created, 0 updated, 0 unchanged", output)
+        book = Book.objects.get(legacy_nid=2)
+        self.assertEqual(book.name, "Book 2")
+        self.assertEqual(book.slug, "book-2")
+        self.assertEqual(book.publisher, self.publisher)
+        self.assertEqual(list(book.languages.all()), [self.hebrew])
+
+    def test_reimport_only_writes_changes(self):
+        self._import(self._rows(3))
+        rows = self._rows(3)
+        rows[0]["title"] = "Renamed"
+        rows[1]["language_tid"] = "11"
+        output = self._import(rows)
+        self.assertIn("0 created, 1 updated, 2 unchanged", output)
+        self.assertEqual(Book.objects.get(legacy_nid=1).name, "Renamed")
+        self.assertEqual(list(Book.objects.get(legacy_nid=2).languages.all()), [self.german])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            self._import(self._rows(5))
+        Book.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            self._import(self._rows(50))
+        self.assertEqual(len(large), len(small))
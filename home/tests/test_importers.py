@@ -0,0 +1,180 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from home.models import Alignment, Book, City, Geolocation, Occupation, Person
+
+
+class ImporterTestCase(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, columns, rows):
+        path = Path(self.tmp.name) / name
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def _call(self, *args, **kwargs):
+        out = StringIO()
+        call_command(*args, stdout=out, **kwargs)
+        return out.getvalue()
+
+
+class AlignmentImportTest(ImporterTestCase):
+    def _csv(self):
+        return self._write("alignment.csv", ["tid", "name"], [
+            {"tid": "1", "name": "Haskala"},
+            {"tid": "", "name": "Orthodox"},
+            {"tid": "3", "name": ""},
+        ])
+
+    def test_matches_by_tid_then_name(self):
+        Alignment.objects.create(name="Orthodox")
+        output = self._call("import_haskala_alignment", file=str(self._csv()))
+        self.assertIn("1 created, 0 updated, 1 unchanged, 1 skipped (no name)", output)
+        self.assertEqual(Alignment.objects.get(legacy_tid=1).name, "Haskala")
+        self.assertEqual(Alignment.objects.filter(name="Orthodox").count(), 1)
+
+    def test_dry_run_rolls_back(self):
+        output = self._call("import_haskala_alignment", file=str(self._csv()), dry_run=True)
+        self.assertIn("2 created", output)
+        self.assertIn("  + 1", output)
+        self.assertIn("Dry run", output)
+        self.assertFalse(Alignment.objects.exists())
+
+
+class PersonImportTest(ImporterTestCase):
+    COLUMNS = ["nid", "vid", "title", "german_name", "place_of_birth_tid", "occupation_tid"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.writer = Occupation.objects.create(name="Writer", legacy_tid=5)
+        cls.printer = Occupation.objects.create(name="Printer", legacy_tid=6)
+        cls.berlin = City.objects.create(name="Berlin", legacy_tid=7)
+
+    def test_resolves_links_and_reports_unknown_ids(self):
+        path = self._write("persons.csv", self.COLUMNS, [
+            {"nid": "100", "vid": "1", "title": "Moses Mendelssohn", "german_name": "",
+             "place_of_birth_tid": "7", "occupation_tid": "5;6;99"},
+        ])
+        output = self._call("import_haskala_persons", file=str(path))
+        person = Person.objects.get(legacy_nid=100)
+        self.assertEqual(person.slug, "moses-mendelssohn")
+        self.assertEqual(person.place_of_birth, self.berlin)
+        self.assertEqual(set(person.occupations.all()), {self.writer, self.printer})
+        self.assertIn("occupations: 1 unknown legacy id(s): 99", output)
+
+    def test_legacy_empty_markers_are_blanked(self):
+        path = self._write("persons.csv", self.COLUMNS, [
+            {"nid": "100", "vid": "1", "title": "Moses Mendelssohn", "german_name": "a:0:{}",
+             "place_of_birth_tid": "", "occupation_tid": ""},
+        ])
+        self._call("import_haskala_persons", file=str(path))
+        self.assertEqual(Person.objects.get(legacy_nid=100).german_name, "")
+
+    def test_reimport_syncs_occupations(self):
+        rows = [{"nid": "100", "vid": "1", "title": "Moses Mendelssohn", "german_name": "",
+                 "place_of_birth_tid": "", "occupation_tid": "5;6"}]
+        self._call("import_haskala_persons", file=str(self._write("persons.csv", self.COLUMNS, rows)))
+        rows[0]["occupation_tid"] = "6"
+        output = self._call("import_haskala_persons", file=str(self._write("persons.csv", self.COLUMNS, rows)))
+        self.assertIn("0 created, 0 updated, 1 unchanged; M2M links +0 / -1", output)
+        self.assertEqual(list(Person.objects.get(legacy_nid=100).occupations.all()), [self.printer])
+
+
+class CityImportTest(ImporterTestCase):
+    def test_geolocation_gets_trig_columns(self):
+        path = self._write("cities.csv", ["name", "field_geolocation_lat", "field_geolocation_lng"], [
+            {"name": "Berlin", "field_geolocation_lat": "52.52", "field_geolocation_lng": "13.405"},
+            {"name": "Nowhere", "field_geolocation_lat": "", "field_geolocation_lng": ""},
+        ])
+        self._call("import_cities", str(path))
+        self.assertEqual(City.objects.count(), 2)
+        geo = Geolocation.objects.get()
+        self.assertEqual(geo.city.slug, "berlin")
+        self.assertAlmostEqual(geo.lat_cos, 0.6084, places=3)
+
+
+class ImportAllTest(ImporterTestCase):
+    def _export(self):
+        export = Path(self.tmp.name)
+        drupal = export / "drupal"
+        drupal.mkdir()
+        self._write("cities_with_geolocation.csv", ["tid", "name", "field_geolocation_lat", "field_geolocation_lng"], [
+            {"tid": "7", "name": "Berlin", "field_geolocation_lat": "52.52", "field_geolocation_lng": "13.405"},
+        ])
+        self._write("taxonomy_occupation.csv", ["tid", "name"], [{"tid": "5", "name": "Writer"}])
+        self._write("persons_for_django.csv", ["nid", "title", "place_of_birth_tid", "occupation_tid"], [
+            {"nid": "100", "title": "Moses Mendelssohn", "place_of_birth_tid": "7", "occupation_tid": "5"},
+        ])
+        self._write("drupal/field_data_field_book.csv", ["entity_id", "field_book_target_id"], [])
+        return export, drupal
+
+    def test_runs_stages_in_dependency_order(self):
+        export, drupal = self._export()
+        output = self._call("import_haskala_all", export_dir=str(export), drupal_dir=str(drupal), jobs=1)
+
+        person = Person.objects.get(legacy_nid=100)
+        self.assertEqual(person.place_of_birth.name, "Berlin")
+        self.assertEqual([o.name for o in person.occupations.all()], ["Writer"])
+        self.assertLess(output.index("== taxonomies"), output.index("== persons"))
+        self.assertIn("== books: skipped (books_for_django.csv not found)", output)
+        self.assertIn("== relations", output)
+        self.assertIn("Stage timings", output)
+
+    def test_dry_run_previews_every_stage(self):
+        export, drupal = self._export()
+        output = self._call("import_haskala_all", export_dir=str(export), drupal_dir=str(drupal), dry_run=True)
+        self.assertIn("  + 100", output)
+        # The persons stage still saw the cities of the taxonomies stage.
+        self.assertNotIn("unknown legacy id", output)
+        self.assertFalse(Person.objects.exists())
+        self.assertFalse(City.objects.exists())
+
+
+class IncrementalImportTest(ImporterTestCase):
+    COLUMNS = ["nid", "title", "changed"]
+
+    def _import(self, rows, **options):
+        path = self._write("books.csv", self.COLUMNS, rows)
+        return self._call("import_haskala_books", file=str(path), **options)
+
+    def test_skips_rows_with_unchanged_timestamp(self):
+        rows = [{"nid": n, "title": f"Book {n}", "changed": "1700000000"} for n in (1, 2, 3)]
+        self._import(rows)
+        stamp = Book.objects.get(legacy_nid=2).updated_at
+
+        # Same timestamp: not re-read even though the title differs.
+        rows[1]["title"] = "Renamed"
+        output = self._import(rows, incremental=True)
+        self.assertIn("0 created, 0 updated, 3 unchanged (3 not re-read)", output)
+        self.assertEqual(Book.objects.get(legacy_nid=2).updated_at, stamp)
+
+        rows[1]["changed"] = "1700000100"
+        output = self._import(rows, incremental=True)
+        self.assertIn("0 created, 1 updated, 2 unchanged (2 not re-read)", output)
+        self.assertEqual(Book.objects.get(legacy_nid=2).name, "Renamed")
+
+    def test_falls_back_to_value_fingerprint(self):
+        Occupation.objects.create(name="Writer", legacy_tid=5)
+        path = self._write("persons.csv", ["nid", "title", "occupation_tid"], [
+            {"nid": "100", "title": "Moses Mendelssohn", "occupation_tid": "5"},
+        ])
+        self._call("import_haskala_persons", file=str(path))
+        output = self._call("import_haskala_persons", file=str(path), incremental=True)
+        self.assertIn("1 unchanged (1 not re-read)", output)
+
+        path = self._write("persons.csv", ["nid", "title", "occupation_tid"], [
+            {"nid": "100", "title": "Moses Mendelssohn", "occupation_tid": ""},
+        ])
+        output = self._call("import_haskala_persons", file=str(path), incremental=True)
+        self.assertIn("0 created, 0 updated, 1 unchanged; M2M links +0 / -1", output)
+        self.assertFalse(Person.objects.get(legacy_nid=100).occupations.exists())
@@ -0,0 +1,60 @@
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from haskala.metrics import RequestStats, MetricsRegistry, registry, render_prometheus
+from home.models import Book
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+class PrometheusFormatTest(SimpleTestCase):
+    def test_snapshot_renders_every_family(self):
+        reg = MetricsRegistry()
+        reg.record(
+            "home.views.book_detail_view", status=200, seconds=0.2,
+            stats=RequestStats(queries=7, query_seconds=0.05, template_seconds=0.1),
+            cache_result="miss", over_budget=False,
+        )
+        text = render_prometheus(reg.snapshot())
+        self.assertIn('haskala_http_requests_total{view="home.views.book_detail_view",status="200"} 1', text)
+        self.assertIn('haskala_db_queries_total{view="home.views.book_detail_view"} 7', text)
+        self.assertIn(
+            'haskala_http_request_duration_seconds_bucket{view="home.views.book_detail_view",le="0.1"} 0', text,
+        )
+        self.assertIn(
+            'haskala_http_request_duration_seconds_bucket{view="home.views.book_detail_view",le="0.25"} 1', text,
+        )
+        self.assertIn('result="miss"} 1', text)
+        self.assertIn("# TYPE haskala_http_request_duration_seconds histogram", text)
+
+
+@TEST_OVERRIDES
+@override_settings(HASKALA_METRICS_TOKEN="scrape-me")
+class PerformanceMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.book = Book.objects.create(name="Measured Book")
+
+    def setUp(self):
+        registry.reset()
+
+    def test_detail_request_is_recorded(self):
+        Client().get(reverse("book-detail", args=[self.book.slug]))
+        metrics = registry.snapshot()["home.views.book_detail_view"]
+        self.assertEqual(metrics.requests, 1)
+        self.assertGreater(metrics.queries, 0)
+        self.assertGreater(metrics.template_seconds, 0)
+
+    def test_budget_overrun_is_logged(self):
+        with override_settings(HASKALA_PERF_BUDGETS={"book-detail": {"queries": 0}}):
+            with self.assertLogs("haskala.perf", "WARNING") as logs:
+                Client().get(reverse("book-detail", args=[self.book.slug]))
+        self.assertIn("over budget", logs.output[0])
+        self.assertEqual(registry.snapshot()["home.views.book_detail_view"].over_budget, 1)
+
+    def test_metrics_endpoint_requires_token(self):
+        self.assertEqual(Client().get(reverse("metrics")).status_code, 404)
+        resp = Client().get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-me")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("text/plain", resp["Content-Type"])
+        self.assertIn(b"# TYPE haskala_db_queries_total counter", resp.content)
@@ -0,0 +1,72 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from home.models import Book, BookAuthor, City, Person
+from home.near_duplicates import (
+    PERSON_FACTS, Record, find_near_duplicates, name_tokens, phonetic,
+)
+
+
+def record(pk, name, **facts):
+    return Record(pk, name, [name_tokens(name)], facts)
+
+
+class NearDuplicateEngineTest(SimpleTestCase):
+    def test_phonetic_folds_transliteration_variants(self):
+        self.assertEqual(phonetic("naphtali"), phonetic("naftali"))
+        self.assertEqual(phonetic("herz"), phonetic("hirz"))
+        self.assertEqual(phonetic("kohn"), phonetic("cohen"))
+        self.assertNotEqual(phonetic("wessely"), phonetic("wolf"))
+
+    def test_ranks_variants_and_uses_facts(self):
+        records = [
+            record(1, "Wessely, Naphtali Herz", birth_year=1725),
+            record(2, "Wessely, Naftali Hirz", birth_year=1725),
+            record(3, "Mendelssohn, Moses", birth_year=1729),
+            record(4, "Moses Mendelsohn", birth_year=1800),
+            record(5, "Euchel, Isaac"),
+        ]
+        result = find_near_duplicates(records, PERSON_FACTS, threshold=0.5)
+        pairs = [(pair.a.pk, pair.b.pk, pair.reasons) for pair in result.pairs]
+        self.assertEqual(pairs, [
+            (1, 2, ["same birth year"]),
+            (3, 4, ["different birth year"]),
+        ])
+        # Euchel shares no block with anyone.
+        self.assertEqual(result.candidates, 2)
+
+    def test_oversized_blocks_are_skipped(self):
+        records = [record(i, "Cohen, Moses") for i in range(5)]
+        result = find_near_duplicates(records, PERSON_FACTS, max_block=4)
+        self.assertEqual(result.pairs, [])
+        self.assertGreater(result.skipped_blocks, 0)
+
+
+class NearDuplicateCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        berlin = City.objects.create(name="Berlin")
+        cls.a = Person.objects.create(pref_label="Wessely, Naphtali Herz", place_of_birth=berlin)
+        cls.b = Person.objects.create(pref_label="Wessely, Naftali Hirz", place_of_birth=berlin)
+        Person.objects.create(pref_label="Euchel, Isaac")
+        for name in ("Shire tiferet", "Shirei tiferet"):
+            book = Book.objects.create(name=name)
+            BookAuthor.objects.create(book=book, person=cls.a, role="old_text_author")
+
+    def test_writes_ranked_pairs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = StringIO()
+            call_command("audit_near_duplicates", out_dir=tmp, stdout=out)
+            with (Path(tmp) / "near_duplicates.csv").open(encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual([row["model"] for row in rows], ["Person", "Book"])
+        self.assertEqual({rows[0]["uuid_a"], rows[0]["uuid_b"]}, {str(self.a.pk), str(self.b.pk)})
+        self.assertEqual(rows[0]["evidence"], "same place of birth")
+        self.assertEqual(rows[1]["evidence"], "same author")
+        self.assertIn("near_duplicates: 1 Person pairs", out.getvalue())
@@ -0,0 +1,117 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from haskala import outbound
+from haskala.metrics import outbound as outbound_metrics, render_outbound_prometheus
+
+
+class StandInServer:
+    """
+    A local HTTP/1.1 server with keep-alive. It answers from
+    ``replies`` — ``(status, body)`` pairs, consumed in order, then
+    ``200`` with an empty body — and records every request it gets.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.connections = 0
+        self.replies = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def handle_request(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                server.requests.append((self.command, self.path, self.headers, body))
+                status, payload = server.replies.pop(0) if server.replies else (200, b"")
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_PUT = do_POST = handle_request
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.host = f"127.0.0.1:{self.httpd.server_port}"
+        self.url = f"http://{self.host}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# No waiting between retries in tests.
+OUTBOUND_TEST_SETTINGS = override_settings(HASKALA_HTTP_BACKOFF=0, HASKALA_HTTP_RETRIES=2)
+
+
+@OUTBOUND_TEST_SETTINGS
+class OutboundSessionTest(SimpleTestCase):
+    def setUp(self):
+        outbound.reset()
+        outbound_metrics.reset()
+        self.addCleanup(outbound.reset)
+
+    def test_connections_are_kept_alive(self):
+        with StandInServer() as server:
+            for _ in range(3):
+                outbound.session().get(f"{server.url}/ping").raise_for_status()
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(server.connections, 1)
+
+    def test_pools_are_shared_between_sessions(self):
+        with StandInServer() as server:
+            outbound.session().get(server.url)
+            outbound.build_session().get(server.url)
+        self.assertEqual(server.connections, 1)
+
+    def test_idempotent_requests_are_retried(self):
+        with StandInServer() as server:
+            server.replies = [(503, b"busy")]
+            response = outbound.session().put(server.url, data=b"x")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(outbound_metrics.snapshot()[server.host].retries, 1)
+
+    def test_post_is_not_retried(self):
+        with StandInServer() as server:
+            server.replies = [(503, b"busy")]
+            response = outbound.session().post(server.url, data={"a": "b"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(server.requests), 1)
+
+    @override_settings(HASKALA_HTTP_CONNECT_TIMEOUT=2, HASKALA_HTTP_READ_TIMEOUT=7)
+    def test_default_timeout_from_settings(self):
+        self.assertEqual(outbound.session().default_timeout, (2, 7))
+
+    def test_metrics_by_host_and_outcome(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            closed = f"127.0.0.1:{probe.getsockname()[1]}"
+        with StandInServer() as server:
+            outbound.session().get(server.url)
+        with self.assertRaises(requests.ConnectionError):
+            outbound.session().get(f"http://{closed}/", timeout=1)
+
+        snapshot = outbound_metrics.snapshot()
+        self.assertEqual(snapshot[server.host].outcomes, {"200": 1})
+        self.assertEqual(snapshot[closed].outcomes, {"ConnectionError": 1})
+        text = render_outbound_prometheus(snapshot)
+        self.assertIn(f'haskala_outbound_requests_total{{host="{closed}",outcome="ConnectionError"}} 1', text)
+        self.assertIn("# TYPE haskala_outbound_request_duration_seconds histogram", text)
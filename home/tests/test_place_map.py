@@ -0,0 +1,141 @@
+import json
+
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from home.models import City, Geolocation
+from home.place_map import (
+    MAX_CLUSTER_ZOOM,
+    build_cluster_index,
+    clusters_for_viewport,
+    parse_bbox,
+)
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+_POINTS = [
+    (52.52, 13.40, "Berlin", "/places/berlin/"),
+    (52.39, 13.06, "Potsdam", "/places/potsdam/"),
+    (50.11, 8.68, "Frankfurt", "/places/frankfurt/"),
+]
+
+
+class ClusterIndexTest(SimpleTestCase):
+    def test_low_zoom_merges_nearby_places(self):
+        index = build_cluster_index(_POINTS)
+        counts = sorted(c.count for c in index.levels[0])
+        self.assertEqual(sum(counts), 3)
+        self.assertLess(len(counts), 3)
+
+    def test_max_zoom_keeps_every_place_apart(self):
+        index = build_cluster_index(_POINTS)
+        singles = index.levels[MAX_CLUSTER_ZOOM]
+        self.assertEqual(len(singles), 3)
+        self.assertEqual({c.name for c in singles}, {"Berlin", "Potsdam", "Frankfurt"})
+
+    def test_bbox_filters_features(self):
+        index = build_cluster_index(_POINTS)
+        collection = clusters_for_viewport(MAX_CLUSTER_ZOOM, (12.0, 52.0, 14.0, 53.0), index=index)
+        names = {f["properties"]["name"] for f in collection["features"]}
+        self.assertEqual(names, {"Berlin", "Potsdam"})
+        self.assertEqual(collection["bbox"], [8.68, 50.11, 13.40, 52.52])
+
+    def test_zoom_is_clamped(self):
+        index = build_cluster_index(_POINTS)
+        collection = clusters_for_viewport(99, None, index=index)
+        self.assertEqual(len(collection["features"]), 3)
+
+    def test_empty_index(self):
+        index = build_cluster_index([])
+        self.assertTrue(index.is_empty)
+        self.assertEqual(clusters_for_viewport(5, None, index=index)["features"], [])
+
+    def test_parse_bbox(self):
+        self.assertEqual(parse_bbox("1,2,3,4"), (1.0, 2.0, 3.0, 4.0))
+        self.assertIsNone(parse_bbox("1,2,3"))
+        self.assertIsNone(parse_bbox("a,b,c,d"))
+        self.assertIsNone(parse_bbox("nan,0,0,0"))
+
+
+@TEST_OVERRIDES
+class PlacesMapViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.city = City.objects.create(name="Königsberg")
+        Geolocation.objects.create(city=cls.city, lat=54.71, lng=20.51)
+
+    def test_list_page_no_longer_embeds_markers(self):
+        html = Client().get(reverse("places-list")).content.decode()
+        self.assertNotIn("data-markers", html)
+        self.assertIn(reverse("places-map-clusters"), html)
+
+    def test_cluster_endpoint_returns_geojson(self):
+        resp = Client().get(reverse("places-map-clusters"), {"zoom": MAX_CLUSTER_ZOOM})
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("application/geo+json", resp["Content-Type"])
+        data = json.loads(resp.content)
+        self.assertEqual(data["type"], "FeatureCollection")
+        [feature] = data["features"]
+        self.assertEqual(feature["properties"]["url"], f"/places/{self.city.slug}/")
+
+
+@TEST_OVERRIDES
+class NearbyPlacesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.berlin = City.objects.create(name="Berlin")
+        cls.potsdam = City.objects.create(name="Potsdam")
+        cls.frankfurt = City.objects.create(name="Frankfurt am Main")
+        cls.vilna = City.objects.create(name="Vilna")
+        for city, lat, lng in [
+            (cls.berlin, 52.52, 13.405),
+            (cls.potsdam, 52.39, 13.065),
+            (cls.frankfurt, 50.11, 8.682),
+            (cls.vilna, 54.687, 25.28),
+        ]:
+            Geolocation.objects.create(city=city, lat=lat, lng=lng)
+
+    def test_save_fills_trig_columns(self):
+        geo = Geolocation.objects.get(city=self.berlin)
+        self.assertAlmostEqual(geo.lat_sin, 0.7936, places=3)
+        self.assertAlmostEqual(geo.lng_rad, 0.2340, places=3)
+
+    def test_places_within_radius(self):
+        from home.nearby import places_within
+
+        names = [g.city.name for g in places_within(52.52, 13.405, 50)]
+        self.assertEqual(names, ["Berlin", "Potsdam"])
+        potsdam = places_within(52.52, 13.405, 50)[1]
+        self.assertAlmostEqual(potsdam.distance_km, 27, delta=2)
+
+    def test_nearest_places_excludes_origin(self):
+        from home.nearby import nearest_places
+
+        found = nearest_places(52.52, 13.405, 2, exclude_city=self.berlin)
+        self.assertEqual([g.city.name for g in found], ["Potsdam", "Frankfurt am Main"])
+
+    def test_cities_with_several_geolocations_count_once(self):
+        from home.nearby import nearest_places, places_within
+
+        for lat, lng in [(52.40, 13.06), (52.41, 13.07), (52.38, 13.05)]:
+            Geolocation.objects.create(city=self.potsdam, lat=lat, lng=lng)
+        found = nearest_places(52.52, 13.405, 2, exclude_city=self.berlin)
+        self.assertEqual([g.city.name for g in found], ["Potsdam", "Frankfurt am Main"])
+        names = [g.city.name for g in places_within(52.52, 13.405, 50)]
+        self.assertEqual(names, ["Berlin", "Potsdam"])
+
+    def test_place_detail_lists_nearby_places(self):
+        html = Client().get(reverse("place-detail", args=[self.berlin.slug])).content.decode()
+        self.assertIn('id="nearby"', html)
+        self.assertIn("Potsdam", html)
+
+    def test_nearby_api(self):
+        resp = Client().get(reverse("places-nearby"), {"place": self.berlin.slug, "k": 1})
+        self.assertEqual(resp.status_code, 200)
+        [result] = json.loads(resp.content)["results"]
+        self.assertEqual(result["slug"], self.potsdam.slug)
+
+    def test_nearby_api_rejects_bad_input(self):
+        resp = Client().get(reverse("places-nearby"), {"lat": "north"})
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,57 @@
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, TestCase
+from rdflib import Literal
+from rdflib.namespace import FOAF, RDF, XSD
+
+from haskala_rdf.beacon import write_beacon
+from haskala_rdf.export import HS, HSK, VOID, StatisticsGraph, VoidStatistics, build_meta_graph
+from home.models import Person
+
+
+class VoidStatisticsTest(SimpleTestCase):
+    def graph(self):
+        g = StatisticsGraph()
+        for i in range(3):
+            person = HSK[f"person/{i}"]
+            g.add((person, RDF.type, HS.Person))
+            g.add((person, RDF.type, FOAF.Person))
+            g.add((person, RDF.type, HS.Person))  # counted once
+            g.add((person, HS.pref_label, Literal(f"Person {i}")))
+        return g
+
+    def test_statistics_are_collected_while_adding(self):
+        g = self.graph()
+        stats = g.statistics
+        self.assertEqual(stats.triples, len(g))
+        self.assertEqual(len(stats.entities), 3)
+        self.assertEqual(stats.classes, {HS.Person: 3, FOAF.Person: 3})
+        self.assertEqual(stats.properties, {RDF.type: 6, HS.pref_label: 3})
+        self.assertEqual(VoidStatistics.of(g).properties, stats.properties)
+
+    def test_meta_graph_has_counts_and_partitions(self):
+        meta = build_meta_graph(self.graph())
+        dataset = HSK["dataset/haskala"]
+        self.assertEqual(meta.value(dataset, VOID.triples), Literal(9, datatype=XSD.integer))
+        self.assertEqual(meta.value(dataset, VOID.entities), Literal(3, datatype=XSD.integer))
+        self.assertEqual(meta.value(dataset, VOID.classes), Literal(2, datatype=XSD.integer))
+        partitions = {
+            meta.value(partition, VOID.property): meta.value(partition, VOID.triples).toPython()
+            for partition in meta.objects(dataset, VOID.propertyPartition)
+        }
+        self.assertEqual(partitions, {RDF.type: 6, HS.pref_label: 3})
+
+
+class BeaconTest(TestCase):
+    def test_beacon_is_written_line_by_line(self):
+        Person.objects.create(pref_label="Mendelssohn, Moses", gnd_id="118580779")
+        Person.objects.create(pref_label="Maimon, Salomon", gnd_id=" 118576445 ")
+        Person.objects.create(pref_label="Unknown")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "beacon.txt"
+            self.assertEqual(write_beacon(path), 2)
+            lines = path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(lines[0], "#FORMAT: BEACON")
+        self.assertEqual(sorted(line for line in lines if not line.startswith("#")),
+                         ["118576445", "118580779"])
@@ -1,18 +1,25 @@
 """
 Unit tests for haskala_rdf/push.py.
 
-These tests mock requests rather than reaching the real Fuseki — the
-goal is to nail the exact HTTP shape (URL, params, headers, body) the
-push helper produces. An integration test against a live Fuseki would
-belong somewhere else (CI service container or a dedicated suite).
+The GSP path is pushed to a local stand-in server rather than the
+real Fuseki — the goal is to nail the exact HTTP shape (URL, params,
+headers, body) the push helper produces. An integration test against
+a live Fuseki would belong somewhere else (CI service container or a
+dedicated suite).
 """
+import base64
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
 
+import requests
 from django.test import TestCase
 from rdflib import Graph, URIRef, Literal
 
+from haskala import outbound
 from haskala_rdf.push import PushTarget, push_graph, target_from_settings
 
+from .test_outbound import OUTBOUND_TEST_SETTINGS, StandInServer
+
 
 def _sample_graph():
     g = Graph()
@@ -22,28 +29,38 @@ def _sample_graph():
     return g
 
 
+@OUTBOUND_TEST_SETTINGS
 class PushGraphTest(TestCase):
     """The two protocols call different HTTP verbs and content types."""
 
+    def setUp(self):
+        outbound.reset()
+        self.addCleanup(outbound.reset)
+
     def test_gsp_uses_put_with_turtle_body(self):
-        target = PushTarget(
-            url="http://fuseki.example/data",
-            graph_iri="http://example.org/g",
-            protocol="gsp",
-        )
-        with patch("haskala_rdf.push.requests") as mock_requests:
-            mock_requests.put.return_value.status_code = 204
-            mock_requests.put.return_value.raise_for_status.return_value = None
+        with StandInServer() as server:
+            target = PushTarget(
+                url=f"{server.url}/data",
+                graph_iri="http://example.org/g",
+                protocol="gsp",
+            )
             push_graph(_sample_graph(), target)
 
-        mock_requests.put.assert_called_once()
-        _args, kwargs = mock_requests.put.call_args
-        self.assertEqual(kwargs["params"], {"graph": "http://example.org/g"})
-        self.assertEqual(
-            kwargs["headers"]["Content-Type"],
-            "text/turtle; charset=utf-8",
-        )
-        self.assertIn(b"hello", kwargs["data"])
+        self.assertEqual(len(server.requests), 1)
+        method, path, headers, body = server.requests[0]
+        self.assertEqual(method, "PUT")
+        self.assertEqual(urlsplit(path).path, "/data")
+        self.assertEqual(parse_qs(urlsplit(path).query), {"graph": ["http://example.org/g"]})
+        self.assertEqual(headers["Content-Type"], "text/turtle; charset=utf-8")
+        self.assertIn(b"hello", body)
+
+    def test_repeated_pushes_reuse_the_connection(self):
+        with StandInServer() as server:
+            target = PushTarget(url=f"{server.url}/data", graph_iri="http://example.org/g")
+            for _ in range(3):
+                push_graph(_sample_graph(), target)
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(server.connections, 1)
 
     def test_update_routes_through_djangordf_fuseki_backend(self):
         """The 'update' protocol delegates to djangordf's FusekiBackend
@@ -75,17 +92,29 @@ class PushGraphTest(TestCase):
         self.assertIn("<http://example.org/s>", sparql)
 
     def test_basic_auth_threaded_through(self):
-        target = PushTarget(
-            url="http://fuseki.example/data",
-            graph_iri="http://example.org/g",
-            protocol="gsp",
-            auth=("admin", "secret"),
-        )
-        with patch("haskala_rdf.push.requests") as mock_requests:
-            mock_requests.put.return_value.raise_for_status.return_value = None
+        with StandInServer() as server:
+            target = PushTarget(
+                url=f"{server.url}/data",
+                graph_iri="http://example.org/g",
+                protocol="gsp",
+                auth=("admin", "secret"),
+            )
             push_graph(_sample_graph(), target)
-        _args, kwargs = mock_requests.put.call_args
-        self.assertEqual(kwargs["auth"], ("admin", "secret"))
+            # The credentials go with the push only, not onto the
+            # shared session.
+            outbound.session().get(server.url)
+        self.assertEqual(
+            server.requests[0][2]["Authorization"],
+            "Basic " + base64.b64encode(b"admin:secret").decode(),
+        )
+        self.assertIsNone(server.requests[1][2]["Authorization"])
+
+    def test_server_error_raises(self):
+        with StandInServer() as server:
+            server.replies = [(500, b"boom")]
+            target = PushTarget(url=f"{server.url}/data", graph_iri="http://example.org/g")
+            with self.assertRaises(requests.HTTPError):
+                push_graph(_sample_graph(), target)
 
     def test_unknown_protocol_raises(self):
         target = PushTarget(
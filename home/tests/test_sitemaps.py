@@ -0,0 +1,101 @@
+import gzip
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from home.models import Book, City, Person
+from home.sitemaps import BookSitemap, refresh_on_commit, render_page, write_sitemaps
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+@TEST_OVERRIDES
+class SitemapTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("Measef", "Phaedon", "Sefer ha-Middot"):
+            Book.objects.create(name=name, live=True)
+        Book.objects.create(name="Draft", live=False)
+        Person.objects.create(pref_label="Moses Mendelssohn", live=True)
+        City.objects.create(name="Berlin", live=True)
+
+    def test_pages_are_capped_and_indexed(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(BookSitemap, "limit", 2):
+            write_sitemaps(root=tmp, base_url="https://example.org")
+            root = Path(tmp)
+            index = (root / "sitemap.xml").read_text()
+            self.assertIn("https://example.org/sitemaps/books-1.xml", index)
+            self.assertIn("https://example.org/sitemaps/books-2.xml", index)
+            self.assertNotIn("books-3.xml", index)
+            self.assertEqual(gzip.decompress((root / "books-2.xml.gz").read_bytes()).decode(),
+                             (root / "books-2.xml").read_text())
+
+            self.assertEqual((root / "books-1.xml").stat().st_mode & 0o777, 0o644)
+            self.assertEqual(list(root.glob(".*.tmp")), [])
+
+            Book.objects.filter(name="Sefer ha-Middot").update(live=False)
+            write_sitemaps(["books"], root=tmp, base_url="https://example.org")
+            self.assertFalse((root / "books-2.xml").exists())
+            self.assertFalse((root / "books-2.xml.gz").exists())
+
+    def test_every_entity_has_lastmod(self):
+        for section, path in (("persons", "/persons/moses-mendelssohn/"), ("places", "/places/berlin/")):
+            with self.subTest(section=section):
+                xml = render_page(section, 1, "https://example.org")
+                self.assertIn(f"<loc>https://example.org{path}</loc>", xml)
+                self.assertIn("<lastmod>", xml)
+
+    def test_page_reads_only_slug_and_updated_at(self):
+        with CaptureQueriesContext(connection) as ctx:
+            xml = render_page("books", 1, "https://example.org")
+        self.assertNotIn("/books/draft/", xml)
+        select = [q["sql"] for q in ctx.captured_queries if "ORDER BY" in q["sql"]]
+        self.assertEqual(len(select), 1)
+        self.assertNotIn('"name"', select[0])
+
+    def test_views_render_when_files_are_missing(self):
+        client = Client()
+        self.assertContains(client.get("/sitemap.xml"), "/sitemaps/places-1.xml")
+        self.assertContains(client.get("/sitemaps/books-1.xml"), "/books/measef/")
+        self.assertEqual(client.get("/sitemaps/books-9.xml").status_code, 404)
+        self.assertEqual(client.get("/sitemaps/nope-1.xml").status_code, 404)
+
+    @override_settings(HASKALA_SITEMAP_ROOT="/nonexistent/sitemaps")
+    def test_publish_is_a_no_op_without_files(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            refresh_on_commit("books")
+        self.assertEqual(callbacks, [])
+
+    def test_publishes_rewrite_each_section_once(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(HASKALA_SITEMAP_ROOT=tmp), \
+                mock.patch("home.sitemaps.write_sitemaps") as write:
+            (Path(tmp) / "sitemap.xml").write_text("")
+            with self.captureOnCommitCallbacks(execute=True):
+                refresh_on_commit("books")
+                refresh_on_commit("books")
+                refresh_on_commit("places")
+            self.assertEqual(write.call_args_list, [mock.call(["books"]), mock.call(["places"])])
+
+            # The next transaction starts afresh.
+            write.reset_mock()
+            with self.captureOnCommitCallbacks(execute=True):
+                refresh_on_commit("books")
+            self.assertEqual(write.call_args_list, [mock.call(["books"])])
+
+    def test_rolled_back_publish_does_not_block_later_refreshes(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(HASKALA_SITEMAP_ROOT=tmp), \
+                mock.patch("home.sitemaps.write_sitemaps") as write:
+            (Path(tmp) / "sitemap.xml").write_text("")
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        refresh_on_commit("books")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                refresh_on_commit("books")
+            self.assertEqual(write.call_args_list, [mock.call(["books"])])
@@ -0,0 +1,50 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from home.models import Person, SlugAlias, Topic
+from home.slug_aliases import add_alias
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+@TEST_OVERRIDES
+class SlugAliasTest(TestCase):
+    def test_renamed_slug_redirects_permanently(self):
+        topic = Topic.objects.create(name="Enlightenment", legacy_tid=1)
+        topic.slug = "haskala"
+        topic.save()
+
+        resp = Client().get("/topics/enlightenment/", {"page": "2"})
+        self.assertEqual(resp.status_code, 301)
+        self.assertEqual(resp["Location"], "/topics/haskala/?page=2")
+
+    def test_legacy_name_slug_redirects(self):
+        person = Person.objects.create(pref_label="Moses Mendelssohn", live=True)
+        add_alias(Person, "mendelssohn-moses", person.pk)
+        resp = Client().get("/persons/mendelssohn-moses/")
+        self.assertEqual(resp.status_code, 301)
+        self.assertEqual(resp["Location"], "/persons/moses-mendelssohn/")
+
+    def test_alias_to_a_draft_is_a_404(self):
+        person = Person.objects.create(pref_label="Salomon Maimon", live=False)
+        add_alias(Person, "maimon-salomon", person.pk)
+        resp = Client().get("/persons/maimon-salomon/")
+        self.assertEqual(resp.status_code, 404)
+        self.assertNotIn("salomon-maimon", resp.get("Location", ""))
+
+    def test_miss_is_a_cheap_404(self):
+        Topic.objects.bulk_create(Topic(name=f"Topic {i}", slug=f"topic-{i}", legacy_tid=i) for i in range(50))
+        with CaptureQueriesContext(connection) as ctx:
+            resp = Client().get("/topics/no-such-topic/")
+        self.assertEqual(resp.status_code, 404)
+        topic_queries = [q for q in ctx.captured_queries if "home_topic" in q["sql"] or "home_slugalias" in q["sql"]]
+        self.assertEqual(len(topic_queries), 2)
+
+    def test_delete_drops_aliases(self):
+        topic = Topic.objects.create(name="Poetry", legacy_tid=2)
+        topic.slug = "verse"
+        topic.save()
+        self.assertTrue(SlugAlias.objects.filter(slug="poetry").exists())
+        topic.delete()
+        self.assertFalse(SlugAlias.objects.exists())
@@ -0,0 +1,41 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from home.models import Person, generate_unique_slug
+from home.slugs import SlugAllocator, next_free_slug
+
+
+class SlugAllocatorTest(TestCase):
+    def test_next_free_slug_fills_first_gap(self):
+        self.assertEqual(next_free_slug("moses", set()), "moses")
+        self.assertEqual(next_free_slug("moses", {"moses", "moses-2", "moses-4"}), "moses-3")
+
+    def test_collisions_cost_one_query(self):
+        for _ in range(20):
+            Person.objects.create(pref_label="Moses Mendelssohn")
+        with CaptureQueriesContext(connection) as ctx:
+            slug = generate_unique_slug(Person(), "Moses Mendelssohn")
+        self.assertEqual(slug, "moses-mendelssohn-21")
+        self.assertEqual(len(ctx), 1)
+
+    def test_prefix_of_other_base_is_not_a_collision(self):
+        Person.objects.create(pref_label="Moses Hess")
+        self.assertEqual(generate_unique_slug(Person(), "Moses"), "moses")
+
+    def test_row_keeps_its_own_slug(self):
+        person = Person.objects.create(pref_label="Moses Mendelssohn")
+        self.assertEqual(generate_unique_slug(person, "Moses Mendelssohn"), "moses-mendelssohn")
+
+    def test_bulk_assign(self):
+        Person.objects.create(pref_label="Salomon Maimon")
+        people = [Person(pref_label="Salomon Maimon") for _ in range(300)]
+        people += [Person(pref_label=f"Person {i}") for i in range(300)]
+        with CaptureQueriesContext(connection) as ctx:
+            SlugAllocator(Person).assign(people, lambda person: person.pref_label)
+        # 301 distinct bases, looked up 200 at a time.
+        self.assertEqual(len(ctx), 2)
+        slugs = [person.slug for person in people]
+        self.assertEqual(len(set(slugs)), 600)
+        self.assertEqual(slugs[:2], ["salomon-maimon-2", "salomon-maimon-3"])
+        self.assertEqual(slugs[300], "person-0")
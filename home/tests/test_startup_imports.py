@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import resolve
+
+from .test_book_detail import TEST_OVERRIDES
+
+# Only RDF, PDF and OpenAPI requests need these; a worker that has
+# loaded the URLconf must not have imported them yet.
+DEFERRED_MODULES = (
+    "rdflib",
+    "weasyprint",
+    "haskala_rdf.entity",
+    "haskala_rdf.export",
+    "djangordf",
+    "drf_spectacular.generators",
+    "drf_spectacular.openapi",
+)
+
+STARTUP = (
+    "import django; django.setup(); "
+    "from importlib import import_module; from django.conf import settings; "
+    "import_module(settings.ROOT_URLCONF)"
+)
+
+
+def import_times(stderr):
+    """``{module: cumulative µs}`` from ``python -X importtime`` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class StartupImportsTest(SimpleTestCase):
+    def test_urlconf_does_not_import_deferred_modules(self):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP],
+            env=env, capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        )
+        times = import_times(result.stderr)
+        slowest = sorted(times.items(), key=lambda item: -item[1])[:15]
+        report = "\n".join(f"{us / 1000:8.1f} ms  {name}" for name, us in slowest)
+
+        loaded = [
+            name for name in times
+            if any(name == module or name.startswith(f"{module}.") for module in DEFERRED_MODULES)
+        ]
+        self.assertEqual(loaded, [], f"imported at startup; slowest imports:\n{report}")
+
+
+@TEST_OVERRIDES
+class LazyViewTest(TestCase):
+    def test_schema_view_loads_on_first_request(self):
+        match = resolve("/api/schema/")
+        self.assertEqual(match.func.lazy_path, "drf_spectacular.views.SpectacularAPIView")
+        self.assertContains(Client().get("/api/schema/"), "openapi")
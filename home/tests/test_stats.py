@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from home.models import Book, City, Language, Occupation, Person, StatsCount
+from home.stats import rebuild, summary
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+def counters():
+    return dict(
+        ((dimension, key), n)
+        for dimension, key, n in StatsCount.objects.filter(count__gt=0).values_list("dimension", "key", "count")
+    )
+
+
+@TEST_OVERRIDES
+class StatsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.berlin = City.objects.create(name="Berlin")
+        cls.hebrew = Language.objects.create(name="Hebrew")
+        cls.german = Language.objects.create(name="German")
+        cls.phaedon = Book.objects.create(
+            name="Phaedon", bundle="book", gregorian_year=1767, publication_place=cls.berlin,
+            digital_book_url="https://example.org/phaedon",
+        )
+        cls.phaedon.languages.add(cls.german)
+        cls.jerusalem = Book.objects.create(name="Jerusalem", bundle="book", gregorian_year=1783)
+        cls.jerusalem.languages.add(cls.german, cls.hebrew)
+        Book.objects.create(name="Draft", bundle="book", gregorian_year=1790, live=False)
+        cls.writer = Occupation.objects.create(name="Writer", legacy_tid=5)
+        Person.objects.create(pref_label="Mendelssohn, Moses").occupations.add(cls.writer)
+        Person.objects.create(pref_label="Maimon, Salomon")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_summary(self):
+        data = summary()
+        books = data["books"]
+        self.assertEqual((books["total"], books["digitized"], books["digitization_ratio"]), (2, 1, 0.5))
+        self.assertEqual([(row["label"], row["count"]) for row in books["per_decade"]],
+                         [("1760s", 1), ("1780s", 1)])
+        self.assertEqual([(row["label"], row["count"]) for row in books["per_language"]],
+                         [("German", 2), ("Hebrew", 1)])
+        self.assertEqual([(row["label"], row["count"]) for row in books["per_publication_place"]],
+                         [("Berlin", 1), ("Unknown", 1)])
+        self.assertEqual([(row["label"], row["count"]) for row in data["persons"]["per_occupation"]],
+                         [("Unknown", 1), ("Writer", 1)])
+
+    def test_changes_move_only_the_changed_book(self):
+        self.jerusalem.gregorian_year = 1767
+        with CaptureQueriesContext(connection) as ctx:
+            self.jerusalem.save()
+        # Counters are moved, never re-aggregated.
+        self.assertFalse([q for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()])
+        self.assertEqual(counters()[("decade", "1760")], 2)
+        self.assertNotIn(("decade", "1780"), counters())
+
+        self.jerusalem.languages.remove(self.hebrew)
+        self.assertNotIn(("language", str(self.hebrew.pk)), counters())
+
+        self.phaedon.delete()
+        self.assertEqual(counters()[("books", "")], 1)
+
+    def test_rebuild_matches_incremental_updates(self):
+        incremental = counters()
+        rebuild(batch_size=2)
+        self.assertEqual(counters(), incremental)
+
+    def test_json_and_html(self):
+        resp = self.client.get("/api/stats/", {"format": "json"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["persons"]["total"], 2)
+
+        resp = self.client.get("/stats/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "1780s")
@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from home.models import Book, Occupation, Person, Publisher, Topic
+from home.taxonomy_counts import index_entries, live_counts
+
+from .test_book_detail import TEST_OVERRIDES
+
+
+@TEST_OVERRIDES
+class TaxonomyCountsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.enlightenment = Topic.objects.create(name="Enlightenment", legacy_tid=1)
+        cls.poetry = Topic.objects.create(name="Poetry", legacy_tid=2)
+        cls.verlag = Publisher.objects.create(name="Voss")
+        Book.objects.create(name="Phaedon", topic=cls.enlightenment, publisher=cls.verlag)
+        Book.objects.create(name="Jerusalem", topic=cls.enlightenment, original_publisher=cls.verlag)
+        cls.draft = Book.objects.create(name="Draft", topic=cls.poetry, live=False)
+        cls.writer = Occupation.objects.create(name="Writer", legacy_tid=5)
+        person = Person.objects.create(pref_label="Mendelssohn, Moses")
+        person.occupations.add(cls.writer)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counts_from_one_query_then_cache(self):
+        with self.assertNumQueries(1):
+            topics = index_entries(Topic)
+        self.assertEqual([(t.name, t.book_count) for t in topics], [("Enlightenment", 2), ("Poetry", 0)])
+        with self.assertNumQueries(0):
+            index_entries(Topic)
+        self.assertEqual(live_counts(Publisher)[self.verlag.pk], {"book_count": 1, "original_book_count": 1})
+        self.assertEqual(live_counts(Occupation)[self.writer.pk], {"person_count": 1})
+
+    def test_publish_drops_the_cached_counts(self):
+        index_entries(Topic)
+        self.draft.save_revision().publish()
+        self.assertEqual(live_counts(Topic)[self.poetry.pk], {"book_count": 1})
+
+    def test_index_page_and_api_show_counts(self):
+        resp = self.client.get("/topics/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "(2)")
+
+        resp = self.client.get("/api/topics/", {"format": "json"})
+        self.assertEqual(resp.status_code, 200)
+        counts = {row["name"]: row["book_count"] for row in resp.json()["results"]}
+        self.assertEqual(counts, {"Enlightenment": 2, "Poetry": 0})
@@ -0,0 +1,63 @@
+from django.test import SimpleTestCase, TestCase
+
+from home.book_detail import visible_sections
+from home.importing import parse_flag_text, parse_text
+from home.models import Book
+from home.templatetags.value_filters import CleanedValues, clean_value
+
+
+class CleanValueTest(SimpleTestCase):
+    def test_legacy_empty_markers(self):
+        for value in ("", "0", "0.0", " 0.00 ", "a:0:{}", "a:0:{};", 0, 0.0, None, False):
+            with self.subTest(value=value):
+                self.assertEqual(clean_value(value), "")
+
+    def test_numbers_and_text(self):
+        self.assertEqual(clean_value("12.0"), "12")
+        self.assertEqual(clean_value("3.50"), "3.50")
+        self.assertEqual(clean_value(2.0), "2")
+        prose = "  A long note that is well past the short-string cache cutoff.  "
+        self.assertEqual(clean_value(prose), prose.strip())
+
+    def test_parse_text_blanks_markers(self):
+        self.assertEqual(parse_text("a:0:{}"), "")
+        self.assertEqual(parse_text("10"), "10")
+        # A zero is data outside the flag columns (a year, a page count).
+        self.assertEqual(parse_text("0"), "0")
+        self.assertEqual(parse_flag_text("0.0"), "")
+        self.assertEqual(parse_flag_text("a:0:{}"), "")
+        self.assertEqual(parse_flag_text("1.0"), "1.0")
+
+
+class CleanedValuesTest(SimpleTestCase):
+    class Record:
+        reads = 0
+
+        @property
+        def price(self):
+            self.reads += 1
+            return "12.0"
+
+    def test_memoises_per_field(self):
+        record = self.Record()
+        view = CleanedValues(record)
+        self.assertEqual(view.price, "12")
+        self.assertEqual(view["price"], "12")
+        self.assertEqual(record.reads, 1)
+
+    def test_unknown_field(self):
+        view = CleanedValues(self.Record())
+        with self.assertRaises(KeyError):
+            view["nope"]
+        with self.assertRaises(AttributeError):
+            view.nope
+
+
+class BookCleanedTest(TestCase):
+    def test_sections_and_templates_share_the_view(self):
+        book = Book.objects.create(name="Measef", subscribers="0.0", price="12.0")
+        slugs = [section.slug for section in visible_sections(book)]
+        self.assertIn("subscription", slugs)
+        self.assertIs(book.cleaned, book.cleaned)
+        self.assertEqual(book.cleaned._values["subscribers"], "")
+        self.assertEqual(book.cleaned._values["price"], "12")
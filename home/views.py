@@ -3,22 +3,31 @@ import json
 import secrets
 from collections import defaultdict
 
+from django.core.paginator import InvalidPage
 from django.db.models import Prefetch, Q
-from django.http import Http404, HttpResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render, get_object_or_404
 from django.template.loader import render_to_string
-from django.utils.text import slugify
 from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_headers
-from requests import Response
 from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from haskala_rdf.formats import ACCEPT_TO_FORMAT, SERIALIZATION
 
 from .book_detail import visible_sections, citation_key
+from .entity_relations import person_relations, place_relations
 from .person_detail import visible_sections as person_visible_sections
 from .place_detail import visible_sections as place_visible_sections
+from .nearby import NEARBY_COUNT, nearby_places_for, nearest_places, origin_for, places_within
+from .place_map import clusters_for_viewport, get_cluster_index, parse_bbox
 from .models import Book, Person, Geolocation, City, Edition, Translation, Mention, Language, Occupation, Topic, \
     Publisher, BookAuthor, Preface, Production, Series
 from .serializers import BookSerializer, PersonSerializer, CitySerializer
+from .sitemaps import render_index, render_page
+from .stats import summary as stats_summary
+from .taxonomy_counts import index_entries
+from .slug_aliases import redirect_old_slugs
 
 
 def _negotiate_rdf_response(request, obj):
@@ -27,8 +36,6 @@ def _negotiate_rdf_response(request, obj):
     the serialized graph directly. Otherwise return None so the view
     falls back to the HTML template.
     """
-    from haskala_rdf.entity import ACCEPT_TO_FORMAT, serialize_entity
-
     accept = request.headers.get("Accept", "")
     if not accept:
         return None
@@ -39,6 +46,8 @@ def _negotiate_rdf_response(request, obj):
         if mime in ("text/html", "application/xhtml+xml", "*/*", ""):
             return None
         if mime in ACCEPT_TO_FORMAT:
+            from haskala_rdf.entity import serialize_entity
+
             fmt = ACCEPT_TO_FORMAT[mime]
             body, served_mime = serialize_entity(obj, fmt)
             response = HttpResponse(body, content_type=f"{served_mime}; charset=utf-8")
@@ -49,6 +58,7 @@ def _negotiate_rdf_response(request, obj):
 
 @cache_page(60 * 60)  # cache for 1 hour
 @vary_on_headers("Accept")
+@redirect_old_slugs(Book)
 def book_detail_view(request, slug):
     book = get_object_or_404(
         Book.objects.filter(live=True).select_related(
@@ -211,6 +221,7 @@ def persons_list_view(request):
 
 @cache_page(60 * 60)
 @vary_on_headers("Accept")
+@redirect_old_slugs(Person)
 def person_detail_view(request, slug):
     """
     Detail view of a person, identified by slug.
@@ -225,47 +236,15 @@ def person_detail_view(request, slug):
     if person is None:
         raise Http404("Person not found")
 
-    books_by_role: dict[str, list[Book]] = defaultdict(list)
-    for ba in (
-        BookAuthor.objects
-        .filter(person=person)
-        .select_related("book")
-        .order_by("role", "book__name")
-    ):
-        if not ba.book:
-            continue
-        books_by_role[ba.get_role_display()].append(ba.book)
-
-    prefaces = (
-        Preface.objects
-        .filter(writer=person)
-        .select_related("book")
-        .order_by("book__name")
-    )
-    productions = (
-        Production.objects
-        .filter(producer=person)
-        .select_related("book", "role")
-        .order_by("book__name")
-    )
-    mentions = (
-        Mention.objects
-        .filter(mentionee=person)
-        .select_related("book", "mentionee_city", "mentionee_description")
-        .order_by("mentionee_city__name")
-    )
-
     rdf_response = _negotiate_rdf_response(request, person)
     if rdf_response is not None:
         return rdf_response
 
+    relations = person_relations(person)
     context = {
         "person": person,
-        "visible_sections": person_visible_sections(person),
-        "person_books_by_role": dict(books_by_role),
-        "prefaces_by_person": prefaces,
-        "productions_by_person": productions,
-        "mentions_of_person": mentions,
+        "visible_sections": person_visible_sections(person, relations),
+        **relations,
     }
 
     return render(request, "persons/person_detail_page.html", context)
@@ -293,40 +272,111 @@ def places_list_view(request):
 
     cities_by_letter = dict(sorted(grouped.items(), key=lambda item: item[0]))
 
-    # Leaflet markers from Geolocation
-    geos = (
-        Geolocation.objects
-        .exclude(lat__isnull=True)
-        .exclude(lng__isnull=True)
-        .select_related("city")
-    )
-
-    markers = []
-    for geo in geos:
-        if geo.lat is None or geo.lng is None:
-            continue
-        city_name = geo.city.name
-        markers.append({
-            "lat": geo.lat,
-            "lng": geo.lng,
-            "name": city_name,
-            # URL based on the old /cities/<slug> pattern
-            "url": f"/places/{slugify(city_name)}/",
-        })
+    # The map pulls its markers from places_map_clusters_view; only
+    # the overall extent is embedded so Leaflet can frame it at once.
+    map_index = get_cluster_index()
+    map_bounds = None
+    if not map_index.is_empty:
+        south, west, north, east = map_index.bounds
+        map_bounds = [[south, west], [north, east]]
 
     context = {
         "alphabet": alphabet,
         "hebrew_alphabet": hebrew_alphabet,
         "cities_by_letter": cities_by_letter,
-        "city_markers_json": json.dumps(markers),
+        "map_bounds_json": json.dumps(map_bounds) if map_bounds else "",
         "nonce": secrets.token_hex(16),
         "total_count": sum(len(v) for v in cities_by_letter.values()),
     }
     return render(request, "places/places_page.html", context)
 
 
+def places_map_clusters_view(request):
+    """
+    GeoJSON marker clusters for the places overview map.
+
+    Query parameters: ``zoom`` (Leaflet zoom level) and ``bbox``
+    (``west,south,east,north``). Without a bbox the whole world is
+    returned at the requested zoom. The grid index itself is cached
+    (see home.place_map), so each call is a filter over a few
+    thousand in-memory tuples and not worth a per-bbox cache entry.
+    """
+    try:
+        zoom = int(request.GET.get("zoom", 0))
+    except ValueError:
+        zoom = 0
+    bbox = parse_bbox(request.GET.get("bbox", ""))
+    return JsonResponse(
+        clusters_for_viewport(zoom, bbox),
+        content_type="application/geo+json",
+    )
+
+
+# Upper bounds so a single request can't ask for the whole table.
+_NEARBY_MAX_K = 100
+_NEARBY_MAX_RADIUS_KM = 2000
+_NEARBY_MAX_RESULTS = 500
+
+
+def places_nearby_view(request):
+    """
+    Spatial lookup over the geolocated places.
+
+    The origin is either ``place=<slug>`` or ``lat=…&lng=…``. With
+    ``radius=<km>`` every place inside the circle is returned;
+    otherwise the ``k`` (default 8) nearest places are returned.
+    Results are ordered nearest first and carry ``distance_km``.
+    """
+    params = request.GET
+    exclude_city = None
+    try:
+        if params.get("place"):
+            exclude_city = get_object_or_404(City, slug=params["place"], live=True)
+            origin = origin_for(exclude_city)
+            if origin is None:
+                return JsonResponse({"detail": "This place has no coordinates."}, status=404)
+            lat, lng = origin.lat, origin.lng
+        else:
+            lat, lng = float(params["lat"]), float(params["lng"])
+        radius = float(params["radius"]) if params.get("radius") else None
+        k = int(params.get("k") or NEARBY_COUNT)
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {"detail": "Pass place=<slug> or numeric lat and lng; radius and k must be numbers."},
+            status=400,
+        )
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return JsonResponse({"detail": "lat/lng out of range."}, status=400)
+
+    if radius is not None:
+        radius = max(0.0, min(radius, _NEARBY_MAX_RADIUS_KM))
+        geos = places_within(lat, lng, radius)
+        if exclude_city is not None:
+            geos = geos.exclude(city=exclude_city)
+        geos = geos[:_NEARBY_MAX_RESULTS]
+    else:
+        geos = nearest_places(lat, lng, max(1, min(k, _NEARBY_MAX_K)), exclude_city=exclude_city)
+
+    return JsonResponse({
+        "origin": {"lat": lat, "lng": lng},
+        "radius_km": radius,
+        "results": [
+            {
+                "name": geo.city.name,
+                "slug": geo.city.slug,
+                "url": geo.city.get_absolute_url(),
+                "lat": geo.lat,
+                "lng": geo.lng,
+                "distance_km": round(geo.distance_km, 3),
+            }
+            for geo in geos
+        ],
+    })
+
+
 @cache_page(60 * 60)
 @vary_on_headers("Accept")
+@redirect_old_slugs(City)
 def place_detail_view(request, slug):
     """
     Detail view of a city, addressed by slug.
@@ -335,48 +385,11 @@ def place_detail_view(request, slug):
 
     geolocation = Geolocation.objects.filter(city=city).first()
 
-    books_published_here = (
-        Book.objects.filter(live=True)
-        .filter(
-            Q(publication_place=city)
-            | Q(publication_place_other=city)
-            | Q(original_publication_place=city)
-        )
-        .order_by("gregorian_year", "name")
-        .distinct()
-    )
-
-    editions_here = (
-        Edition.objects.filter(city=city)
-        .select_related("book")
-        .order_by("year")
-        .distinct()
-    )
-    translations_here = (
-        Translation.objects.filter(city=city)
-        .select_related("book", "language")
-        .order_by("year")
-        .distinct()
-    )
-
-    mentions_here = (
-        Mention.objects.filter(mentionee_city=city)
-        .select_related("book", "mentionee", "mentionee_description")
-        .order_by("mentionee__pref_label")
-    )
-
-    born_here = city.born_here.filter(live=True).order_by("pref_label")
-    died_here = city.died_here.filter(live=True).order_by("pref_label")
-
     context = {
         "city": city,
         "geolocation": geolocation,
-        "books_published_here": books_published_here,
-        "editions_here": editions_here,
-        "translations_here": translations_here,
-        "mentions_here": mentions_here,
-        "born_here": born_here,
-        "died_here": died_here,
+        **place_relations(city),
+        "nearby_places": nearby_places_for(city),
         "nonce": secrets.token_hex(16),
     }
     context["visible_sections"] = place_visible_sections(context)
@@ -557,31 +570,44 @@ def robots_txt(request):
     return HttpResponse(content, content_type="text/plain")
 
 
+# nginx serves the files `manage.py write_sitemaps` writes; these views
+# only answer while those are missing.
+@cache_page(60 * 60)
+def sitemap_index_view(request):
+    xml = render_index(request.build_absolute_uri("/"))
+    return HttpResponse(xml, content_type="application/xml")
+
+
+@cache_page(60 * 60)
+def sitemap_page_view(request, section, page):
+    try:
+        xml = render_page(section, page, request.build_absolute_uri("/"))
+    except (KeyError, InvalidPage):
+        raise Http404("No such sitemap page")
+    return HttpResponse(xml, content_type="application/xml")
+
+
 def _get_object_by_slug(queryset, slug: str):
     """
-    Find an object via its persisted .slug column first (the path the
-    new templates use). Falls back to the legacy slugify(obj.name)
-    match so old bookmarks built before the slug columns existed
-    keep resolving. Used for Topic, Publisher, Series, Occupation.
+    Find an object via its persisted .slug column. Old slugs (including
+    the legacy slugify(obj.name) forms of bookmarks built before the
+    slug columns existed) are answered by ``redirect_old_slugs`` on the
+    view. Used for Topic, Publisher, Series, Occupation.
     """
-    if hasattr(queryset.model, "slug"):
-        match = queryset.filter(slug=slug).first()
-        if match is not None:
-            return match
-    for obj in queryset:
-        name = getattr(obj, "name", "") or ""
-        if slugify(name) == slug:
-            return obj
-    raise Http404("Object not found")
+    match = queryset.filter(slug=slug).first()
+    if match is None:
+        raise Http404("Object not found")
+    return match
 
 
 # ---------- TOPICS ----------
 
 def topics_list_view(request):
     """
-    Overview of all topics, alphabetically grouped.
+    Overview of all topics, alphabetically grouped, with live book counts
+    (cached, see home.taxonomy_counts).
     """
-    topics_qs = Topic.objects.all().order_by("name")
+    topics_qs = index_entries(Topic)
 
     grouped = defaultdict(list)
     for topic in topics_qs:
@@ -603,10 +629,11 @@ def topics_list_view(request):
     return render(request, "topics/topics_page.html", context)
 
 
+@redirect_old_slugs(Topic)
 def topic_detail_view(request, topic_slug):
     """
     Detail view of a topic with associated books.
-    Slug is based on slugify(topic.name).
+    Identified by topic.slug; old slugs redirect (see slug_aliases).
     """
     topic = _get_object_by_slug(Topic.objects.all(), topic_slug)
 
@@ -627,10 +654,10 @@ def topic_detail_view(request, topic_slug):
 
 def publishers_list_view(request):
     """
-    Overview of all publishers, alphabetically grouped.
+    Overview of all publishers, alphabetically grouped, with live book counts
+    (cached, see home.taxonomy_counts).
     """
-
-    publishers_qs = Publisher.objects.all().order_by("name")
+    publishers_qs = index_entries(Publisher)
 
     grouped = defaultdict(list)
     for pub in publishers_qs:
@@ -654,6 +681,7 @@ def publishers_list_view(request):
     return render(request, "publishers/publishers_page.html", context)
 
 
+@redirect_old_slugs(Publisher)
 def publisher_detail_view(request, publisher_slug):
     """
     Detail view of a publisher with all associated books
@@ -685,9 +713,10 @@ def publisher_detail_view(request, publisher_slug):
 
 def occupations_list_view(request):
     """
-    Overview of all occupations, alphabetically grouped.
+    Overview of all occupations, alphabetically grouped, with live person counts
+    (cached, see home.taxonomy_counts).
     """
-    occs_qs = Occupation.objects.all().order_by("name")
+    occs_qs = index_entries(Occupation)
 
     grouped = defaultdict(list)
     for occ in occs_qs:
@@ -709,6 +738,7 @@ def occupations_list_view(request):
     return render(request, "occupations/occupations_page.html", context)
 
 
+@redirect_old_slugs(Occupation)
 def occupation_detail_view(request, occupation_slug):
     """
     Detail view of an occupation with all persons who have this profession.
@@ -763,9 +793,10 @@ def security_txt(request):
 
 def series_list_view(request):
     """
-    Overview of all series, alphabetically grouped.
+    Overview of all series, alphabetically grouped, with live book counts
+    (cached, see home.taxonomy_counts).
     """
-    series_qs = Series.objects.all().order_by("name")
+    series_qs = index_entries(Series)
 
     grouped = defaultdict(list)
     for s in series_qs:
@@ -786,10 +817,11 @@ def series_list_view(request):
     return render(request, "series/series_page.html", context)
 
 
+@redirect_old_slugs(Series)
 def series_detail_view(request, series_slug):
     """
     Detail view of a series: all books in this series.
-    Slug is based on slugify(series.name).
+    Identified by series.slug; old slugs redirect (see slug_aliases).
     """
     series = _get_object_by_slug(Series.objects.all(), series_slug)
 
@@ -984,10 +1016,11 @@ def book_cite_ris(request, slug):
 
 def _serialize_entity_response(obj, fmt, *, attachment_basename):
     """Serialize one entity to RDF and wrap it in an HttpResponse."""
-    from haskala_rdf.entity import SERIALIZATION, serialize_entity
-
     if fmt not in SERIALIZATION:
         raise Http404("Unknown export format")
+
+    from haskala_rdf.entity import serialize_entity
+
     body, mime = serialize_entity(obj, fmt)
     response = HttpResponse(body, content_type=f"{mime}; charset=utf-8")
     extension = "ttl" if fmt in ("ttl", "turtle") else \
@@ -1029,12 +1062,14 @@ def book_export(request, slug, fmt):
 def person_export(request, slug, fmt):
     person = get_object_or_404(Person, slug=slug, live=True)
     if fmt == "pdf":
+        relations = person_relations(person)
         return _pdf_entity_response(
             request, person,
             template_name="persons/_pdf/person_pdf.html",
             attachment_basename=person.slug,
             context_extra={"person": person,
-                           "visible_sections": person_visible_sections(person)},
+                           "visible_sections": person_visible_sections(person, relations),
+                           **relations},
         )
     return _serialize_entity_response(person, fmt, attachment_basename=person.slug)
 
@@ -1056,41 +1091,41 @@ def place_export(request, slug, fmt):
 
 def _place_context_for_pdf(request, city):
     """Reuse the place detail view's context for the PDF render."""
-    geolocation = Geolocation.objects.filter(city=city).first()
-    books_published_here = (
-        Book.objects.filter(live=True)
-        .filter(
-            Q(publication_place=city)
-            | Q(publication_place_other=city)
-            | Q(original_publication_place=city)
-        )
-        .order_by("gregorian_year", "name")
-        .distinct()
-    )
-    editions_here = (
-        Edition.objects.filter(city=city).select_related("book")
-        .order_by("year").distinct()
-    )
-    translations_here = (
-        Translation.objects.filter(city=city).select_related("book", "language")
-        .order_by("year").distinct()
-    )
-    mentions_here = (
-        Mention.objects.filter(mentionee_city=city)
-        .select_related("book", "mentionee", "mentionee_description")
-        .order_by("mentionee__pref_label")
-    )
-    born_here = city.born_here.filter(live=True).order_by("pref_label")
-    died_here = city.died_here.filter(live=True).order_by("pref_label")
     ctx = {
         "city": city,
-        "geolocation": geolocation,
-        "books_published_here": books_published_here,
-        "editions_here": editions_here,
-        "translations_here": translations_here,
-        "mentions_here": mentions_here,
-        "born_here": born_here,
-        "died_here": died_here,
+        "geolocation": Geolocation.objects.filter(city=city).first(),
+        **place_relations(city),
+        "nearby_places": nearby_places_for(city),
     }
     ctx["visible_sections"] = place_visible_sections(ctx)
     return ctx
+
+
+# ---------- STATISTICS ----------
+
+@cache_page(60 * 5)
+def stats_view(request):
+    """
+    Catalogue statistics, read from the rollup counters (home.stats).
+    """
+    data = stats_summary()
+    books, persons = data["books"], data["persons"]
+    context = {
+        "stats": data,
+        "sections": [
+            ("Books per decade", books["per_decade"]),
+            ("Books per language", books["per_language"]),
+            ("Books per publication place", books["per_publication_place"]),
+            ("Books per bundle", books["per_bundle"]),
+            ("Persons per occupation", persons["per_occupation"]),
+        ],
+    }
+    return render(request, "stats/stats_page.html", context)
+
+
+@api_view(["GET"])
+def stats_api_view(request):
+    """
+    Catalogue statistics as JSON; the same numbers as stats_view.
+    """
+    return Response(stats_summary())
@@ -18,7 +18,14 @@ The decorator-style `@register_snippet` on the model definitions still
 fires when models load, but the explicit `register_snippet(ViewSet)`
 calls below take precedence — Wagtail uses the most recent registration
 per model.
+
+Entity listings derive from :class:`ListingViewSet`, which loads the
+relations shown in ``list_display`` with the listing query itself
+(``select_related`` for foreign keys, ``prefetch_related`` for model
+methods that declare what they read), so a listing page costs a fixed
+number of queries however many rows it shows.
 """
+from django.core.exceptions import FieldDoesNotExist
 from wagtail import hooks
 from wagtail.admin.menu import MenuItem
 from wagtail.snippets.models import register_snippet
@@ -42,7 +49,40 @@ def register_front_page_menu_item():
 # Entity-flavoured snippets
 # ---------------------------------------------------------------------
 
-class BookViewSet(SnippetViewSet):
+def listing_relations(model, list_display):
+    """
+    ``(select_related, prefetch_related)`` paths for the listing columns
+    *list_display* of *model*: forward foreign keys are joined, model
+    methods contribute their ``prefetch_related`` attribute.
+    """
+    select, prefetch = [], []
+    for name in list_display:
+        if not isinstance(name, str):
+            continue
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            prefetch.extend(getattr(getattr(model, name, None), "prefetch_related", ()))
+            continue
+        if field.many_to_one or field.one_to_one:
+            select.append(name)
+    return tuple(select), tuple(prefetch)
+
+
+class ListingViewSet(SnippetViewSet):
+    """SnippetViewSet whose index view eager-loads its listing columns."""
+
+    def get_queryset(self, request):
+        select, prefetch = listing_relations(self.model, self.list_display)
+        queryset = self.model._default_manager.all()
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class BookViewSet(ListingViewSet):
     model = Book
     menu_label = "Books"
     menu_icon = "book"
@@ -60,7 +100,7 @@ class BookViewSet(SnippetViewSet):
     )
 
 
-class PersonViewSet(SnippetViewSet):
+class PersonViewSet(ListingViewSet):
     model = Person
     menu_label = "Persons"
     menu_icon = "user"
@@ -74,7 +114,7 @@ class PersonViewSet(SnippetViewSet):
     )
 
 
-class CityViewSet(SnippetViewSet):
+class CityViewSet(ListingViewSet):
     model = City
     menu_label = "Places"
     menu_icon = "site"
@@ -85,7 +125,7 @@ class CityViewSet(SnippetViewSet):
     search_fields = ("name", "slug")
 
 
-class BookAuthorViewSet(SnippetViewSet):
+class BookAuthorViewSet(ListingViewSet):
     model = BookAuthor
     menu_label = "Book authors"
     menu_icon = "group"
@@ -99,7 +139,7 @@ class BookAuthorViewSet(SnippetViewSet):
     )
 
 
-class EditionViewSet(SnippetViewSet):
+class EditionViewSet(ListingViewSet):
     model = Edition
     menu_label = "Editions"
     menu_icon = "doc-full"
@@ -110,7 +150,7 @@ class EditionViewSet(SnippetViewSet):
     search_fields = ("name", "book__name", "city__name")
 
 
-class TranslationViewSet(SnippetViewSet):
+class TranslationViewSet(ListingViewSet):
     model = Translation
     menu_label = "Translations"
     menu_icon = "globe"
@@ -121,7 +161,7 @@ class TranslationViewSet(SnippetViewSet):
     search_fields = ("title", "book__name", "language__name", "city__name")
 
 
-class MentionViewSet(SnippetViewSet):
+class MentionViewSet(ListingViewSet):
     model = Mention
     menu_label = "Mentions"
     menu_icon = "comment"
@@ -135,7 +175,7 @@ class MentionViewSet(SnippetViewSet):
     )
 
 
-class PrefaceViewSet(SnippetViewSet):
+class PrefaceViewSet(ListingViewSet):
     model = Preface
     menu_label = "Prefaces"
     menu_icon = "openquote"
@@ -149,7 +189,7 @@ class PrefaceViewSet(SnippetViewSet):
     )
 
 
-class ProductionViewSet(SnippetViewSet):
+class ProductionViewSet(ListingViewSet):
     model = Production
     menu_label = "Productions"
     menu_icon = "cogs"